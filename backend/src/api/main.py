@@ -1,10 +1,60 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.models.reading_models import ReadingRequest, ReadingResponse
-from src.services.reading_service import generate_reading
+from src import config
+from src.models.reading_models import (
+    AyanamsaComparisonRequest,
+    AyanamsaComparisonResponse,
+    DashaRequest,
+    DashaResponse,
+    ReadingRequest,
+    ReadingResponse,
+)
+from src.models.chart_models import (
+    ChartCalculateResponse,
+    ChartListResponse,
+    ChartResponse,
+    CombinedReportRequest,
+)
+from src.models.job_models import JobResponse
+from src.models.location_models import PlaceSuggestResponse
+from src.location.place_suggest import get_suggest_index
+from src.services.reading_service import (
+    ayanamsa_comparison_async,
+    calculate_stored_chart_async,
+    combined_report_async,
+    dasha_periods_async,
+    generate_reading_async,
+    get_stored_chart_async,
+    list_stored_charts_async,
+)
+from src.services.chart_store import ChartStoreError
+from src.location.nominatim_client import aclose_async_client
+from src.services.worker_pool import PoolBusyError, start_pool, shutdown_pool
+from src.services import persistence
+from src.services.storage_manager import storage_manager
+from src.services.job_queue import job_runner
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.ENGINE_MODE == "pool":
+        start_pool()
+    storage_manager.start()
+    job_runner.start()
+    yield
+    await job_runner.stop()
+    await aclose_async_client()
+    shutdown_pool()
+    persistence.flush(timeout=10)
+    storage_manager.stop(timeout=10)
 
-app = FastAPI(title="AstroAI API", version="v1")
+
+app = FastAPI(title="AstroAI API", version="v1", lifespan=lifespan)
 
 # ✅ CORS Middleware (for frontend localhost:3000)
 app.add_middleware(
@@ -15,22 +65,171 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# Errors from the services, mapped once for every endpoint (and the job
+# runner records the same statuses, see job_queue.py):
+#   ValueError      400 bad input (place not found, invalid date/time, ...)
+#   ChartStoreError 500 the chart store failed
+#   PoolBusyError   503 chart workers busy, with Retry-After
+#   TimeoutError    504 REQUEST_TIMEOUT exceeded
+@app.exception_handler(ValueError)
+async def _bad_input(request: Request, exc: ValueError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(ChartStoreError)
+async def _store_failed(request: Request, exc: ChartStoreError):
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+
+@app.exception_handler(PoolBusyError)
+async def _pool_busy(request: Request, exc: PoolBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(TimeoutError)
+async def _deadline_exceeded(request: Request, exc: TimeoutError):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+def _reading_params(req: ReadingRequest) -> dict:
+    return {
+        "name": req.name,
+        "date": req.date,
+        "time": req.time,
+        "place": req.place,
+        "ayanamsa": req.ayanamsa or "raman",
+        "place_id": req.place_id,
+    }
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
+@app.get("/location/suggest", response_model=PlaceSuggestResponse)
+def location_suggest(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(default=10, ge=1, le=50),
+):
+    index = get_suggest_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Place index is not available.")
+    return {"query": q, "suggestions": index.suggest(q, limit=limit, country_code="IN")}
+
+
 @app.post("/reading/generate", response_model=ReadingResponse)
-def reading_generate(req: ReadingRequest):
+async def reading_generate(req: ReadingRequest):
+    return await generate_reading_async(
+        name=req.name,
+        date=req.date,
+        time=req.time,
+        place=req.place,
+        ayanamsa=req.ayanamsa or "raman",
+        place_id=req.place_id,
+    )
+
+
+@app.post("/reading/ayanamsa-comparison", response_model=AyanamsaComparisonResponse)
+async def reading_ayanamsa_comparison(req: AyanamsaComparisonRequest):
+    return await ayanamsa_comparison_async(
+        name=req.name,
+        date=req.date,
+        time=req.time,
+        place=req.place,
+        place_id=req.place_id,
+    )
+
+
+@app.post("/reading/dasha", response_model=DashaResponse)
+async def reading_dasha(req: DashaRequest):
+    return await dasha_periods_async(
+        name=req.name,
+        date=req.date,
+        time=req.time,
+        place=req.place,
+        ayanamsa=req.ayanamsa or "raman",
+        place_id=req.place_id,
+        system=req.system,
+        path=req.path,
+        on=req.on,
+    )
+
+
+@app.post("/charts/calculate", response_model=ChartCalculateResponse)
+async def charts_calculate(req: ReadingRequest):
+    return await calculate_stored_chart_async(**_reading_params(req))
+
+
+@app.get("/charts", response_model=ChartListResponse)
+async def charts_list(
+    limit: int = Query(default=50, ge=1, le=500),
+    before: Optional[float] = Query(default=None),
+    before_id: str = Query(default=""),
+):
+    charts = await list_stored_charts_async(limit, before, before_id)
+    last = charts[-1] if len(charts) == limit else None
+    return {
+        "charts": charts,
+        "next_before": last["created_at"] if last else None,
+        "next_before_id": last["chart_id"] if last else None,
+    }
+
+
+@app.get("/charts/{chart_id}", response_model=ChartResponse)
+async def charts_get(chart_id: str):
+    chart = await get_stored_chart_async(chart_id)
+    if chart is None:
+        raise HTTPException(status_code=404, detail=f"Chart not found: {chart_id}")
+    return {"chart_id": chart_id, "chart": chart}
+
+
+@app.post("/reports/combined", response_model=ReadingResponse)
+async def reports_combined(req: CombinedReportRequest):
     try:
-        result = generate_reading(
-            name=req.name,
-            date=req.date,
-            time=req.time,
-            place=req.place,
-            ayanamsa=req.ayanamsa or "raman",
-        )
-        return result
+        result = await combined_report_async(req.chart_id)
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    
\ No newline at end of file
+        # the chart exists (or not: 404 below); failing to render it is a server error
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Chart not found: {req.chart_id}")
+    return result
+
+
+@app.post("/jobs/charts", response_model=JobResponse, status_code=202)
+async def jobs_charts(req: ReadingRequest):
+    return await job_runner.submit("chart", _reading_params(req))
+
+
+@app.post("/jobs/readings", response_model=JobResponse, status_code=202)
+async def jobs_readings(req: ReadingRequest):
+    return await job_runner.submit("reading", _reading_params(req))
+
+
+@app.post("/jobs/reports", response_model=JobResponse, status_code=202)
+async def jobs_reports(req: CombinedReportRequest):
+    return await job_runner.submit("report", {"chart_id": req.chart_id})
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def jobs_get(job_id: str):
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def jobs_events(job_id: str):
+    if await job_runner.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return StreamingResponse(
+        job_runner.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
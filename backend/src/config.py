@@ -0,0 +1,114 @@
+"""
+Runtime settings for the AstroAI backend.
+
+Every value can be overridden with an environment variable so the same code
+runs unchanged on a laptop and on the server.
+"""
+import os
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default).strip()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(_env_str(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(_env_str(name, str(default)))
+
+
+# "pool" runs charts on pre-warmed worker processes (default).
+# "inprocess" imports the astrology scripts and calls them in the API worker.
+# "subprocess" runs each script in a fresh interpreter, for isolation.
+ENGINE_MODE = _env_str("ASTROAI_ENGINE_MODE", "pool").lower()
+
+# Worker pool: processes, jobs allowed to wait beyond those, per-job seconds
+POOL_SIZE = _env_int("ASTROAI_POOL_SIZE", os.cpu_count() or 2)
+POOL_QUEUE_DEPTH = _env_int("ASTROAI_POOL_QUEUE_DEPTH", 2 * POOL_SIZE)
+POOL_JOB_TIMEOUT = _env_float("ASTROAI_POOL_JOB_TIMEOUT", 30.0)
+
+# Swiss Ephemeris data files (.se1); empty = swisseph's built-in default
+EPHE_PATH = _env_str("ASTROAI_EPHE_PATH", "")
+
+# Year of the transit calendar in each report (retrogrades, ingresses, Chinese New Year)
+TRANSIT_YEAR = _env_int("ASTROAI_TRANSIT_YEAR", 2026)
+
+# Per-year eclipse tables (JSON), shared by all workers; empty = memory only
+ECLIPSE_CACHE_DIR = _env_str("ASTROAI_ECLIPSE_CACHE_DIR", str(BACKEND_ROOT / "data" / "eclipses"))
+
+# Chart cache: in-memory LRU entries per worker, and whether to use the disk tier
+CHART_CACHE_SIZE = _env_int("ASTROAI_CHART_CACHE_SIZE", 1024)
+CHART_CACHE_DISK = _env_str("ASTROAI_CHART_CACHE_DISK", "1") not in ("0", "false", "no")
+
+# Store each reading's chart + report Markdown (in the background), and where (SQLite)
+PERSIST_ARTIFACTS = _env_str("ASTROAI_PERSIST_ARTIFACTS", "1") not in ("0", "false", "no")
+CHART_STORE_PATH = _env_str("ASTROAI_CHART_STORE_PATH", str(BACKEND_ROOT / "data" / "charts.sqlite3"))
+
+# Storage budget for the chart store + chart cache files (bytes, entries; 0 = no limit).
+# Over budget, reports and cache files are evicted least recently used first,
+# by a background sweep every STORAGE_SWEEP_INTERVAL seconds (0 = never)
+STORAGE_MAX_BYTES = _env_int("ASTROAI_STORAGE_MAX_BYTES", 2 * 1024 ** 3)
+STORAGE_MAX_ENTRIES = _env_int("ASTROAI_STORAGE_MAX_ENTRIES", 500_000)
+STORAGE_SWEEP_INTERVAL = _env_float("ASTROAI_STORAGE_SWEEP_INTERVAL", 300.0)
+
+# Overall deadline for one /reading/generate request, in seconds
+REQUEST_TIMEOUT = _env_float("ASTROAI_REQUEST_TIMEOUT", 45.0)
+
+# Background jobs (/jobs): SQLite queue shared by all uvicorn workers, job
+# workers per process, seconds a claimed job is held before another worker may
+# retry it, runs before a job is failed, seconds between queue polls, seconds
+# finished jobs are kept
+JOB_STORE_PATH = _env_str("ASTROAI_JOB_STORE_PATH", str(BACKEND_ROOT / "data" / "jobs.sqlite3"))
+JOB_WORKERS = _env_int("ASTROAI_JOB_WORKERS", 2)
+JOB_LEASE = _env_float("ASTROAI_JOB_LEASE", REQUEST_TIMEOUT + 15.0)
+JOB_MAX_ATTEMPTS = _env_int("ASTROAI_JOB_MAX_ATTEMPTS", 3)
+JOB_POLL_INTERVAL = _env_float("ASTROAI_JOB_POLL_INTERVAL", 1.0)
+JOB_RETENTION = _env_float("ASTROAI_JOB_RETENTION", 24 * 3600.0)
+
+# Geocoding cache (SQLite): location, seconds to keep hits and not-found places
+GEOCODE_CACHE_PATH = _env_str(
+    "ASTROAI_GEOCODE_CACHE_PATH", str(BACKEND_ROOT / "data" / "geocode_cache.sqlite3")
+)
+GEOCODE_TTL = _env_float("ASTROAI_GEOCODE_TTL", 30 * 24 * 3600.0)
+GEOCODE_NEGATIVE_TTL = _env_float("ASTROAI_GEOCODE_NEGATIVE_TTL", 24 * 3600.0)
+
+# Offline gazetteer: GeoNames-style TSV, admin1 names, and its built index
+GAZETTEER_ENABLED = _env_str("ASTROAI_GAZETTEER_ENABLED", "1") not in ("0", "false", "no")
+GAZETTEER_PATH = _env_str(
+    "ASTROAI_GAZETTEER_PATH", str(BACKEND_ROOT / "src" / "location" / "data" / "IN_places.tsv")
+)
+GAZETTEER_ADMIN1_PATH = _env_str(
+    "ASTROAI_GAZETTEER_ADMIN1_PATH", str(BACKEND_ROOT / "src" / "location" / "data" / "IN_admin1.tsv")
+)
+GAZETTEER_INDEX_PATH = _env_str(
+    "ASTROAI_GAZETTEER_INDEX_PATH", str(BACKEND_ROOT / "data" / "gazetteer.idx")
+)
+
+# Nominatim client: seconds per request, keep-alive connections per process,
+# requests/second and burst shared by all workers (state in a small file),
+# longest wait for a rate-limit slot before failing fast
+NOMINATIM_TIMEOUT = _env_float("ASTROAI_NOMINATIM_TIMEOUT", 10.0)
+NOMINATIM_POOL_SIZE = _env_int("ASTROAI_NOMINATIM_POOL_SIZE", 4)
+NOMINATIM_RATE = _env_float("ASTROAI_NOMINATIM_RATE", 1.0)
+NOMINATIM_BURST = _env_float("ASTROAI_NOMINATIM_BURST", 1.0)
+NOMINATIM_MAX_WAIT = _env_float("ASTROAI_NOMINATIM_MAX_WAIT", 5.0)
+NOMINATIM_RATE_STATE_PATH = _env_str(
+    "ASTROAI_NOMINATIM_RATE_STATE_PATH", str(BACKEND_ROOT / "data" / "nominatim_rate.state")
+)
+
+# Circuit breaker: consecutive failures before failing fast, seconds before a retry
+NOMINATIM_BREAKER_FAILURES = _env_int("ASTROAI_NOMINATIM_BREAKER_FAILURES", 5)
+NOMINATIM_BREAKER_RESET = _env_float("ASTROAI_NOMINATIM_BREAKER_RESET", 30.0)
+
+# Timezone boundaries (the optional timezonefinder package); grid of places: cell
+# size in degrees, and how far (km) a point may be from the nearest place;
+# zone.tab path ("" = zoneinfo's own)
+TZ_BOUNDARIES_ENABLED = _env_str("ASTROAI_TZ_BOUNDARIES", "1") not in ("0", "false", "no")
+TZ_GRID_DEGREES = _env_float("ASTROAI_TZ_GRID_DEGREES", 1.0)
+TZ_MAX_DISTANCE_KM = _env_float("ASTROAI_TZ_MAX_DISTANCE_KM", 300.0)
+TZ_ZONE_TAB_PATH = _env_str("ASTROAI_TZ_ZONE_TAB_PATH", "")
@@ -0,0 +1,350 @@
+"""
+Offline place index (gazetteer) for the location resolver.
+
+Built from a GeoNames-style TSV (the 19-column "geoname" table, e.g. IN.txt
+or cities15000.txt) plus an optional admin1CodesASCII file for state names,
+into a compact binary index that is memory-mapped at runtime. Lookups are a
+binary search over sorted, normalized name keys, so "Visakhapatnam, India"
+resolves in microseconds without a network call. Every uvicorn worker maps
+the same file, so the pages are shared.
+
+Index file layout (little-endian):
+
+    header   MAGIC, n_records, n_keys, n_strings
+    records  n_records x RECORD   (geonameid, lat, lon, population, string ids)
+    keys     n_keys    x KEY      (key offset, key length, record index),
+                                  sorted by key bytes, then population desc
+    strings  (n_strings + 1) x u32 offsets into the string blob
+    blobs    key bytes, then string bytes (UTF-8)
+
+Build from the command line:
+
+    python -m src.location.gazetteer build IN.txt data/gazetteer.idx \\
+        --admin1 admin1CodesASCII.txt
+"""
+import argparse
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src import config
+
+MAGIC = b"ASTROGZ1"
+HEADER = struct.Struct("<8sIII")
+# geonameid, lat, lon, population, name, admin1, timezone, country (string ids)
+RECORD = struct.Struct("<IddIIIII")
+# key offset in key blob, key length, record index
+KEY = struct.Struct("<III")
+OFFSET = struct.Struct("<I")
+
+
+class GazetteerError(Exception):
+    pass
+
+
+def normalize_name(text: str) -> str:
+    """Lower-case ASCII, punctuation folded to single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^0-9a-z]+", " ", text.lower())
+    return text.strip()
+
+
+# -----------------------------------------------------------------------------
+# Build
+# -----------------------------------------------------------------------------
+
+def _read_admin1(path: Optional[Path]) -> Dict[str, str]:
+    """'IN.02' -> 'Andhra Pradesh'."""
+    names: Dict[str, str] = {}
+    if path is None or not path.exists():
+        return names
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) >= 2:
+                names[cols[0]] = cols[1]
+    return names
+
+
+def _read_places(path: Path, admin1: Dict[str, str]) -> Iterable[tuple]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 18:
+                continue
+            # populated places (P) and administrative areas (A) only
+            if cols[6] not in ("P", "A"):
+                continue
+            country = cols[8]
+            yield (
+                int(cols[0]),
+                cols[1],
+                cols[2],
+                [a for a in cols[3].split(",") if a],
+                float(cols[4]),
+                float(cols[5]),
+                int(cols[14] or 0),
+                admin1.get(f"{country}.{cols[10]}", ""),
+                cols[17],
+                country,
+            )
+
+
+def build_index(tsv_path: Path, out_path: Path, admin1_path: Optional[Path] = None) -> int:
+    """Builds the binary index from a GeoNames TSV. Returns the record count."""
+    admin1 = _read_admin1(admin1_path)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        if s not in string_ids:
+            string_ids[s] = len(strings)
+            strings.append(s)
+        return string_ids[s]
+
+    records: List[tuple] = []
+    keys: List[Tuple[bytes, int, int]] = []  # (key, -population, record index)
+
+    for gid, name, ascii_name, alternates, lat, lon, pop, state, tz, country in _read_places(
+        Path(tsv_path), admin1
+    ):
+        idx = len(records)
+        records.append(
+            (gid, lat, lon, pop, intern(name), intern(state), intern(tz), intern(country))
+        )
+        for alias in {normalize_name(n) for n in [name, ascii_name, *alternates]}:
+            if alias:
+                keys.append((alias.encode("utf-8"), -pop, idx))
+
+    keys.sort()
+
+    key_blob = bytearray()
+    key_entries = []
+    for key, _, idx in keys:
+        key_entries.append((len(key_blob), len(key), idx))
+        key_blob += key
+
+    string_blob = bytearray()
+    string_offsets = []
+    for s in strings:
+        string_offsets.append(len(string_blob))
+        string_blob += s.encode("utf-8")
+    string_offsets.append(len(string_blob))
+
+    out = bytearray(HEADER.pack(MAGIC, len(records), len(key_entries), len(strings)))
+    for r in records:
+        out += RECORD.pack(*r)
+    for k in key_entries:
+        out += KEY.pack(*k)
+    for o in string_offsets:
+        out += OFFSET.pack(o)
+    out += key_blob
+    out += string_blob
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(bytes(out))
+    os.replace(tmp, out_path)
+    return len(records)
+
+
+# -----------------------------------------------------------------------------
+# Lookup
+# -----------------------------------------------------------------------------
+
+class _SortedKeys:
+    """Sequence view over the mmapped key table, for bisect."""
+
+    def __init__(self, gz: "Gazetteer"):
+        self._gz = gz
+
+    def __len__(self) -> int:
+        return self._gz.n_keys
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._gz._key(i)[0]
+
+
+class Gazetteer:
+    def __init__(self, index_path: Path):
+        self.path = Path(index_path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.n_records, self.n_keys, self.n_strings = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise GazetteerError(f"{self.path} is not a gazetteer index.")
+
+        self._records_at = HEADER.size
+        self._keys_at = self._records_at + self.n_records * RECORD.size
+        self._offsets_at = self._keys_at + self.n_keys * KEY.size
+        self._key_blob_at = self._offsets_at + (self.n_strings + 1) * OFFSET.size
+        key_blob_len = 0
+        if self.n_keys:
+            last_off, last_len, _ = KEY.unpack_from(
+                self._mm, self._keys_at + (self.n_keys - 1) * KEY.size
+            )
+            key_blob_len = last_off + last_len
+        self._string_blob_at = self._key_blob_at + key_blob_len
+        self._sorted_keys = _SortedKeys(self)
+
+    def __len__(self) -> int:
+        return self.n_records
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _key(self, i: int) -> Tuple[bytes, int]:
+        off, length, rec = KEY.unpack_from(self._mm, self._keys_at + i * KEY.size)
+        start = self._key_blob_at + off
+        return self._mm[start:start + length], rec
+
+    def _string(self, i: int) -> str:
+        start, end = struct.unpack_from("<II", self._mm, self._offsets_at + i * OFFSET.size)
+        base = self._string_blob_at
+        return self._mm[base + start:base + end].decode("utf-8")
+
+    def record(self, i: int) -> dict:
+        gid, lat, lon, pop, name, state, tz, country = RECORD.unpack_from(
+            self._mm, self._records_at + i * RECORD.size
+        )
+        return {
+            "place_id": gid,
+            "name": self._string(name),
+            "admin1": self._string(state),
+            "country_code": self._string(country),
+            "latitude": lat,
+            "longitude": lon,
+            "timezone_name": self._string(tz),
+            "population": pop,
+        }
+
+    def place_id(self, i: int) -> int:
+        return RECORD.unpack_from(self._mm, self._records_at + i * RECORD.size)[0]
+
+    def population(self, i: int) -> int:
+        return RECORD.unpack_from(self._mm, self._records_at + i * RECORD.size)[3]
+
+    def key(self, i: int) -> Tuple[str, int]:
+        """The i-th (normalized name, record index) pair in sorted key order."""
+        key, rec = self._key(i)
+        return key.decode("utf-8"), rec
+
+    def bisect_key(self, prefix: str) -> int:
+        """Position of the first key >= prefix, for prefix scans with key()."""
+        return bisect_left(self._sorted_keys, prefix.encode("utf-8"))
+
+    def keys(self) -> Iterable[Tuple[str, int]]:
+        """All (normalized name, record index) pairs, in sorted key order."""
+        for i in range(self.n_keys):
+            yield self.key(i)
+
+    def find(self, name: str) -> List[int]:
+        """Record indexes whose name or alternate name normalizes to `name`."""
+        key = normalize_name(name).encode("utf-8")
+        if not key:
+            return []
+        i = bisect_left(self._sorted_keys, key)
+        found = []
+        while i < self.n_keys:
+            k, rec = self._key(i)
+            if k != key:
+                break
+            found.append(rec)
+            i += 1
+        return found
+
+    def lookup(self, query: str, country_code: Optional[str] = None) -> Optional[dict]:
+        """
+        Resolves "City", "City, State" or "City, State, Country" to the most
+        populous matching place, or None. A given state must match.
+        """
+        parts = [normalize_name(p) for p in query.split(",")]
+        parts = [p for p in parts if p and p != "india"]
+        if not parts:
+            return None
+
+        city, qualifiers = parts[0], parts[1:]
+        for rec in self.find(city):  # already ordered by population, desc
+            place = self.record(rec)
+            if country_code and place["country_code"] != country_code:
+                continue
+            state = normalize_name(place["admin1"])
+            if qualifiers and not any(q == state for q in qualifiers):
+                continue
+            return place
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Shared instance
+# -----------------------------------------------------------------------------
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def _index_is_stale(index_path: Path, sources: List[Path]) -> bool:
+    if not index_path.exists():
+        return True
+    built = index_path.stat().st_mtime
+    return any(p.exists() and p.stat().st_mtime > built for p in sources)
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    The configured gazetteer, (re)building its index from the TSV if the index
+    is missing or older than the source. None if disabled or unavailable.
+    """
+    global _gazetteer
+    if _gazetteer is not None or not config.GAZETTEER_ENABLED:
+        return _gazetteer
+
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            tsv = Path(config.GAZETTEER_PATH)
+            admin1 = Path(config.GAZETTEER_ADMIN1_PATH) if config.GAZETTEER_ADMIN1_PATH else None
+            index = Path(config.GAZETTEER_INDEX_PATH)
+            try:
+                if tsv.exists() and _index_is_stale(index, [tsv] + ([admin1] if admin1 else [])):
+                    build_index(tsv, index, admin1)
+                _gazetteer = Gazetteer(index)
+            except (OSError, ValueError, struct.error, GazetteerError):
+                return None
+    return _gazetteer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AstroAI offline gazetteer index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="Build the binary index from a GeoNames TSV")
+    b.add_argument("tsv", help="GeoNames geoname table (e.g. IN.txt)")
+    b.add_argument("output", help="Index file to write")
+    b.add_argument("--admin1", default=None, help="admin1CodesASCII.txt for state names")
+
+    q = sub.add_parser("lookup", help="Look up a place in a built index")
+    q.add_argument("index", help="Index file")
+    q.add_argument("place", help='e.g. "Visakhapatnam, Andhra Pradesh"')
+
+    args = parser.parse_args()
+    if args.command == "build":
+        n = build_index(Path(args.tsv), Path(args.output), Path(args.admin1) if args.admin1 else None)
+        print(f"Indexed {n} places into {args.output}")
+    else:
+        print(Gazetteer(Path(args.index)).lookup(args.place))
+
+
+if __name__ == "__main__":
+    main()
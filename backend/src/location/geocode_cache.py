@@ -0,0 +1,154 @@
+"""
+Persistent geocoding cache for the place resolver.
+
+Results are stored in SQLite, keyed on a normalized place string, so
+"Visakhapatnam, India" is geocoded once per TTL instead of once per reading.
+Places Nominatim could not find are cached too (negative entries, shorter
+TTL). Concurrent lookups of the same uncached place share one upstream call
+(single-flight), in threads and in asyncio alike.
+"""
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src import config
+
+
+def normalize_place(place: str) -> str:
+    """
+    Cache key for a place string: lower-case, punctuation and repeated
+    whitespace removed, and ", india" appended the same way the resolver
+    biases its query, so "Vizag" and "vizag,  India." share an entry.
+    """
+    text = place.strip().lower()
+    text = re.sub(r"[^\w,]+", " ", text)
+    parts = [" ".join(p.split()) for p in text.split(",")]
+    parts = [p for p in parts if p]
+    if "india" not in parts:
+        parts.append("india")
+    return ", ".join(parts)
+
+
+class GeocodeCache:
+    """
+    SQLite-backed cache. One connection per thread; WAL mode so several
+    uvicorn workers can read while one writes.
+    """
+
+    def __init__(self, path: Path, ttl: float, negative_ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geocode (
+                    key TEXT PRIMARY KEY,
+                    found INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Tuple[bool, Dict[str, Any]]]:
+        """
+        (found, payload) for a live entry, or None. Negative entries come back
+        as (False, {"error": message}). allow_stale ignores expiry.
+        """
+        try:
+            row = self._conn().execute(
+                "SELECT found, payload, expires_at FROM geocode WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        found, payload, expires_at = row
+        if not allow_stale and expires_at < time.time():
+            return None
+        return bool(found), json.loads(payload)
+
+    def put(self, key: str, location: Dict[str, Any]) -> None:
+        self._write(key, True, location, self.ttl)
+
+    def put_not_found(self, key: str, message: str) -> None:
+        self._write(key, False, {"error": message}, self.negative_ttl)
+
+    def _write(self, key: str, found: bool, payload: Dict[str, Any], ttl: float) -> None:
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO geocode (key, found, payload, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, int(found), json.dumps(payload), time.time() + ttl),
+                )
+        except sqlite3.Error:
+            # the cache is an optimisation; a failed write must not fail the lookup
+            pass
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._tasks: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # tasks belong to one event loop, so the loop is part of the key
+        task_key = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _t: self._tasks.pop(task_key, None))
+        # shield: one caller timing out must not cancel the others' lookup
+        return await asyncio.shield(task)
+
+
+geocode_cache = GeocodeCache(
+    path=Path(config.GEOCODE_CACHE_PATH),
+    ttl=config.GEOCODE_TTL,
+    negative_ttl=config.GEOCODE_NEGATIVE_TTL,
+)
+
+single_flight = SingleFlight()
@@ -0,0 +1,265 @@
+"""
+Shared HTTP client for OpenStreetMap Nominatim.
+
+- one keep-alive connection pool per process (requests.Session for sync
+  callers, httpx.AsyncClient for async ones) instead of a new TCP+TLS
+  handshake per lookup
+- a token bucket shared by every worker process on the host (state in a
+  small file guarded by flock), so together they honor Nominatim's
+  1 request/second usage policy
+- a circuit breaker that fails fast for a cool-down period after repeated
+  upstream failures, so a degraded Nominatim can't stall request workers
+"""
+import asyncio
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: limiter is per-process only
+    fcntl = None
+
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+# Nominatim requires a valid User-Agent
+NOMINATIM_HEADERS = {
+    "User-Agent": "AstroAI/1.0 (learning-project; contact: local-dev)"
+}
+
+
+class UpstreamUnavailableError(Exception):
+    """Nominatim was not called (circuit open, rate limit) or failed."""
+
+
+# -----------------------------------------------------------------------------
+# Rate limiting
+# -----------------------------------------------------------------------------
+
+class SharedTokenBucket:
+    """
+    Token bucket whose state (tokens, last refill time) lives in a file, so
+    all processes on the host draw from the same bucket. Callers reserve a
+    token and are told how long to wait for it.
+    """
+
+    _STATE = struct.Struct("<dd")
+
+    def __init__(self, path: Path, rate: float, burst: float, max_wait: float):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes one token and returns the seconds to wait before using it.
+        Raises UpstreamUnavailableError if the wait would exceed max_wait.
+        """
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+b") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    return self._reserve_locked(f)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _reserve_locked(self, f) -> float:
+        now = time.time()
+        f.seek(0)
+        raw = f.read(self._STATE.size)
+        if len(raw) == self._STATE.size:
+            tokens, last = self._STATE.unpack(raw)
+        else:
+            tokens, last = self.burst, now
+
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+        if wait > self.max_wait:
+            raise UpstreamUnavailableError("Geocoder rate limit reached; try again shortly.")
+
+        # tokens may go negative: that is the queue of reservations
+        f.seek(0)
+        f.truncate()
+        f.write(self._STATE.pack(tokens - 1, now))
+        f.flush()
+        return wait
+
+
+# -----------------------------------------------------------------------------
+# Circuit breaker
+# -----------------------------------------------------------------------------
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout` seconds, letting one trial call through;
+    a success closes it again, a failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raises UpstreamUnavailableError if calls are not allowed right now."""
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise UpstreamUnavailableError("Geocoder is temporarily unavailable.")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """The call never reached the upstream: free a half-open trial, change nothing else."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+# -----------------------------------------------------------------------------
+# Clients
+# -----------------------------------------------------------------------------
+
+rate_limiter = SharedTokenBucket(
+    path=Path(config.NOMINATIM_RATE_STATE_PATH),
+    rate=config.NOMINATIM_RATE,
+    burst=config.NOMINATIM_BURST,
+    max_wait=config.NOMINATIM_MAX_WAIT,
+)
+
+breaker = CircuitBreaker(
+    failure_threshold=config.NOMINATIM_BREAKER_FAILURES,
+    reset_timeout=config.NOMINATIM_BREAKER_RESET,
+)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(NOMINATIM_HEADERS)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.NOMINATIM_POOL_SIZE)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            headers=NOMINATIM_HEADERS,
+            timeout=config.NOMINATIM_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=config.NOMINATIM_POOL_SIZE),
+        )
+    return _async_client
+
+
+async def aclose_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _is_upstream_failure(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def search(params: dict) -> list:
+    """GET /search through the breaker and rate limiter. Returns the JSON list."""
+    breaker.before_call()
+    try:
+        time.sleep(rate_limiter.reserve())
+    except UpstreamUnavailableError:
+        breaker.release_trial()  # not the upstream's fault
+        raise
+
+    try:
+        resp = _get_session().get(NOMINATIM_URL, params=params, timeout=config.NOMINATIM_TIMEOUT)
+    except requests.RequestException as e:
+        breaker.record_failure()
+        raise UpstreamUnavailableError(f"Failed to call OpenStreetMap resolver: {e}")
+
+    if _is_upstream_failure(resp.status_code):
+        breaker.record_failure()
+        raise UpstreamUnavailableError(f"OpenStreetMap resolver returned HTTP {resp.status_code}.")
+    breaker.record_success()
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def search_async(params: dict) -> list:
+    """Async search(); waits for the rate limiter without blocking the loop."""
+    breaker.before_call()
+    loop = asyncio.get_running_loop()
+    try:
+        # the flock can block briefly on contention, so keep it off the loop
+        wait = await loop.run_in_executor(None, rate_limiter.reserve)
+    except UpstreamUnavailableError:
+        breaker.release_trial()
+        raise
+    await asyncio.sleep(wait)
+
+    try:
+        resp = await _get_async_client().get(NOMINATIM_URL, params=params)
+    except httpx.HTTPError as e:
+        breaker.record_failure()
+        raise UpstreamUnavailableError(f"Failed to call OpenStreetMap resolver: {e}")
+
+    if _is_upstream_failure(resp.status_code):
+        breaker.record_failure()
+        raise UpstreamUnavailableError(f"OpenStreetMap resolver returned HTTP {resp.status_code}.")
+    breaker.record_success()
+    resp.raise_for_status()
+    return resp.json()
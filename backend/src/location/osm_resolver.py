@@ -1,20 +1,24 @@
-import requests
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from src.location import nominatim_client
+from src.location.nominatim_client import UpstreamUnavailableError
+from src.location.gazetteer import get_gazetteer
+from src.location.timezones import TimezoneResolveError, timezone_at, utc_offset_hours
+from src.location.place_suggest import get_suggest_index
+from src.location.geocode_cache import geocode_cache, normalize_place, single_flight
 
 
 class LocationResolveError(Exception):
     pass
 
 
-def resolve_place_india(place: str) -> dict:
-    """
-    Free geocoding using OpenStreetMap Nominatim.
-    India MVP:
-      - returns lat/lon via OSM
-      - timezone fixed to Asia/Kolkata (+5.5)
+class PlaceNotFoundError(LocationResolveError):
+    """Nominatim answered, but had no match. Cached like a result."""
 
-    If place is ambiguous or not found, raise LocationResolveError.
-    """
 
+def _nominatim_params(place: str) -> dict:
     if not place or not place.strip():
         raise LocationResolveError("Place is empty.")
 
@@ -23,37 +27,206 @@ def resolve_place_india(place: str) -> dict:
     if "india" not in query.lower():
         query = f"{query}, India"
 
-    url = "https://nominatim.openstreetmap.org/search"
-    params = {
+    return {
         "q": query,
         "format": "json",
         "limit": 1,
         "addressdetails": 1,
     }
 
-    # Nominatim requires a valid User-Agent
-    headers = {
-        "User-Agent": "AstroAI/1.0 (learning-project; contact: local-dev)"
-    }
-
-    try:
-        resp = requests.get(url, params=params, headers=headers, timeout=15)
-        resp.raise_for_status()
-        results = resp.json()
-    except Exception as e:
-        raise LocationResolveError(f"Failed to call OpenStreetMap resolver: {e}")
 
+def _location_from_results(place: str, results: list) -> dict:
     if not results:
-        raise LocationResolveError("Place not found. Please provide City, State, India.")
+        raise PlaceNotFoundError("Place not found. Please provide City, State, India.")
 
     r = results[0]
     lat = float(r["lat"])
     lon = float(r["lon"])
+    country = (r.get("address") or {}).get("country_code")
 
     return {
         "place": place,
         "latitude": lat,
         "longitude": lon,
-        "timezone_name": "Asia/Kolkata",
-        "timezone_offset": 5.5,
+        "timezone_name": _timezone_name(lat, lon, country),
     }
+
+
+def _timezone_name(lat: float, lon: float, country_code: Optional[str]) -> str:
+    try:
+        return timezone_at(lat, lon, country_code)
+    except TimezoneResolveError as e:
+        raise LocationResolveError(str(e))
+
+
+def _from_gazetteer(place: str) -> Optional[dict]:
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    hit = gazetteer.lookup(place, country_code="IN")
+    if hit is None:
+        return None
+    return _gazetteer_location(place, hit)
+
+
+def _gazetteer_location(place: str, hit: dict) -> dict:
+    return {
+        "place": place,
+        "latitude": hit["latitude"],
+        "longitude": hit["longitude"],
+        "timezone_name": hit["timezone_name"]
+        or _timezone_name(hit["latitude"], hit["longitude"], hit["country_code"]),
+    }
+
+
+def _with_offset(loc: dict, date: Optional[str], time: Optional[str]) -> dict:
+    """
+    Adds timezone_offset: the zone's UTC offset at the birth date/time, or
+    right now if no date is given.
+    """
+    if date is None:
+        date, time = datetime.now().strftime("%Y-%m-%d %H:%M:%S").split()
+    try:
+        offset = utc_offset_hours(loc["timezone_name"], date, time or "12:00:00")
+    except TimezoneResolveError as e:
+        raise LocationResolveError(str(e))
+    return {**loc, "timezone_offset": offset}
+
+
+def resolve_place_id(
+    place_id: int, place: str = "", date: Optional[str] = None, time: Optional[str] = None
+) -> dict:
+    """
+    Resolves an exact gazetteer place_id (as returned by /location/suggest).
+    Raises PlaceNotFoundError for unknown ids.
+    """
+    index = get_suggest_index()
+    hit = index.place(place_id) if index is not None else None
+    if hit is None or hit["country_code"] != "IN":
+        raise PlaceNotFoundError(f"Unknown place_id {place_id}.")
+    return _with_offset(_gazetteer_location(place or hit["name"], hit), date, time)
+
+
+def _cacheable(loc: dict) -> dict:
+    # the offset depends on the birth date, so only the zone is cached
+    return {k: v for k, v in loc.items() if k not in ("place", "timezone_offset")}
+
+
+def _from_cache(place: str, key: str) -> Optional[dict]:
+    cached = geocode_cache.get(key)
+    if cached is None:
+        return None
+    found, payload = cached
+    if not found:
+        raise PlaceNotFoundError(payload["error"])
+    return {**payload, "place": place}
+
+
+def _from_stale_cache(place: str, key: str, error: Exception) -> dict:
+    """
+    Nominatim is unavailable (circuit open, rate limited, failing): an expired
+    cache entry is still better than no answer.
+    """
+    cached = geocode_cache.get(key, allow_stale=True)
+    if cached is None or not cached[0]:
+        raise LocationResolveError(str(error))
+    return {**cached[1], "place": place}
+
+
+def _search_nominatim(place: str) -> list:
+    params = _nominatim_params(place)
+
+    try:
+        return nominatim_client.search(params)
+    except UpstreamUnavailableError:
+        raise
+    except Exception as e:
+        raise LocationResolveError(f"Failed to call OpenStreetMap resolver: {e}")
+
+
+def _cache_results(key: str, place: str, results: list) -> dict:
+    try:
+        loc = _location_from_results(place, results)
+    except PlaceNotFoundError as e:
+        geocode_cache.put_not_found(key, str(e))
+        raise
+    geocode_cache.put(key, _cacheable(loc))
+    return loc
+
+
+def _lookup_and_cache(key: str, place: str) -> dict:
+    try:
+        results = _search_nominatim(place)
+    except UpstreamUnavailableError as e:
+        return _from_stale_cache(place, key, e)
+    return _cache_results(key, place, results)
+
+
+def _from_local(place: str, key: str) -> Optional[dict]:
+    """The gazetteer, then the geocode cache; None if neither knows the place."""
+    loc = _from_gazetteer(place)
+    if loc is not None:
+        return loc
+    return _from_cache(place, key)
+
+
+def resolve_place_india(place: str, date: Optional[str] = None, time: Optional[str] = None) -> dict:
+    """
+    Place resolution for the India MVP:
+      - the offline gazetteer first (no network)
+      - then OpenStreetMap Nominatim, for places the gazetteer doesn't know
+      - timezone from the offline zone grid, and its historical UTC offset at
+        the birth date/time (the current offset if no date is given)
+
+    Nominatim results (and not-found answers) are cached on disk by normalized
+    place, and concurrent lookups of the same place share one Nominatim call.
+    Nominatim calls are rate limited across workers and guarded by a circuit
+    breaker; while it is unavailable an expired cache entry is used if present.
+
+    If place is ambiguous or not found, raise LocationResolveError.
+    """
+    _nominatim_params(place)  # validates
+
+    key = normalize_place(place)
+    loc = _from_local(place, key)
+    if loc is None:
+        loc = single_flight.do(key, lambda: _lookup_and_cache(key, place))
+    return _with_offset({**loc, "place": place}, date, time)
+
+
+async def _search_nominatim_async(place: str) -> list:
+    params = _nominatim_params(place)
+
+    try:
+        return await nominatim_client.search_async(params)
+    except UpstreamUnavailableError:
+        raise
+    except Exception as e:
+        raise LocationResolveError(f"Failed to call OpenStreetMap resolver: {e}")
+
+
+async def _lookup_and_cache_async(key: str, place: str) -> dict:
+    loop = asyncio.get_running_loop()
+    try:
+        results = await _search_nominatim_async(place)
+    except UpstreamUnavailableError as e:
+        return await loop.run_in_executor(None, _from_stale_cache, place, key, e)
+    return await loop.run_in_executor(None, _cache_results, key, place, results)
+
+
+async def resolve_place_india_async(
+    place: str, date: Optional[str] = None, time: Optional[str] = None
+) -> dict:
+    """
+    Same as resolve_place_india, but awaits the Nominatim call instead of
+    blocking a thread on it. The gazetteer (mmap), the geocode cache (SQLite)
+    and the zone lookup block too, so they run on the default executor.
+    """
+    _nominatim_params(place)  # validates
+
+    loop = asyncio.get_running_loop()
+    key = normalize_place(place)
+    loc = await loop.run_in_executor(None, _from_local, place, key)
+    if loc is None:
+        loc = await single_flight.do_async(key, lambda: _lookup_and_cache_async(key, place))
+    return await loop.run_in_executor(None, _with_offset, {**loc, "place": place}, date, time)
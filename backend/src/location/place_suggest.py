@@ -0,0 +1,180 @@
+"""
+Place autocomplete over the offline gazetteer.
+
+Two indexes over every gazetteer name and alternate name:
+  - the gazetteer's own sorted key table (memory-mapped), for prefix matches
+    via bisect ("visak" -> Visakhapatnam)
+  - trigram postings, for typo-tolerant matches ("vishakapatnam"): each
+    trigram's keys, most populous place first, in one flat array("I") with
+    per-trigram offsets rather than per-key Python objects
+
+A fuzzy query only reads the postings of its rarest trigrams. A key with
+Jaccard similarity >= MIN_SIMILARITY shares at least that fraction of the
+query's n trigrams, so it contains one of the (n - shared + 1) rarest. Keys
+found there are scored exactly, unless even sharing every unread query
+trigram would leave them below the threshold. Postings
+are read up to MAX_POSTINGS_PER_GRAM entries, which bounds the work for
+common trigrams on large gazetteers (the most populous places are kept).
+
+Suggestions carry the gazetteer place_id (the GeoNames geonameid), which
+/reading/generate accepts so the frontend can submit an exact place instead
+of free text.
+"""
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from src.location.gazetteer import Gazetteer, get_gazetteer, normalize_name
+
+# candidates below this trigram similarity (Jaccard) are dropped
+MIN_SIMILARITY = 0.3
+
+# stop scanning prefix matches after this many entries
+MAX_PREFIX_SCAN = 200
+
+# read at most this many entries of one trigram's postings
+MAX_POSTINGS_PER_GRAM = 128
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlaceSuggestIndex:
+    def __init__(self, gazetteer: Gazetteer):
+        self.gazetteer = gazetteer
+
+        # entries are the gazetteer's keys, most populous place first, so each
+        # trigram's postings come out in that order too
+        populations = array("I", map(gazetteer.population, range(len(gazetteer))))
+        self._key_positions = array("I", sorted(
+            range(gazetteer.n_keys), key=lambda i: populations[gazetteer.key(i)[1]], reverse=True
+        ))
+        self._trigram_counts = array("H")
+        postings: Dict[str, array] = defaultdict(lambda: array("I"))
+        for entry, i in enumerate(self._key_positions):
+            grams = _trigrams(gazetteer.key(i)[0])
+            self._trigram_counts.append(min(len(grams), 0xFFFF))
+            for g in grams:
+                postings[g].append(entry)
+
+        # trigram g: entries postings[gram_starts[gram_ids[g]]:gram_starts[gram_ids[g] + 1]]
+        self._gram_ids: Dict[str, int] = {}
+        self._gram_starts = array("I", [0])
+        self._postings = array("I")
+        for g in list(postings):
+            self._gram_ids[g] = len(self._gram_ids)
+            self._postings.extend(postings.pop(g))
+            self._gram_starts.append(len(self._postings))
+
+        # place_id -> record, by bisect over sorted ids
+        records = sorted(range(len(gazetteer)), key=gazetteer.place_id)
+        self._place_ids = array("I", map(gazetteer.place_id, records))
+        self._place_records = array("I", records)
+
+    def place(self, place_id: int) -> Optional[dict]:
+        i = bisect_left(self._place_ids, place_id)
+        if i == len(self._place_ids) or self._place_ids[i] != place_id:
+            return None
+        return self.gazetteer.record(self._place_records[i])
+
+    def _prefix_matches(self, q: str, scores: Dict[int, float]) -> None:
+        i = self.gazetteer.bisect_key(q)
+        end = min(self.gazetteer.n_keys, i + MAX_PREFIX_SCAN)
+        while i < end:
+            key, rec = self.gazetteer.key(i)
+            if not key.startswith(q):
+                break
+            score = 2.0 if key == q else 1.0 + len(q) / len(key)
+            if score > scores.get(rec, 0.0):
+                scores[rec] = score
+            i += 1
+
+    def _posting_count(self, gid: int) -> int:
+        return self._gram_starts[gid + 1] - self._gram_starts[gid]
+
+    def _fuzzy_matches(self, q: str, scores: Dict[int, float]) -> None:
+        grams = _trigrams(q)
+        known = [self._gram_ids[g] for g in grams if g in self._gram_ids]
+        # trigrams no key has count towards the rarest, at no cost
+        min_shared = math.ceil(MIN_SIMILARITY * len(grams) - 1e-9)
+        n_probe = len(grams) - min_shared + 1 - (len(grams) - len(known))
+        if n_probe <= 0:
+            return
+
+        hits: Counter = Counter()
+        for gid in sorted(known, key=self._posting_count)[:n_probe]:
+            start = self._gram_starts[gid]
+            stop = min(self._gram_starts[gid + 1], start + MAX_POSTINGS_PER_GRAM)
+            hits.update(self._postings[start:stop])
+
+        unprobed = max(len(known) - n_probe, 0)
+        for entry, n in hits.items():
+            # at best the key also has every query trigram that was not probed
+            best = n + unprobed
+            if best < MIN_SIMILARITY * (len(grams) + self._trigram_counts[entry] - best):
+                continue
+            key, rec = self.gazetteer.key(self._key_positions[entry])
+            own = _trigrams(key)
+            shared = len(grams & own)
+            similarity = shared / (len(grams) + len(own) - shared)
+            if similarity < MIN_SIMILARITY:
+                continue
+            if similarity > scores.get(rec, 0.0):
+                scores[rec] = similarity
+
+    def suggest(self, query: str, limit: int = 10, country_code: Optional[str] = None) -> List[dict]:
+        """
+        Ranked candidates for a partial place string. "City, State" narrows
+        to places whose state starts with the given text.
+        """
+        parts = [normalize_name(p) for p in query.split(",")]
+        parts = [p for p in parts if p and p != "india"]
+        if not parts:
+            return []
+        q, state_prefix = parts[0], (parts[1] if len(parts) > 1 else "")
+
+        # exact/prefix hits score 1..2, fuzzy hits 0.3..1
+        scores: Dict[int, float] = {}
+        self._prefix_matches(q, scores)
+        if len(scores) < limit:
+            self._fuzzy_matches(q, scores)
+
+        results = []
+        for rec, score in scores.items():
+            place = self.gazetteer.record(rec)
+            if country_code and place["country_code"] != country_code:
+                continue
+            if state_prefix and not normalize_name(place["admin1"]).startswith(state_prefix):
+                continue
+            # population breaks ties between equally good name matches
+            rank = score + math.log10(place["population"] + 1) / 100
+            results.append((rank, place))
+
+        results.sort(key=lambda r: r[0], reverse=True)
+        suggestions = []
+        for rank, place in results[:limit]:
+            label = ", ".join(p for p in (place["name"], place["admin1"], place["country_code"]) if p)
+            suggestions.append({**place, "label": label, "score": round(rank, 4)})
+        return suggestions
+
+
+_index: Optional[PlaceSuggestIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_suggest_index() -> Optional[PlaceSuggestIndex]:
+    """Shared index, built on first use. None if the gazetteer is unavailable."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                gazetteer = get_gazetteer()
+                if gazetteer is None:
+                    return None
+                _index = PlaceSuggestIndex(gazetteer)
+    return _index
@@ -0,0 +1,301 @@
+"""
+Offline timezone resolution for birth places.
+
+Two steps, neither of which needs the network:
+
+  - lat/lon -> IANA zone name, tried in this order:
+      1. a country with a single zone (per the tz database's zone.tab)
+         answers directly when the country is known (the gazetteer hit, or
+         Nominatim's address);
+      2. the real zone boundaries (timezone-boundary-builder polygons, via the
+         optional `timezonefinder` package): a shortcut-grid lookup plus a
+         point-in-polygon test. Ocean zones (Etc/GMT...) are not accepted;
+      3. a grid index of gazetteer places, each with its own GeoNames zone
+         column: the zone of the nearest place within TZ_MAX_DISTANCE_KM, in
+         the same country when that is known. zone.tab reference points only
+         enter the grid for single-zone countries - for the others the nearest
+         reference point is often in another zone (Dallas is nearer to
+         America/Indiana/Vincennes' point than to Chicago's).
+    A point none of these can place raises TimezoneResolveError rather than
+    getting a guessed zone.
+  - zone + local birth date/time -> historical UTC offset, from the zoneinfo
+    transition tables (so Kolkata in 1943 is +6:30, not +5:30). ZoneInfo
+    instances are cached, and each lookup is a bisect over the transitions.
+
+Without `timezonefinder`, multi-zone countries (US, Russia, Brazil...) only
+resolve near gazetteer places, so build the gazetteer from GeoNames
+cities15000.txt rather than the bundled India sample.
+"""
+import math
+import re
+import threading
+import zoneinfo
+from datetime import datetime
+from importlib import resources
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src import config
+from src.location.gazetteer import get_gazetteer
+
+try:
+    from timezonefinder import TimezoneFinder
+except ImportError:  # optional: without it, multi-zone countries resolve from gazetteer places only
+    TimezoneFinder = None
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class TimezoneResolveError(Exception):
+    pass
+
+
+# (latitude, longitude, population, zone, country code) of a gazetteer or zone.tab row
+_Place = Tuple[float, float, int, str, str]
+# (latitude, longitude, zone, country code) of the most populous place per zone in a cell
+_Rep = Tuple[float, float, str, str]
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance (haversine)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class TimezoneGrid:
+    """
+    Places (gazetteer rows, each with its own zone) bucketed by lat/lon cell,
+    plus the set of zones per country. `references` (zone.tab rows) only add
+    to the per-country zone sets, and to the cells for single-zone countries.
+    """
+
+    def __init__(
+        self,
+        places: Iterable[_Place],
+        cell_deg: float,
+        max_km: float,
+        references: Iterable[_Place] = (),
+    ):
+        self.cell_deg = cell_deg
+        self.max_km = max_km
+
+        places = [p for p in places if p[3]]
+        references = [p for p in references if p[3]]
+        zones: Dict[str, Set[str]] = {}
+        for _, _, _, zone, country in places + references:
+            if country:
+                zones.setdefault(country, set()).add(zone)
+        self._country_zone: Dict[str, str] = {
+            country: next(iter(z)) for country, z in zones.items() if len(z) == 1
+        }
+
+        best: Dict[Tuple[int, int, str, str], Tuple[int, float, float]] = {}
+        for lat, lon, population, zone, country in places + [
+            p for p in references if p[4] in self._country_zone
+        ]:
+            k = (*self._cell(lat, lon), zone, country)
+            if k not in best or population > best[k][0]:
+                best[k] = (population, lat, lon)
+
+        self._cells: Dict[Tuple[int, int], List[_Rep]] = {}
+        for (row, col, zone, country), (_, lat, lon) in best.items():
+            self._cells.setdefault((row, col), []).append((lat, lon, zone, country))
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _ring(self, row: int, col: int, r: int) -> Iterator[_Rep]:
+        for dr in range(-r, r + 1):
+            for dc in range(-r, r + 1):
+                if max(abs(dr), abs(dc)) == r:
+                    yield from self._cells.get((row + dr, col + dc), ())
+
+    def single_zone(self, country_code: Optional[str]) -> Optional[str]:
+        """The zone of a country that has only one, else None."""
+        return self._country_zone.get((country_code or "").upper())
+
+    def nearby_zone(self, lat: float, lon: float, country_code: Optional[str] = None) -> Optional[str]:
+        """
+        Zone of the nearest place within max_km (in the given country, if
+        any), or None.
+        """
+        country = (country_code or "").upper()
+        row, col = self._cell(lat, lon)
+        # a cell is narrowest east-west, so that sets how many rings max_km spans
+        coslat = max(math.cos(math.radians(lat)), 0.1)
+        max_rings = math.ceil(self.max_km / (KM_PER_DEGREE * self.cell_deg * coslat))
+        nearest: Optional[Tuple[float, str]] = None
+        found_at = None
+        for r in range(max_rings + 1):
+            # a nearer place can sit one ring further out than the first hit
+            if found_at is not None and r > found_at + 1:
+                break
+            for rep_lat, rep_lon, zone, rep_country in self._ring(row, col, r):
+                if country and rep_country != country:
+                    continue
+                d = distance_km(lat, lon, rep_lat, rep_lon)
+                if nearest is None or d < nearest[0]:
+                    nearest = (d, zone)
+                    if found_at is None:
+                        found_at = r
+        if nearest is None or nearest[0] > self.max_km:
+            return None
+        return nearest[1]
+
+    def zone_at(self, lat: float, lon: float, country_code: Optional[str] = None) -> Optional[str]:
+        """Zone for a point from the grid alone, or None if it cannot be placed."""
+        return self.single_zone(country_code) or self.nearby_zone(lat, lon, country_code)
+
+
+_COORDS = re.compile(r"([+-])(\d{2})(\d{2})(\d{2})?([+-])(\d{3})(\d{2})(\d{2})?$")
+
+
+def _parse_coords(text: str) -> Optional[Tuple[float, float]]:
+    """zone.tab ISO 6709 coordinates (+DDMM+DDDMM or +DDMMSS+DDDMMSS)."""
+    m = _COORDS.match(text)
+    if m is None:
+        return None
+    lat_sign, lat_d, lat_m, lat_s, lon_sign, lon_d, lon_m, lon_s = m.groups()
+    lat = int(lat_d) + int(lat_m) / 60 + int(lat_s or 0) / 3600
+    lon = int(lon_d) + int(lon_m) / 60 + int(lon_s or 0) / 3600
+    return (-lat if lat_sign == "-" else lat), (-lon if lon_sign == "-" else lon)
+
+
+def _zone_tab_path() -> Optional[Path]:
+    """zone.tab from config, the system zoneinfo directories, or the tzdata package."""
+    if config.TZ_ZONE_TAB_PATH:
+        return Path(config.TZ_ZONE_TAB_PATH)
+    for directory in zoneinfo.TZPATH:
+        path = Path(directory) / "zone.tab"
+        if path.exists():
+            return path
+    try:
+        path = Path(str(resources.files("tzdata").joinpath("zoneinfo", "zone.tab")))
+    except ModuleNotFoundError:
+        return None
+    return path if path.exists() else None
+
+
+def read_zone_tab(path: Path) -> Iterator[_Place]:
+    """(lat, lon, population 0, zone, country code) per zone.tab line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 3:
+                continue
+            coords = _parse_coords(cols[1])
+            if coords is not None:
+                yield coords[0], coords[1], 0, cols[2], cols[0]
+
+
+def _gazetteer_places() -> Iterator[_Place]:
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        for p in map(gazetteer.record, range(len(gazetteer))):
+            yield p["latitude"], p["longitude"], p["population"], p["timezone_name"], p["country_code"]
+
+
+def _zone_tab_places() -> Iterator[_Place]:
+    path = _zone_tab_path()
+    if path is not None:
+        yield from read_zone_tab(path)
+
+
+_grid: Optional[TimezoneGrid] = None
+_grid_lock = threading.Lock()
+
+
+def get_timezone_grid() -> Optional[TimezoneGrid]:
+    """Grid built from the gazetteer and zone.tab on first use. None if neither is available."""
+    global _grid
+    if _grid is None:
+        with _grid_lock:
+            if _grid is None:
+                grid = TimezoneGrid(
+                    _gazetteer_places(),
+                    config.TZ_GRID_DEGREES,
+                    config.TZ_MAX_DISTANCE_KM,
+                    references=_zone_tab_places(),
+                )
+                if not len(grid):
+                    return None
+                _grid = grid
+    return _grid
+
+
+_finder = None
+_finder_lock = threading.Lock()
+
+
+def get_boundary_finder():
+    """
+    TimezoneFinder over the zone boundary polygons (memory-mapped, so shared
+    between workers), or None if the package is missing or disabled.
+    """
+    global _finder
+    if _finder is None and TimezoneFinder is not None and config.TZ_BOUNDARIES_ENABLED:
+        with _finder_lock:
+            if _finder is None:
+                _finder = TimezoneFinder()
+    return _finder
+
+
+def boundary_zone(lat: float, lon: float) -> Optional[str]:
+    """Zone whose boundary polygon contains the point; None at sea or without boundary data."""
+    finder = get_boundary_finder()
+    if finder is None:
+        return None
+    with _finder_lock:  # TimezoneFinder is not documented as thread-safe; lookups take microseconds
+        zone = finder.timezone_at(lat=lat, lng=lon)
+    if zone is None or zone.startswith("Etc/"):
+        return None
+    return zone
+
+
+def timezone_at(lat: float, lon: float, country_code: Optional[str] = None) -> str:
+    """IANA zone name for a point. Raises TimezoneResolveError if it cannot be placed."""
+    grid = get_timezone_grid()
+    zone = grid.single_zone(country_code) if grid is not None else None
+    if zone is None:
+        zone = boundary_zone(lat, lon)
+    if zone is None and grid is not None:
+        zone = grid.nearby_zone(lat, lon, country_code)
+    if zone is None:
+        raise TimezoneResolveError(
+            f"Could not determine the timezone at {lat:.4f}, {lon:.4f}. "
+            "Please provide a nearby city."
+        )
+    return zone
+
+
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)  # ZoneInfo caches instances per key
+    except (ZoneInfoNotFoundError, ValueError):
+        raise TimezoneResolveError(f"Unknown timezone {name!r}.")
+
+
+def utc_offset_hours(zone_name: str, date: str, time: str) -> float:
+    """
+    UTC offset in hours of local wall time `date` (YYYY-MM-DD) `time`
+    (HH:MM[:SS]) in the zone. Ambiguous times (clocks set back) take the
+    earlier offset; skipped times the offset from before the change.
+    """
+    try:
+        local = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        try:
+            local = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            raise TimezoneResolveError(f"Invalid birth date/time: {date} {time}.")
+    offset = local.replace(tzinfo=_zone(zone_name)).utcoffset()
+    return offset.total_seconds() / 3600
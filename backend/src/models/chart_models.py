@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class ChartCalculateResponse(BaseModel):
+    chart_id: str
+    meta: Dict[str, Any]  # name, birth_date, birth_time, birth_place
+
+
+class ChartResponse(BaseModel):
+    chart_id: str
+    chart: Dict[str, Any]
+
+
+class ChartSummary(BaseModel):
+    chart_id: str
+    input_hash: str
+    created_at: float
+    name: str
+    birth_date: str
+    birth_time: str
+    birth_place: str
+
+
+class ChartListResponse(BaseModel):
+    charts: List[ChartSummary]
+    # pass as ?before=&before_id= for the next page; null on the last one
+    next_before: Optional[float]
+    next_before_id: Optional[str]
+
+
+class CombinedReportRequest(BaseModel):
+    chart_id: str = Field(..., example="testuser1_19991113_162000_visakhapatnam")
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+
+class JobStage(BaseModel):
+    name: str  # geocode | calculate | render
+    status: str  # pending | running | done | failed
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str  # chart | report | reading
+    status: str  # queued | running | done | failed
+    stage: Optional[str]  # the stage last started
+    stages: List[JobStage]
+    attempts: int
+    created_at: float
+    updated_at: float
+    result: Optional[Dict[str, Any]]  # the synchronous endpoint's response body, once done
+    error: Optional[str]
+    error_status: Optional[int]  # the status the synchronous endpoint would have returned
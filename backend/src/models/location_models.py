@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class PlaceSuggestion(BaseModel):
+    place_id: int = Field(..., example=1)
+    name: str = Field(..., example="Visakhapatnam")
+    admin1: str = Field(..., example="Andhra Pradesh")
+    country_code: str = Field(..., example="IN")
+    label: str = Field(..., example="Visakhapatnam, Andhra Pradesh, IN")
+    latitude: float
+    longitude: float
+    timezone_name: str = Field(..., example="Asia/Kolkata")
+    population: int
+    score: float
+
+
+class PlaceSuggestResponse(BaseModel):
+    query: str
+    suggestions: List[PlaceSuggestion]
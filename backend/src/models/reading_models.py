@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class ReadingRequest(BaseModel):
@@ -7,9 +7,43 @@ class ReadingRequest(BaseModel):
     date: str = Field(..., example="1999-11-13")        # YYYY-MM-DD
     time: str = Field(..., example="16:20:00")          # HH:MM:SS (24h)
     place: str = Field(..., example="Visakhapatnam, India")
+    place_id: Optional[int] = Field(default=None, example=1)  # from /location/suggest
     ayanamsa: Optional[str] = Field(default="raman", example="raman")
 
 
 class ReadingResponse(BaseModel):
     chart_id: str
     report_markdown: str
+
+
+class AyanamsaComparisonRequest(BaseModel):
+    name: str = Field(..., example="TestUser1")
+    date: str = Field(..., example="1999-11-13")        # YYYY-MM-DD
+    time: str = Field(..., example="16:20:00")          # HH:MM:SS (24h)
+    place: str = Field(..., example="Visakhapatnam, India")
+    place_id: Optional[int] = Field(default=None, example=1)  # from /location/suggest
+
+
+class AyanamsaComparisonResponse(BaseModel):
+    chart_id: str
+    comparison: Dict[str, Any]
+
+
+class DashaRequest(BaseModel):
+    name: str = Field(..., example="TestUser1")
+    date: str = Field(..., example="1999-11-13")        # YYYY-MM-DD
+    time: str = Field(..., example="16:20:00")          # HH:MM:SS (24h)
+    place: str = Field(..., example="Visakhapatnam, India")
+    place_id: Optional[int] = Field(default=None, example=1)  # from /location/suggest
+    ayanamsa: Optional[str] = Field(default="raman", example="raman")
+    system: str = Field(default="vimshottari", example="yogini")  # vimshottari | yogini
+    path: Optional[str] = Field(default=None, example="3.2")      # period to open; top level if empty
+    on: Optional[str] = Field(default=None, example="2026-06-01")  # running periods on this date; today if empty
+
+
+class DashaResponse(BaseModel):
+    chart_id: str
+    system: str
+    period: Optional[Dict[str, Any]]
+    children: List[Dict[str, Any]]
+    current_path: List[Dict[str, Any]]
@@ -0,0 +1,225 @@
+"""
+Content-addressed chart cache.
+
+Charts are keyed on a hash of the astronomical inputs only (date, time,
+lat/lon, timezone offset, ayanamsa, transit year), so the same birth data requested under
+another name or place label is served without another ephemeris run.
+
+Two tiers:
+  - in-memory LRU (per API worker)
+  - files under backend/data/charts/by_input/ (shared)
+
+Both hold the compact chart (compact_chart.py: longitudes and indices, ~4 KB
+in memory instead of ~100 KB), on disk in its binary format (<key>.chart,
+~1.5 KB), and expand it to the full chart on a hit. The dashas are worked
+out at expansion, so they always run as of today. If the engine cannot be
+imported here (subprocess mode without swisseph in the API process) the full
+dict is stored instead, on disk as <key>.json.
+
+Per-request fields (name, birth_place, generated_at) are stripped before
+storing and overlaid again on every hit.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src import config
+from src.services import engine
+from src.services.persistence import backend_root, write_behind, write_bytes_atomic
+
+# Bump when the calculator output changes so stale disk entries are ignored.
+CACHE_VERSION = "8"
+
+# meta fields that differ between requests for the same astronomical inputs
+VOLATILE_META_FIELDS = ("name", "birth_place", "generated_at")
+
+
+def _normalize_time(time: str) -> str:
+    parts = [int(x) for x in time.strip().split(":")]
+    parts += [0] * (3 - len(parts))
+    return "{:02d}:{:02d}:{:02d}".format(*parts[:3])
+
+
+def _normalize_date(date: str) -> str:
+    year, month, day = (int(x) for x in date.strip().split("-"))
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def chart_key(
+    date: str, time: str, lat: float, lon: float, tz: float, ayanamsa: str, transit_year: int
+) -> str:
+    """sha256 over the normalized inputs that determine the chart."""
+    payload = {
+        "v": CACHE_VERSION,
+        "date": _normalize_date(date),
+        "time": _normalize_time(time),
+        # 1e-6 degrees is ~10 cm; geocoder jitter below that is irrelevant
+        "lat": round(float(lat), 6),
+        "lon": round(float(lon), 6),
+        "tz": round(float(tz), 4),
+        "ayanamsa": (ayanamsa or "raman").strip().lower(),
+        "transit_year": int(transit_year),
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _strip_volatile(chart: Dict[str, Any]) -> Dict[str, Any]:
+    stored = dict(chart)
+    stored["meta"] = {
+        k: v for k, v in chart.get("meta", {}).items() if k not in VOLATILE_META_FIELDS
+    }
+    return stored
+
+
+# dasha sections whose running period is re-read for today on every hit
+DASHA_SECTIONS = ("vimshottari_dasha", "yogini_dasha")
+
+
+def _current_dasha(periods: list, today: str) -> Optional[str]:
+    for p in periods:
+        if p["start"] <= today <= p["end"]:
+            return p.get("lord", p.get("planet"))
+    return None
+
+
+def _current_path(path: list, today: str) -> list:
+    """The stored running periods that still run today; deeper ones come from /reading/dasha."""
+    running = []
+    for p in path:
+        if not p["start"] <= today <= p["end"]:
+            break
+        running.append(p)
+    return running
+
+
+def _overlay(stored: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fresh top-level dict with per-request meta and current dasha periods valid
+    for today. Nested sections are shared with the cache and must not be mutated.
+    """
+    chart = dict(stored)
+    chart["meta"] = {
+        **stored.get("meta", {}),
+        **meta,
+        "generated_at": datetime.now().isoformat(),
+    }
+    today = datetime.now().strftime("%Y-%m-%d")
+    for section in DASHA_SECTIONS:
+        dasha = stored.get(section)
+        if isinstance(dasha, dict) and "periods" in dasha:
+            chart[section] = {
+                **dasha,
+                "current_dasha": _current_dasha(dasha["periods"], today),
+                "current_path": _current_path(dasha.get("current_path", []), today),
+            }
+    return chart
+
+
+def _compact(stored: Dict[str, Any]) -> Any:
+    try:
+        return engine.compact_chart(stored)
+    except engine.EngineError:
+        return stored
+
+
+def _expand(stored: Any) -> Dict[str, Any]:
+    return stored if isinstance(stored, dict) else stored.to_chart()
+
+
+class ChartCache:
+    def __init__(self, max_entries: int, disk_dir: Optional[Path]):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._lock = threading.Lock()
+        # key -> CompactChart (or the chart dict, without the engine)
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached chart with `meta` overlaid, or None on a miss."""
+        with self._lock:
+            stored = self._lru.get(key)
+            if stored is not None:
+                self._lru.move_to_end(key)
+
+        if stored is None:
+            stored = self._read_disk(key)
+            if stored is None:
+                return None
+            self._remember(key, stored)
+
+        return _overlay(_expand(stored), meta)
+
+    def put(self, key: str, chart: Dict[str, Any]) -> None:
+        stored = _compact(_strip_volatile(chart))
+        self._remember(key, stored)
+        self._write_disk(key, stored)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def _remember(self, key: str, stored: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._lru[key] = stored
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _disk_path(self, key: str, suffix: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"{key}{suffix}"
+
+    def _read_disk(self, key: str) -> Any:
+        for suffix in (".chart", ".json"):
+            path = self._disk_path(key, suffix)
+            if path is None:
+                return None
+            try:
+                data = path.read_bytes()
+            except OSError:
+                continue
+            try:
+                # the modification time is the file's last use, for storage_manager.py's LRU
+                os.utime(path)
+            except OSError:
+                pass
+            try:
+                return engine.read_chart(data) if suffix == ".chart" else json.loads(data)
+            except (ValueError, engine.EngineError):
+                return None
+        return None
+
+    def _write_disk(self, key: str, stored: Any) -> None:
+        path = self._disk_path(key, ".json" if isinstance(stored, dict) else ".chart")
+        if path is None:
+            return
+        # best-effort and off the request path; the chart is already in memory
+        write_behind(_write_chart, path, stored)
+
+
+def _write_chart(path: Path, stored: Any) -> None:
+    if isinstance(stored, dict):
+        write_bytes_atomic(path, json.dumps(stored, ensure_ascii=False).encode("utf-8"))
+    else:
+        write_bytes_atomic(path, stored.to_bytes())
+
+
+def _default_disk_dir() -> Optional[Path]:
+    if not config.CHART_CACHE_DISK:
+        return None
+    return backend_root() / "data" / "charts" / "by_input"
+
+
+chart_cache = ChartCache(
+    max_entries=config.CHART_CACHE_SIZE,
+    disk_dir=_default_disk_dir(),
+)
@@ -0,0 +1,339 @@
+"""
+Indexed chart and report store.
+
+One SQLite database (WAL mode, so several uvicorn workers read while one
+writes) instead of flat <chart_id>_chart.json / <chart_id>_report.md files:
+
+  charts   chart_id, input hash (chart_cache.chart_key), created time, the
+           birth details for listing, and the chart as a zlib-compressed
+           blob in the binary chart format (compact_chart.py), or JSON if
+           the engine cannot be imported here
+  reports  chart_id, created and last-read time, the zlib-compressed
+           report Markdown
+
+chart_id is the primary key; the input hash and (created time, chart_id)
+are indexed, so a chart is found by id, by its birth data, or listed newest
+first without a directory scan. Reports can always be rendered again from their
+chart, so storage_manager.py evicts them least recently read first; charts
+are kept.
+
+    python -m src.services.chart_store import backend/data   # old flat files
+    python -m src.services.chart_store list
+"""
+import argparse
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src import config
+from src.services import engine
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS charts (
+    chart_id TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    birth_time TEXT NOT NULL,
+    birth_place TEXT NOT NULL,
+    format TEXT NOT NULL,
+    chart BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS charts_input_hash ON charts (input_hash);
+CREATE TABLE IF NOT EXISTS reports (
+    chart_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    report BLOB NOT NULL,
+    accessed_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at);
+"""
+
+# stores created before reports tracked reads
+_MIGRATIONS = (
+    ("reports", "accessed_at", "ALTER TABLE reports ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0",
+     "UPDATE reports SET accessed_at = created_at"),
+)
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS reports_accessed_at ON reports (accessed_at);
+CREATE INDEX IF NOT EXISTS charts_created_id ON charts (created_at, chart_id);
+DROP INDEX IF EXISTS charts_created_at;
+"""
+
+# a read moves a report's accessed_at only if it is older than this (seconds),
+# so repeated reads do not each cost a write
+ACCESS_RESOLUTION = 60.0
+
+# columns returned by find/list (everything but the blob)
+_SUMMARY = "chart_id, input_hash, created_at, name, birth_date, birth_time, birth_place"
+
+
+class ChartStoreError(Exception):
+    pass
+
+
+def _encode_chart(chart: Dict[str, Any]) -> tuple:
+    try:
+        return "binary", zlib.compress(engine.compact_chart(chart).to_bytes())
+    except engine.EngineError:
+        return "json", zlib.compress(json.dumps(chart, ensure_ascii=False).encode("utf-8"))
+
+
+def _decode_chart(fmt: str, blob: bytes) -> Dict[str, Any]:
+    data = zlib.decompress(blob)
+    if fmt == "binary":
+        return engine.read_chart(data).to_chart()
+    return json.loads(data)
+
+
+def _summary(row: tuple) -> Dict[str, Any]:
+    return dict(zip(_SUMMARY.split(", "), row))
+
+
+class ChartStore:
+    """SQLite-backed store. One connection per thread."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            # only takes effect on a new database; lets compact() return free pages to the OS
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            with conn:
+                for table, column, *statements in _MIGRATIONS:
+                    if column not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+                        for sql in statements:
+                            conn.execute(sql)
+            conn.executescript(_INDEXES)
+            self._local.conn = conn
+        return conn
+
+    def put_chart(
+        self, chart_id: str, input_hash: str, chart: Dict[str, Any], report_markdown: Optional[str] = None
+    ) -> None:
+        """Insert or replace a chart (and its report, if given) in one transaction."""
+        meta = chart.get("meta", {})
+        fmt, blob = _encode_chart(chart)
+        now = time.time()
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO charts "
+                    "(chart_id, input_hash, created_at, name, birth_date, birth_time, birth_place, format, chart) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        chart_id, input_hash, now, meta.get("name", ""), meta.get("birth_date", ""),
+                        meta.get("birth_time", ""), meta.get("birth_place", ""), fmt, blob,
+                    ),
+                )
+                if report_markdown is not None:
+                    self._put_report(conn, chart_id, report_markdown, now)
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not store chart {chart_id}: {e}")
+
+    def put_report(self, chart_id: str, report_markdown: str) -> None:
+        try:
+            conn = self._conn()
+            with conn:
+                self._put_report(conn, chart_id, report_markdown, time.time())
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not store report {chart_id}: {e}")
+
+    @staticmethod
+    def _put_report(conn: sqlite3.Connection, chart_id: str, report_markdown: str, now: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO reports (chart_id, created_at, report, accessed_at) VALUES (?, ?, ?, ?)",
+            (chart_id, now, zlib.compress(report_markdown.encode("utf-8")), now),
+        )
+
+    def get_chart(self, chart_id: str) -> Optional[Dict[str, Any]]:
+        """The full chart JSON, or None. Dashas in a binary chart run as of now."""
+        try:
+            row = self._conn().execute(
+                "SELECT format, chart FROM charts WHERE chart_id = ?", (chart_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not read chart {chart_id}: {e}")
+        if row is None:
+            return None
+        try:
+            return _decode_chart(*row)
+        except (zlib.error, ValueError, engine.EngineError) as e:
+            raise ChartStoreError(f"Stored chart {chart_id} is unreadable: {e}")
+
+    def get_report(self, chart_id: str, since: float = 0.0) -> Optional[str]:
+        """The stored report if it was rendered at or after `since` (a timestamp), else None."""
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT report, accessed_at FROM reports WHERE chart_id = ? AND created_at >= ?",
+                (chart_id, since),
+            ).fetchone()
+            if row is not None and row[1] < now - ACCESS_RESOLUTION:
+                with conn:
+                    conn.execute("UPDATE reports SET accessed_at = ? WHERE chart_id = ?", (now, chart_id))
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not read report {chart_id}: {e}")
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def find_by_input(self, input_hash: str) -> List[Dict[str, Any]]:
+        """Charts calculated from the same birth data, newest first."""
+        return self._summaries(
+            f"SELECT {_SUMMARY} FROM charts WHERE input_hash = ? ORDER BY created_at DESC", (input_hash,)
+        )
+
+    def list_charts(
+        self, limit: int = 50, before: Optional[float] = None, before_id: str = ""
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest charts first. For the next page pass the last chart's created_at
+        and chart_id as `before` / `before_id`: charts created in the same
+        instant are ordered by chart_id, so none is skipped at a page boundary.
+        """
+        return self._summaries(
+            f"SELECT {_SUMMARY} FROM charts WHERE (created_at, chart_id) < (?, ?) "
+            "ORDER BY created_at DESC, chart_id DESC LIMIT ?",
+            (before if before is not None else float("inf"), before_id, limit),
+        )
+
+    def _summaries(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        try:
+            rows = self._conn().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not list charts: {e}")
+        return [_summary(row) for row in rows]
+
+    # -------------------------------------------------------------------------
+    # used by storage_manager.py
+    # -------------------------------------------------------------------------
+
+    def usage(self) -> Dict[str, int]:
+        """Entries and stored (compressed) bytes per table."""
+        try:
+            conn = self._conn()
+            charts, chart_bytes = conn.execute("SELECT count(*), total(length(chart)) FROM charts").fetchone()
+            reports, report_bytes = conn.execute("SELECT count(*), total(length(report)) FROM reports").fetchone()
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not read store usage: {e}")
+        return {
+            "charts": charts,
+            "chart_bytes": int(chart_bytes),
+            "reports": reports,
+            "report_bytes": int(report_bytes),
+        }
+
+    def least_recent_reports(self) -> List[tuple]:
+        """(accessed_at, chart_id, bytes) for every report, least recently read first."""
+        try:
+            return self._conn().execute(
+                "SELECT accessed_at, chart_id, length(report) FROM reports ORDER BY accessed_at"
+            ).fetchall()
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not list reports: {e}")
+
+    def evict_reports(self, reports: List[tuple]) -> int:
+        """Delete (accessed_at, chart_id) reports unless read since. Returns the number deleted."""
+        deleted = 0
+        try:
+            conn = self._conn()
+            with conn:
+                for accessed_at, chart_id in reports:
+                    deleted += conn.execute(
+                        "DELETE FROM reports WHERE chart_id = ? AND accessed_at <= ?", (chart_id, accessed_at)
+                    ).rowcount
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not evict reports: {e}")
+        return deleted
+
+    def compact(self) -> int:
+        """Checkpoint the WAL and hand free pages back to the OS. Returns the bytes released."""
+        before = self._file_bytes()
+        try:
+            conn = self._conn()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # incremental
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+            elif freelist > page_count // 4:
+                # a store from before auto_vacuum: rebuild it once it is a quarter free pages
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            raise ChartStoreError(f"Could not compact the store: {e}")
+        return max(before - self._file_bytes(), 0)
+
+    def _file_bytes(self) -> int:
+        total = 0
+        for suffix in ("", "-wal"):
+            try:
+                total += Path(f"{self.path}{suffix}").stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def import_flat_files(self, data_dir: Path) -> int:
+        """Load charts/<id>_chart.json and reports/<id>_report.md from the old layout."""
+        from src.services.chart_cache import chart_key  # imports persistence, which imports this
+
+        count = 0
+        for path in sorted((data_dir / "charts").glob("*_chart.json")):
+            chart_id = path.name[: -len("_chart.json")]
+            chart = json.loads(path.read_text(encoding="utf-8"))
+            meta = chart["meta"]
+            try:
+                ayanamsa = engine.compact_chart(chart).ayanamsa
+            except engine.EngineError:
+                ayanamsa = "raman"  # a chart from an older calculator; stored as JSON
+            input_hash = chart_key(
+                meta["birth_date"], meta["birth_time"], meta["latitude"], meta["longitude"],
+                meta["timezone_offset"], ayanamsa, meta.get("transit_year", config.TRANSIT_YEAR),
+            )
+            report = data_dir / "reports" / f"{chart_id}_report.md"
+            self.put_chart(
+                chart_id, input_hash, chart,
+                report.read_text(encoding="utf-8") if report.exists() else None,
+            )
+            count += 1
+        return count
+
+
+chart_store = ChartStore(Path(config.CHART_STORE_PATH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AstroAI chart/report store")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    i = sub.add_parser("import", help="Import <id>_chart.json / <id>_report.md files")
+    i.add_argument("data_dir", help="Directory holding charts/ and reports/ (e.g. backend/data)")
+
+    ls = sub.add_parser("list", help="Newest charts")
+    ls.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args()
+    if args.command == "import":
+        print(f"Imported {chart_store.import_flat_files(Path(args.data_dir))} charts into {chart_store.path}")
+    else:
+        for chart in chart_store.list_charts(args.limit):
+            print(f"{chart['chart_id']}\t{chart['birth_date']} {chart['birth_time']}\t{chart['birth_place']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,8 @@
-from pathlib import Path
-import json
-
-def build_core_me_paragraph(chart_json_path: Path) -> str:
+def build_core_me_paragraph(chart: dict) -> str:
     """
-    chart_json_path is the saved chart json produced by run_calculator.
-    This function reads it and builds a short 'core characteristics' paragraph.
+    chart is the chart dict produced by the calculator (already in memory).
+    This function builds a short 'core characteristics' paragraph from it.
     """
-    chart = json.loads(chart_json_path.read_text(encoding="utf-8"))
 
     # Defensive reads (depends on your JSON structure)
     western = chart.get("western", {}) if isinstance(chart.get("western"), dict) else {}
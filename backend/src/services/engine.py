@@ -0,0 +1,159 @@
+"""
+In-process astrology engine.
+
+Imports multi_system_calculator.py and generate_combined_report.py as modules
+(once per worker) and calls them directly on dicts, instead of starting a new
+interpreter and re-importing swisseph for every reading.
+"""
+import importlib
+import sys
+import threading
+from datetime import datetime
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
+
+from src import config
+from src.services.script_runner import get_scripts_dir
+
+
+class EngineError(Exception):
+    pass
+
+
+_load_lock = threading.Lock()
+_modules: Optional[Tuple[ModuleType, ModuleType]] = None
+
+
+def load_engine() -> Tuple[ModuleType, ModuleType]:
+    """
+    Returns (calculator_module, report_module), importing them on first use.
+    Raises EngineError if the scripts (or swisseph) cannot be imported.
+    """
+    global _modules
+    if _modules is not None:
+        return _modules
+
+    with _load_lock:
+        if _modules is None:
+            scripts_dir = str(get_scripts_dir())
+            if scripts_dir not in sys.path:
+                sys.path.insert(0, scripts_dir)
+            try:
+                calculator = importlib.import_module("multi_system_calculator")
+                report = importlib.import_module("generate_combined_report")
+                eclipses = importlib.import_module("eclipses")
+            except ImportError as e:
+                raise EngineError(f"Astrology engine unavailable: {e}")
+            eclipses.set_cache_dir(config.ECLIPSE_CACHE_DIR)
+            if config.EPHE_PATH:
+                # applied per thread by the calculator, so thread pools see it too
+                calculator.set_ephemeris_path(config.EPHE_PATH)
+            _modules = (calculator, report)
+    return _modules
+
+
+def calculate_chart(
+    name: str,
+    date: str,
+    time: str,
+    lat: float,
+    lon: float,
+    tz: float,
+    place: str,
+    ayanamsa: str,
+    transit_year: int = config.TRANSIT_YEAR,
+) -> Dict[str, Any]:
+    """Same output as `multi_system_calculator.py --output chart.json`, as a dict."""
+    calculator, _ = load_engine()
+    try:
+        return calculator.generate_full_report(
+            name=name,
+            date_str=date,
+            time_str=time,
+            latitude=lat,
+            longitude=lon,
+            tz_offset=tz,
+            place=place,
+            ayanamsa=ayanamsa,
+            transit_year=transit_year,
+        )
+    except Exception as e:
+        raise EngineError(f"Chart calculation failed: {e}")
+
+
+def compare_ayanamsas(
+    name: str,
+    date: str,
+    time: str,
+    lat: float,
+    lon: float,
+    tz: float,
+    place: str,
+) -> Dict[str, Any]:
+    """Same output as `multi_system_calculator.py --ayanamsa all`, as a dict."""
+    calculator, _ = load_engine()
+    try:
+        return calculator.compare_ayanamsas(
+            name=name,
+            date_str=date,
+            time_str=time,
+            latitude=lat,
+            longitude=lon,
+            tz_offset=tz,
+            place=place,
+        )
+    except Exception as e:
+        raise EngineError(f"Ayanamsa comparison failed: {e}")
+
+
+def render_report(chart: Dict[str, Any]) -> str:
+    """Same output as `generate_combined_report.py chart.json`, as a string."""
+    _, report = load_engine()
+    try:
+        return report.generate_full_report(chart)
+    except Exception as e:
+        raise EngineError(f"Report generation failed: {e}")
+
+
+def compact_chart(chart: Dict[str, Any]) -> Any:
+    """The chart's CompactChart (compact_chart.py): its numbers, about a twentieth of the dict."""
+    load_engine()
+    try:
+        return importlib.import_module("compact_chart").CompactChart.from_chart(chart)
+    except Exception as e:
+        raise EngineError(f"Chart compaction failed: {e}")
+
+
+def read_chart(data: bytes) -> Any:
+    """CompactChart from a chart in any compact_chart.FORMATS (binary, compact or full JSON)."""
+    load_engine()
+    try:
+        return importlib.import_module("compact_chart").read_chart(data)
+    except Exception as e:
+        raise EngineError(f"Invalid chart data: {e}")
+
+
+def expand_dasha(
+    chart: Dict[str, Any],
+    system: str,
+    path: str = "",
+    on: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One drill-down step of the chart's dasha tree (dasha.py): the period at
+    `path` and its sub-periods, plus the periods running on `on` (YYYY-MM-DD,
+    default today). Plain arithmetic on the chart, so it runs in this process
+    whatever the engine mode. Raises ValueError for an unknown system or path.
+    """
+    load_engine()
+    dasha = importlib.import_module("dasha")
+    try:
+        tree = dasha.tree_from_chart(chart, system)
+        result = dasha.expand(tree, dasha.parse_path(path))
+        on_jd = tree.jd(on or datetime.now().strftime("%Y-%m-%d"))
+        result["current_path"] = [p.to_dict() for p in tree.at(on_jd, len(dasha.LEVELS))]
+    except ValueError:
+        raise
+    except Exception as e:
+        raise EngineError(f"Dasha expansion failed: {e}")
+    return result
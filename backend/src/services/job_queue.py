@@ -0,0 +1,386 @@
+"""
+Background jobs for chart and report generation.
+
+POST /jobs/... records a job and returns its id at once. Job workers
+(JOB_WORKERS asyncio tasks in every API process) take queued jobs from a
+SQLite table shared by all uvicorn workers and run them through
+reading_service stage by stage (geocode -> calculate -> render), recording
+each stage as it starts. Clients poll GET /jobs/{id} or follow
+GET /jobs/{id}/events (Server-Sent Events).
+
+Jobs survive restarts: a worker claims a job with a lease (renewed at every
+stage) and a fresh owner token. If its process dies, the lease runs out and
+the job is queued again, up to JOB_MAX_ATTEMPTS runs. A graceful shutdown
+hands its running jobs back at once. Finished jobs are deleted after
+JOB_RETENTION seconds.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src import config
+from src.services import reading_service
+from src.services.worker_pool import PoolBusyError
+
+logger = logging.getLogger(__name__)
+
+# job kind -> its stages, in order
+JOB_STAGES = {
+    "chart": ("geocode", "calculate"),
+    "report": ("render",),
+    "reading": ("geocode", "calculate", "render"),
+}
+FINISHED = ("done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    stages TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    error_status INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_until REAL,
+    run_after REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+"""
+
+_COLUMNS = (
+    "job_id, kind, status, stage, stages, result, error, error_status, attempts, created_at, updated_at"
+)
+
+
+def _job(row: tuple) -> Dict[str, Any]:
+    job = dict(zip(_COLUMNS.split(", "), row))
+    job["stages"] = json.loads(job["stages"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    return job
+
+
+class JobStore:
+    """The jobs table. One connection per thread; WAL, like the chart store."""
+
+    def __init__(self, path: Path, lease: float, max_attempts: int):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if kind not in JOB_STAGES:
+            raise ValueError(f"Unknown job kind: {kind}")
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        stages = [{"name": name, "status": "pending", "started_at": None, "finished_at": None}
+                  for name in JOB_STAGES[kind]]
+        self._conn().execute(
+            "INSERT INTO jobs (job_id, kind, params, status, stages, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, kind, json.dumps(params), json.dumps(stages), now, now),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest runnable job: status running, a new owner token, a
+        lease. Jobs whose lease ran out (their process died) are queued
+        again first, or failed once they have used every attempt.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Job was interrupted too many times.', "
+                "error_status = 500, owner = NULL, updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ?",
+                (now, now),
+            )
+            row = conn.execute(
+                "SELECT job_id, kind, params FROM jobs WHERE status = 'queued' AND run_after <= ? "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            owner = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                (owner, now + self.lease, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return {"job_id": row[0], "kind": row[1], "params": json.loads(row[2]), "owner": owner}
+
+    def _update(
+        self, job_id: str, owner: str, sql: str, params: tuple,
+        stage: Optional[str] = None, close: str = "done",
+    ) -> bool:
+        """
+        Apply an update to a job this owner still holds. The running stage is
+        closed as `close` ("pending" resets every stage) and `stage` started.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT stages FROM jobs WHERE job_id = ? AND owner = ?", (job_id, owner)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return False
+            stages = json.loads(row[0])
+            for s in stages:
+                if close == "pending":
+                    s.update(status="pending", started_at=None, finished_at=None)
+                elif s["status"] == "running":
+                    s["status"], s["finished_at"] = close, now
+                if s["name"] == stage:
+                    s["status"], s["started_at"] = "running", now
+            conn.execute(
+                f"UPDATE jobs SET {sql}, stages = ?, updated_at = ? WHERE job_id = ?",
+                (*params, json.dumps(stages), now, job_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def start_stage(self, job_id: str, owner: str, stage: str) -> bool:
+        return self._update(
+            job_id, owner, "stage = ?, lease_until = ?", (stage, time.time() + self.lease), stage
+        )
+
+    def finish(self, job_id: str, owner: str, result: Dict[str, Any]) -> bool:
+        return self._update(
+            job_id, owner, "status = 'done', result = ?, owner = NULL, lease_until = NULL",
+            (json.dumps(result, ensure_ascii=False),),
+        )
+
+    def fail(self, job_id: str, owner: str, error: str, status: int) -> bool:
+        return self._update(
+            job_id, owner, "status = 'failed', error = ?, error_status = ?, owner = NULL, lease_until = NULL",
+            (error, status), close="failed",
+        )
+
+    def release(self, job_id: str, owner: str, delay: float = 0.0) -> bool:
+        """Back to the queue without using up an attempt (shutdown, workers busy)."""
+        return self._update(
+            job_id, owner,
+            "status = 'queued', owner = NULL, lease_until = NULL, attempts = attempts - 1, run_after = ?",
+            (time.time() + delay,), close="pending",
+        )
+
+    def prune(self, retention: float) -> int:
+        """Delete finished jobs not updated for `retention` seconds."""
+        return self._conn().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?",
+            (time.time() - retention,),
+        ).rowcount
+
+
+class JobRunner:
+    """The job workers of one API process, and the progress stream clients follow."""
+
+    def __init__(self, store: JobStore, workers: int, poll_interval: float, retention: float):
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    async def _call(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
+    def _notify(self) -> None:
+        """Wake every local event stream; a new Event for the next change."""
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    # -------------------------------------------------------------------------
+    # lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the workers on the running event loop (app lifespan)."""
+        if self._tasks or self.workers <= 0:
+            return
+        self._wake = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # -------------------------------------------------------------------------
+    # submit / read
+    # -------------------------------------------------------------------------
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        job = await self._call(self.store.submit, kind, params)
+        if self._wake is not None:
+            self._wake.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.store.get, job_id)
+
+    async def events(self, job_id: str, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for a job: a "progress" event with the job on
+        connect and on every change, then "done" or "failed" and the end of
+        the stream. Changes made in this process arrive at once, others
+        within poll_interval.
+        """
+        last = None
+        quiet_since = time.monotonic()
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                yield _sse("failed", {"job_id": job_id, "error": "Job not found."})
+                return
+            state = (job["status"], job["stage"], job["updated_at"])
+            if state != last:
+                last, quiet_since = state, time.monotonic()
+                event = job["status"] if job["status"] in FINISHED else "progress"
+                yield _sse(event, job)
+                if job["status"] in FINISHED:
+                    return
+            elif time.monotonic() - quiet_since >= keepalive:
+                quiet_since = time.monotonic()
+                yield ": keep-alive\n\n"
+            changed = self._changed
+            try:
+                if changed is None:
+                    await asyncio.sleep(self.poll_interval)
+                else:
+                    await asyncio.wait_for(changed.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # -------------------------------------------------------------------------
+    # workers
+    # -------------------------------------------------------------------------
+
+    async def _work(self, n: int) -> None:
+        last_prune = 0.0
+        while True:
+            try:
+                if n == 0 and time.monotonic() - last_prune > 3600:
+                    last_prune = time.monotonic()
+                    await self._call(self.store.prune, self.retention)
+                job = await self._call(self.store.claim)
+            except sqlite3.Error as e:
+                logger.warning("job queue unavailable: %s", e)
+                job = None
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._notify()
+            await self._run(job)
+            self._notify()
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id, owner, params = job["job_id"], job["owner"], job["params"]
+
+        async def progress(stage: str) -> None:
+            await self._call(self.store.start_stage, job_id, owner, stage)
+            self._notify()
+
+        try:
+            if job["kind"] == "chart":
+                result = await reading_service.calculate_stored_chart_async(**params, progress=progress)
+            elif job["kind"] == "report":
+                result = await reading_service.combined_report_async(params["chart_id"], progress=progress)
+                if result is None:
+                    await self._call(self.store.fail, job_id, owner, f"Chart not found: {params['chart_id']}", 404)
+                    return
+            else:
+                result = await reading_service.generate_reading_async(**params, progress=progress)
+        except asyncio.CancelledError:
+            # shutting down: the next worker to start picks it up again
+            self.store.release(job_id, owner)
+            raise
+        except PoolBusyError as e:
+            await self._call(self.store.release, job_id, owner, float(e.retry_after))
+        except ValueError as e:
+            # a stored chart that fails to render is a server error, like POST /reports/combined
+            await self._call(self.store.fail, job_id, owner, str(e), 500 if job["kind"] == "report" else 400)
+        except TimeoutError as e:
+            await self._call(self.store.fail, job_id, owner, str(e), 504)
+        except Exception as e:
+            logger.exception("job %s failed", job_id)
+            await self._call(self.store.fail, job_id, owner, str(e), 500)
+        else:
+            await self._call(self.store.finish, job_id, owner, result)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+job_store = JobStore(
+    Path(config.JOB_STORE_PATH),
+    lease=config.JOB_LEASE,
+    max_attempts=config.JOB_MAX_ATTEMPTS,
+)
+
+job_runner = JobRunner(
+    job_store,
+    workers=config.JOB_WORKERS,
+    poll_interval=config.JOB_POLL_INTERVAL,
+    retention=config.JOB_RETENTION,
+)
@@ -0,0 +1,74 @@
+"""
+Write-behind persistence for reading artifacts.
+
+Requests hand the chart dict and rendered report to a single background
+writer thread and return immediately; the chart store (and any file under
+backend/data) is never on the request's critical path. Disable storing
+readings with ASTROAI_PERSIST_ARTIFACTS=0.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src import config
+from src.services.chart_store import chart_store
+
+logger = logging.getLogger(__name__)
+
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="astroai-persist")
+_pending: "set[Future]" = set()
+_pending_lock = threading.Lock()
+
+
+def backend_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write-then-rename so readers never see a partially written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+
+def write_behind(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run fn(*args) on the writer thread. Failures are logged, never raised."""
+    future = _writer.submit(fn, *args)
+    with _pending_lock:
+        _pending.add(future)
+    future.add_done_callback(_on_done)
+    return future
+
+
+def _on_done(future: Future) -> None:
+    with _pending_lock:
+        _pending.discard(future)
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("write-behind failed: %s", exc)
+
+
+def flush(timeout: Optional[float] = None) -> None:
+    """Block until every queued write has finished (used at shutdown)."""
+    with _pending_lock:
+        pending = list(_pending)
+    wait(pending, timeout=timeout)
+
+
+def _save_reading(chart_id: str, input_hash: str, chart: Dict[str, Any], report_markdown: str) -> None:
+    chart_store.put_chart(chart_id, input_hash, chart, report_markdown)
+
+
+def save_reading(chart_id: str, input_hash: str, chart: Dict[str, Any], report_markdown: str) -> None:
+    """Queue the chart + report for the chart store (chart_store.py)."""
+    if not config.PERSIST_ARTIFACTS:
+        return
+    write_behind(_save_reading, chart_id, input_hash, chart, report_markdown)
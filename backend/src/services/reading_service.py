@@ -1,81 +1,502 @@
-from pathlib import Path
+import asyncio
 import re
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from typing import Awaitable, Callable, Optional
+from src import config
 from src.services.core_me import build_core_me_paragraph
 
-from src.location.osm_resolver import resolve_place_india, LocationResolveError
+from src.location.osm_resolver import (
+    resolve_place_id,
+    resolve_place_india,
+    resolve_place_india_async,
+    LocationResolveError,
+)
 from src.services.script_runner import (
     run_calculator,
     run_report_generator,
-    ensure_data_dirs,
     ScriptRunError,
 )
+from src.services.engine import calculate_chart, compare_ayanamsas, expand_dasha, render_report, EngineError
+from src.services import worker_pool
+from src.services.worker_pool import PoolTimeoutError
+from src.services.chart_cache import chart_cache, chart_key
+from src.services.chart_store import chart_store
+from src.services.persistence import save_reading
+from src.services.storage_manager import storage_manager
+
+# called with each stage name ("geocode", "calculate", "render") as it starts; see job_queue.py
+Progress = Optional[Callable[[str], Awaitable[None]]]
+
+
+async def _stage(progress: Progress, stage: str) -> None:
+    if progress is not None:
+        await progress(stage)
+
 
 def _slug(text: str) -> str:
     text = text.strip().lower()
     text = re.sub(r"[^a-z0-9]+", "_", text)
     return text.strip("_") or "place"
 
-def generate_reading(name: str, date: str, time: str, place: str, ayanamsa: str) -> dict:
-    # 1) resolve place
+
+def _chart_id(name: str, date: str, time: str, place: str) -> str:
+    name_slug = _slug(name)
+    date_part = date.replace("-", "")
+    time_part = time.replace(":", "")
+    place_slug = _slug(place.split(",")[0])
+    return f"{name_slug}_{date_part}_{time_part}_{place_slug}"
+
+
+@contextmanager
+def _engine_errors():
+    """Maps engine failures onto the errors the API layer knows about."""
     try:
-        loc = resolve_place_india(place)
+        yield
+    except ScriptRunError as e:
+        raise ValueError(f"Astrology script failed: {e}")
+    except EngineError as e:
+        raise ValueError(f"Astrology engine failed: {e}")
+    except PoolTimeoutError as e:
+        raise TimeoutError(str(e))
+
+
+def _calculate_reading(
+    name: str,
+    date: str,
+    time: str,
+    lat: float,
+    lon: float,
+    tz: float,
+    place: str,
+    ayanamsa: str,
+) -> tuple[dict, str]:
+    """Runs the calculator + report generator with the configured engine mode."""
+    inputs = dict(
+        name=name,
+        date=date,
+        time=time,
+        lat=lat,
+        lon=lon,
+        tz=tz,
+        place=place,
+        ayanamsa=ayanamsa,
+        transit_year=config.TRANSIT_YEAR,
+    )
+    if config.ENGINE_MODE == "subprocess":
+        # isolation fallback: one fresh interpreter per script, piped over stdio
+        chart = run_calculator(**inputs)
+        return chart, run_report_generator(chart=chart)
+
+    if config.ENGINE_MODE == "pool":
+        return worker_pool.calculate_reading(**inputs)
+
+    chart = calculate_chart(**inputs)
+    return chart, render_report(chart)
+
+
+def _render_report(chart: dict) -> str:
+    """Renders an already-calculated chart with the configured engine mode."""
+    if config.ENGINE_MODE == "subprocess":
+        return run_report_generator(chart=chart)
+
+    if config.ENGINE_MODE == "pool":
+        return worker_pool.render_report(chart)
+
+    return render_report(chart)
+
+
+async def _calculate_reading_async(**inputs) -> tuple[dict, str]:
+    # pool jobs are awaited directly; the other modes block, so give them a thread
+    if config.ENGINE_MODE == "pool":
+        return await worker_pool.calculate_reading_async(**inputs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(_calculate_reading, **inputs))
+
+
+async def _render_report_async(chart: dict) -> str:
+    if config.ENGINE_MODE == "pool":
+        return await worker_pool.render_report_async(chart)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _render_report, chart)
+
+
+def _calculate_chart(**inputs) -> dict:
+    """The chart alone (no report) with the configured engine mode."""
+    if config.ENGINE_MODE == "subprocess":
+        return run_calculator(**inputs)
+
+    if config.ENGINE_MODE == "pool":
+        return worker_pool.calculate_chart(**inputs)
+
+    return calculate_chart(**inputs)
+
+
+async def _calculate_chart_async(**inputs) -> dict:
+    if config.ENGINE_MODE == "pool":
+        return await worker_pool.calculate_chart_async(**inputs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(_calculate_chart, **inputs))
+
+
+def _finish_reading(chart_id: str, input_hash: str, chart: dict, report_markdown: str) -> dict:
+    # chart + report go to the chart store in the background
+    save_reading(chart_id, input_hash, chart, report_markdown)
+    storage_manager.nudge()
+
+    return {
+        "chart_id": chart_id,
+        "report_markdown": _inject_core_me(chart, report_markdown),
+    }
+
+
+def _inject_core_me(chart: dict, report_markdown: str) -> str:
+    # inject "Core Characteristics" paragraph right after Core Signature
+    core_me_paragraph = build_core_me_paragraph(chart)
+
+    # Add a new section under Core Signature
+    injection = (
+        "## Core Signature\n\n"
+        f"{core_me_paragraph}\n\n"
+        "## 2026 Headline\n"
+    )
+
+    # Replace the existing heading sequence safely
+    return report_markdown.replace("## Core Signature\n", injection)
+
+
+def generate_reading(
+    name: str, date: str, time: str, place: str, ayanamsa: str, place_id: Optional[int] = None
+) -> dict:
+    # 1) resolve place (an exact place_id from /location/suggest skips geocoding)
+    try:
+        if place_id is not None:
+            loc = resolve_place_id(place_id, place, date, time)
+        else:
+            loc = resolve_place_india(place, date, time)
     except LocationResolveError as e:
         raise ValueError(str(e))
 
     lat = loc["latitude"]
     lon = loc["longitude"]
     tz = loc["timezone_offset"]
+    ayanamsa = ayanamsa or "raman"
 
-    # 2) build chart_id + file paths
-    name_slug = _slug(name)
-    date_part = date.replace("-", "")
-    time_part = time.replace(":", "")
-    place_slug = _slug(place.split(",")[0])
-    chart_id = f"{name_slug}{date_part}{time_part}_{place_slug}"
+    # 2) build chart_id
+    chart_id = _chart_id(name, date, time, place)
 
-    backend_root = Path(_file_).resolve().parents[2]
-    charts_dir, reports_dir = ensure_data_dirs(backend_root)
+    # 3) chart: reuse a cached one for the same birth data, else calculate
+    key = chart_key(date, time, lat, lon, tz, ayanamsa, config.TRANSIT_YEAR)
+    with _engine_errors():
+        chart = chart_cache.get(key, {"name": name, "birth_place": place})
+        if chart is None:
+            chart, report_markdown = _calculate_reading(
+                name=name,
+                date=date,
+                time=time,
+                lat=lat,
+                lon=lon,
+                tz=tz,
+                place=place,
+                ayanamsa=ayanamsa,
+            )
+            chart_cache.put(key, chart)
+        else:
+            report_markdown = _render_report(chart)
 
-    chart_path = charts_dir / f"{chart_id}_chart.json"
-    report_path = reports_dir / f"{chart_id}_report.md"
+    # 4) persist + inject "Core Characteristics" paragraph
+    return _finish_reading(chart_id, key, chart, report_markdown)
 
-    # 3) run scripts
+
+async def _resolve_place_async(place: str, place_id: Optional[int], date: str, time: str) -> dict:
     try:
-        run_calculator(
+        if place_id is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, resolve_place_id, place_id, place, date, time)
+        return await resolve_place_india_async(place, date, time)
+    except LocationResolveError as e:
+        raise ValueError(str(e))
+
+
+async def _cached_chart_async(key: str, meta: dict) -> Optional[dict]:
+    # a hit can mean a disk read, expanding the compact chart and computing
+    # the year's transits, so like the other blocking work it gets a thread
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, chart_cache.get, key, meta)
+
+
+async def _cache_chart_async(key: str, chart: dict) -> None:
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, chart_cache.put, key, chart)
+
+
+async def _generate_reading_async(
+    name: str, date: str, time: str, place: str, ayanamsa: str, place_id: Optional[int],
+    progress: Progress = None,
+) -> dict:
+    # same steps as generate_reading, awaiting network and CPU work
+    await _stage(progress, "geocode")
+    loc = await _resolve_place_async(place, place_id, date, time)
+
+    lat = loc["latitude"]
+    lon = loc["longitude"]
+    tz = loc["timezone_offset"]
+    ayanamsa = ayanamsa or "raman"
+
+    chart_id = _chart_id(name, date, time, place)
+
+    key = chart_key(date, time, lat, lon, tz, ayanamsa, config.TRANSIT_YEAR)
+    inputs = dict(name=name, date=date, time=time, lat=lat, lon=lon, tz=tz, place=place, ayanamsa=ayanamsa)
+    await _stage(progress, "calculate")
+    with _engine_errors():
+        chart = await _cached_chart_async(key, {"name": name, "birth_place": place})
+        if chart is None and progress is None:
+            # one pool job for both steps
+            chart, report_markdown = await _calculate_reading_async(**inputs)
+            await _cache_chart_async(key, chart)
+        else:
+            if chart is None:
+                chart = await _calculate_chart_async(**inputs, transit_year=config.TRANSIT_YEAR)
+                await _cache_chart_async(key, chart)
+            await _stage(progress, "render")
+            report_markdown = await _render_report_async(chart)
+
+    return _finish_reading(chart_id, key, chart, report_markdown)
+
+
+async def generate_reading_async(
+    name: str, date: str, time: str, place: str, ayanamsa: str, place_id: Optional[int] = None,
+    progress: Progress = None,
+) -> dict:
+    """
+    Async generate_reading: geocoding is awaited, CPU work runs on the worker
+    pool (or a thread), and the whole pipeline is bounded by REQUEST_TIMEOUT.
+    """
+    return await _with_deadline(
+        _generate_reading_async(name, date, time, place, ayanamsa, place_id, progress)
+    )
+
+
+async def _with_deadline(coro):
+    """
+    Awaits coro for at most REQUEST_TIMEOUT. Errors from the pipeline itself,
+    including a chart job's own timeout, are raised unchanged; only the
+    deadline running out is reported as the deadline.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=config.REQUEST_TIMEOUT)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel()
+        await asyncio.wait({task})  # let it unwind before answering
+        raise TimeoutError(f"Reading exceeded the {config.REQUEST_TIMEOUT:g}s deadline.")
+    return task.result()
+
+
+def _compare_ayanamsas(**inputs) -> dict:
+    """Every-ayanamsa comparison with the configured engine mode."""
+    if config.ENGINE_MODE == "subprocess":
+        return run_calculator(**inputs, ayanamsa="all")
+
+    if config.ENGINE_MODE == "pool":
+        return worker_pool.compare_ayanamsas(**inputs)
+
+    return compare_ayanamsas(**inputs)
+
+
+async def _compare_ayanamsas_async(**inputs) -> dict:
+    if config.ENGINE_MODE == "pool":
+        return await worker_pool.compare_ayanamsas_async(**inputs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(_compare_ayanamsas, **inputs))
+
+
+async def _ayanamsa_comparison_async(
+    name: str, date: str, time: str, place: str, place_id: Optional[int]
+) -> dict:
+    loc = await _resolve_place_async(place, place_id, date, time)
+
+    with _engine_errors():
+        comparison = await _compare_ayanamsas_async(
             name=name,
             date=date,
             time=time,
-            lat=lat,
-            lon=lon,
-            tz=tz,
+            lat=loc["latitude"],
+            lon=loc["longitude"],
+            tz=loc["timezone_offset"],
             place=place,
-            ayanamsa=ayanamsa or "raman",
-            output_json_path=chart_path,
         )
-        run_report_generator(
-            input_json_path=chart_path,
-            output_md_path=report_path,
-        )
-    except ScriptRunError as e:
-        raise ValueError(f"Astrology script failed: {e}")
 
-    # 4) read report
-    report_markdown = report_path.read_text(encoding="utf-8")
+    return {
+        "chart_id": _chart_id(name, date, time, place),
+        "comparison": comparison,
+    }
+
 
-    # 5) inject "Core Characteristics" paragraph right after Core Signature
-    core_me_paragraph = build_core_me_paragraph(chart_path)
+async def ayanamsa_comparison_async(
+    name: str, date: str, time: str, place: str, place_id: Optional[int] = None
+) -> dict:
+    """
+    The chart under every supported ayanamsa (Vedic positions + Vimshottari
+    dasha each) and the differences between them, from one ephemeris pass.
+    """
+    return await _with_deadline(_ayanamsa_comparison_async(name, date, time, place, place_id))
 
-    # Add a new section under Core Signature
-    injection = (
-        "## Core Signature\n\n"
-        f"{core_me_paragraph}\n\n"
-        "## 2026 Headline\n"
+
+async def _dasha_periods_async(
+    name: str,
+    date: str,
+    time: str,
+    place: str,
+    ayanamsa: str,
+    place_id: Optional[int],
+    system: str,
+    path: Optional[str],
+    on: Optional[str],
+) -> dict:
+    loc = await _resolve_place_async(place, place_id, date, time)
+
+    lat = loc["latitude"]
+    lon = loc["longitude"]
+    tz = loc["timezone_offset"]
+    ayanamsa = ayanamsa or "raman"
+
+    # the chart the reading already cached; calculated (and cached) if not
+    key = chart_key(date, time, lat, lon, tz, ayanamsa, config.TRANSIT_YEAR)
+    with _engine_errors():
+        chart = await _cached_chart_async(key, {"name": name, "birth_place": place})
+        if chart is None:
+            chart, _ = await _calculate_reading_async(
+                name=name,
+                date=date,
+                time=time,
+                lat=lat,
+                lon=lon,
+                tz=tz,
+                place=place,
+                ayanamsa=ayanamsa,
+            )
+            await _cache_chart_async(key, chart)
+        periods = expand_dasha(chart, system, path or "", on)
+
+    return {"chart_id": _chart_id(name, date, time, place), **periods}
+
+
+async def dasha_periods_async(
+    name: str,
+    date: str,
+    time: str,
+    place: str,
+    ayanamsa: str,
+    place_id: Optional[int] = None,
+    system: str = "vimshottari",
+    path: Optional[str] = None,
+    on: Optional[str] = None,
+) -> dict:
+    """
+    One level of the chart's dasha tree for a frontend drilling down: the
+    period at `path` ("3.2" = fourth mahadasha, third antardasha; top level
+    if empty) and its sub-periods, plus the periods running on `on`.
+    """
+    return await _with_deadline(
+        _dasha_periods_async(name, date, time, place, ayanamsa, place_id, system, path, on)
     )
 
-    # Replace the existing heading sequence safely
-    report_markdown = report_markdown.replace("## Core Signature\n", injection)
 
+async def _calculate_stored_chart_async(
+    name: str, date: str, time: str, place: str, ayanamsa: str, place_id: Optional[int],
+    progress: Progress = None,
+) -> dict:
+    await _stage(progress, "geocode")
+    loc = await _resolve_place_async(place, place_id, date, time)
+
+    lat = loc["latitude"]
+    lon = loc["longitude"]
+    tz = loc["timezone_offset"]
+    ayanamsa = ayanamsa or "raman"
+
+    chart_id = _chart_id(name, date, time, place)
+
+    key = chart_key(date, time, lat, lon, tz, ayanamsa, config.TRANSIT_YEAR)
+    await _stage(progress, "calculate")
+    with _engine_errors():
+        chart = await _cached_chart_async(key, {"name": name, "birth_place": place})
+        if chart is None:
+            chart = await _calculate_chart_async(
+                name=name,
+                date=date,
+                time=time,
+                lat=lat,
+                lon=lon,
+                tz=tz,
+                place=place,
+                ayanamsa=ayanamsa,
+                transit_year=config.TRANSIT_YEAR,
+            )
+            await _cache_chart_async(key, chart)
+
+    # stored before returning: the chart_id must be readable right away
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, chart_store.put_chart, chart_id, key, chart)
+    storage_manager.nudge()
+
+    meta = chart["meta"]
     return {
         "chart_id": chart_id,
-        "report_markdown": report_markdown,
+        "meta": {field: meta[field] for field in ("name", "birth_date", "birth_time", "birth_place")},
     }
+
+
+async def calculate_stored_chart_async(
+    name: str, date: str, time: str, place: str, ayanamsa: str, place_id: Optional[int] = None,
+    progress: Progress = None,
+) -> dict:
+    """
+    Calculate (or reuse) a chart and keep it in the chart store under its
+    chart_id, for /charts/{chart_id} and /reports/combined.
+    """
+    return await _with_deadline(
+        _calculate_stored_chart_async(name, date, time, place, ayanamsa, place_id, progress)
+    )
+
+
+async def get_stored_chart_async(chart_id: str) -> Optional[dict]:
+    """A stored chart, dashas running as of today; None if there is none."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, chart_store.get_chart, chart_id)
+
+
+async def list_stored_charts_async(limit: int, before: Optional[float] = None, before_id: str = "") -> list:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(chart_store.list_charts, limit, before, before_id))
+
+
+async def _combined_report_async(chart_id: str, progress: Progress = None) -> Optional[dict]:
+    await _stage(progress, "render")
+    chart = await get_stored_chart_async(chart_id)
+    if chart is None:
+        return None
+
+    # a report rendered today is still current; an older or evicted one is rendered again
+    loop = asyncio.get_running_loop()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    report_markdown = await loop.run_in_executor(None, chart_store.get_report, chart_id, today)
+    if report_markdown is None:
+        with _engine_errors():
+            report_markdown = await _render_report_async(chart)
+        await loop.run_in_executor(None, chart_store.put_report, chart_id, report_markdown)
+        storage_manager.nudge()
+
+    return {
+        "chart_id": chart_id,
+        "report_markdown": _inject_core_me(chart, report_markdown),
+    }
+
+
+async def combined_report_async(chart_id: str, progress: Progress = None) -> Optional[dict]:
+    """The combined reading for a stored chart, as of today; None if the chart is unknown."""
+    return await _with_deadline(_combined_report_async(chart_id, progress))
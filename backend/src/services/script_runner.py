@@ -1,28 +1,34 @@
+import json
 import subprocess
 import sys
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 
 class ScriptRunError(Exception):
     pass
 
 
-def run_python_script(args: list[str]) -> None:
+def run_python_script(args: list[str], stdin: Optional[str] = None) -> str:
     """
     Runs a python script using the CURRENT venv interpreter (sys.executable).
+    `stdin` is fed to the script; its stdout is returned.
     Raises ScriptRunError if it fails.
     """
     try:
         completed = subprocess.run(
             [sys.executable, *args],
+            input=stdin,
             check=True,
             capture_output=True,
             text=True,
+            encoding="utf-8",
         )
     except subprocess.CalledProcessError as e:
         raise ScriptRunError(
             f"Script failed.\nCOMMAND: {e.cmd}\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}"
         )
+    return completed.stdout
 
 
 def project_root_from_backend() -> Path:
@@ -41,14 +47,6 @@ def get_scripts_dir() -> Path:
     return root / "docs" / "multi-system-astrology" / "scripts"
 
 
-def ensure_data_dirs(backend_root: Path) -> tuple[Path, Path]:
-    charts_dir = backend_root / "data" / "charts"
-    reports_dir = backend_root / "data" / "reports"
-    charts_dir.mkdir(parents=True, exist_ok=True)
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    return charts_dir, reports_dir
-
-
 def run_calculator(
     name: str,
     date: str,
@@ -58,8 +56,13 @@ def run_calculator(
     tz: float,
     place: str,
     ayanamsa: str,
-    output_json_path: Path,
-) -> None:
+    output_json_path: Optional[Path] = None,
+    transit_year: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Writes the chart to output_json_path, or, if it is None, reads it from
+    the script's stdout and returns it as a dict.
+    """
     scripts_dir = get_scripts_dir()
     script = scripts_dir / "multi_system_calculator.py"
 
@@ -73,22 +76,37 @@ def run_calculator(
         "--tz", str(tz),
         "--place", place,
         "--ayanamsa", ayanamsa,
-        "--output", str(output_json_path),
+        "--output", str(output_json_path) if output_json_path else "-",
     ]
-    run_python_script(args)
+    if transit_year is not None:
+        args += ["--year", str(transit_year)]
+    stdout = run_python_script(args)
+    if output_json_path is None:
+        return json.loads(stdout)
+    return None
 
 
 def run_report_generator(
-    input_json_path: Path,
-    output_md_path: Path,
-) -> None:
+    input_json_path: Optional[Path] = None,
+    output_md_path: Optional[Path] = None,
+    chart: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
+    """
+    Reads the chart from input_json_path, or from `chart` piped over stdin.
+    Writes the report to output_md_path, or returns it if that is None.
+    """
     scripts_dir = get_scripts_dir()
     script = scripts_dir / "generate_combined_report.py"
 
     # IMPORTANT: this script expects input as a positional argument.
     args = [
         str(script),
-        str(input_json_path),
-        "--output", str(output_md_path),
+        str(input_json_path) if input_json_path else "-",
+        "--output", str(output_md_path) if output_md_path else "-",
     ]
-    run_python_script(args)
+    stdin = json.dumps(chart, ensure_ascii=False) if input_json_path is None else None
+    stdout = run_python_script(args, stdin=stdin)
+    if output_md_path is None:
+        # drop the newline print() adds after the report
+        return stdout[:-1] if stdout.endswith("\n") else stdout
+    return None
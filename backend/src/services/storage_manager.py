@@ -0,0 +1,225 @@
+"""
+Keeps backend/data within a byte and entry budget.
+
+What counts: the chart store (charts and reports) and the chart cache's
+disk tier. What is evicted when over budget: only what can be rebuilt,
+least recently used first, across both kinds:
+  - stored reports (rendered again from their chart; last read per report
+    is tracked in the store)
+  - chart cache files (recalculated from the inputs; a hit refreshes the
+    file's modification time)
+Charts themselves are never evicted.
+
+A background thread sweeps every STORAGE_SWEEP_INTERVAL seconds, or sooner
+after writes (nudge()), then compacts: the SQLite WAL is checkpointed and
+free pages are returned, and temp files left by interrupted writes are
+removed. Requests never wait on it. With several uvicorn workers one sweep
+runs at a time (a flock on data/storage.lock); the others skip.
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src import config
+from src.services.chart_cache import chart_cache
+from src.services.chart_store import ChartStore, chart_store
+
+try:
+    import fcntl
+except ImportError:  # Windows: sweeps are not coordinated between processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# shortest time between two sweeps, however often they are nudged
+MIN_SWEEP_GAP = 30.0
+# temp files (write-then-rename) older than this were abandoned by a crash
+STALE_TMP_AGE = 3600.0
+_EVICT_BATCH = 500
+
+
+class StorageManager:
+    def __init__(
+        self,
+        store: ChartStore,
+        cache_dir: Optional[Path],
+        max_bytes: int,
+        max_entries: int,
+        interval: float,
+        lock_path: Path,
+    ):
+        self.store = store
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes  # 0 = no limit
+        self.max_entries = max_entries  # 0 = no limit
+        self.interval = interval
+        self.lock_path = lock_path
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------------------------------------------------------
+    # background thread
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="astroai-storage", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def nudge(self) -> None:
+        """Something was written; sweep soon (at most every MIN_SWEEP_GAP seconds)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning("storage sweep failed: %s", e)
+            self._stop.wait(MIN_SWEEP_GAP)
+
+    # -------------------------------------------------------------------------
+    # sweep
+    # -------------------------------------------------------------------------
+
+    def sweep(self) -> Optional[Dict[str, Any]]:
+        """
+        Evict to budget and compact. Returns what was done, or None if another
+        process is sweeping.
+        """
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+b") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None
+            try:
+                stats = self._evict()
+                stats["tmp_removed"] = self._remove_stale_tmp()
+                stats["compacted_bytes"] = self.store.compact()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        if stats["reports_evicted"] or stats["files_evicted"]:
+            logger.info("storage sweep: %s", stats)
+        return stats
+
+    def usage(self) -> Dict[str, int]:
+        usage = self.store.usage()
+        files = list(self._cache_files())
+        usage["cache_files"] = len(files)
+        usage["cache_bytes"] = sum(size for _, _, size in files)
+        usage["bytes"] = usage["chart_bytes"] + usage["report_bytes"] + usage["cache_bytes"]
+        usage["entries"] = usage["reports"] + usage["cache_files"]
+        return usage
+
+    def _over(self, total_bytes: int, entries: int) -> bool:
+        return (self.max_bytes > 0 and total_bytes > self.max_bytes) or (
+            self.max_entries > 0 and entries > self.max_entries
+        )
+
+    def _evict(self) -> Dict[str, Any]:
+        usage = self.usage()
+        total_bytes, entries = usage["bytes"], usage["entries"]
+        stats = {"reports_evicted": 0, "files_evicted": 0, "bytes_evicted": 0}
+        if not self._over(total_bytes, entries):
+            return stats
+
+        # oldest use first, reports and cache files interleaved
+        reports = ((accessed, "report", chart_id, size) for accessed, chart_id, size in self.store.least_recent_reports())
+        files = ((mtime, "file", path, size) for mtime, path, size in sorted(self._cache_files()))
+        report_batch: List[Tuple[float, str]] = []
+        for used, kind, item, size in heapq.merge(reports, files, key=lambda c: c[0]):
+            if not self._over(total_bytes, entries):
+                break
+            if kind == "report":
+                report_batch.append((used, item))
+                if len(report_batch) >= _EVICT_BATCH:
+                    stats["reports_evicted"] += self.store.evict_reports(report_batch)
+                    report_batch = []
+            elif self._remove_file(item, used):
+                stats["files_evicted"] += 1
+            total_bytes -= size
+            entries -= 1
+            stats["bytes_evicted"] += size
+        if report_batch:
+            stats["reports_evicted"] += self.store.evict_reports(report_batch)
+
+        if self._over(total_bytes, entries):
+            logger.warning(
+                "storage over budget with nothing left to evict: %d charts, %d bytes",
+                usage["charts"], total_bytes,
+            )
+        return stats
+
+    def _cache_files(self) -> Iterator[Tuple[float, Path, int]]:
+        """(mtime, path, bytes) of the chart cache's files."""
+        if self.cache_dir is None:
+            return
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            yield st.st_mtime, Path(entry.path), st.st_size
+
+    @staticmethod
+    def _remove_file(path: Path, mtime: float) -> bool:
+        """Remove a cache file unless it was used after it was listed."""
+        try:
+            if path.stat().st_mtime > mtime:
+                return False
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+    def _remove_stale_tmp(self) -> int:
+        removed = 0
+        if self.cache_dir is None:
+            return removed
+        cutoff = time.time() - STALE_TMP_AGE
+        for path in self.cache_dir.glob(".*.tmp"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+storage_manager = StorageManager(
+    store=chart_store,
+    cache_dir=chart_cache.disk_dir,
+    max_bytes=config.STORAGE_MAX_BYTES,
+    max_entries=config.STORAGE_MAX_ENTRIES,
+    interval=config.STORAGE_SWEEP_INTERVAL,
+    lock_path=Path(config.CHART_STORE_PATH).with_name("storage.lock"),
+)
@@ -0,0 +1,239 @@
+"""
+Pre-warmed worker pool for chart calculation.
+
+A fixed number of long-lived worker processes import swisseph, set the
+ephemeris path and load the calculator tables (NAKSHATRAS, RASHIS_VEDIC, ...)
+once, then serve chart/report jobs. Admission is bounded: at most
+POOL_SIZE running + QUEUE_DEPTH waiting jobs; anything beyond that is
+rejected immediately with PoolBusyError instead of piling up.
+"""
+import asyncio
+import importlib
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src import config
+from src.services import engine
+
+
+class PoolBusyError(Exception):
+    """Raised when the job queue is full. retry_after is a hint in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Chart workers are busy. Retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+# -----------------------------------------------------------------------------
+# Worker side (runs inside the pool processes)
+# -----------------------------------------------------------------------------
+
+def _init_worker(ephe_path: str, transit_year: Optional[int]) -> None:
+    calculator, _ = engine.load_engine()
+    if ephe_path:
+        calculator.set_ephemeris_path(ephe_path)
+    if transit_year is not None:
+        # the year's transit calendar is shared by every chart; compute it before the first one
+        calculator.get_year_transits(transit_year)
+        # and so are the daily samples the natal transit timeline sweeps
+        importlib.import_module("transit_aspects").prepare_year(transit_year)
+
+
+def _job_chart(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return engine.calculate_chart(**kwargs)
+
+
+def _job_report(chart: Dict[str, Any]) -> str:
+    return engine.render_report(chart)
+
+
+def _job_reading(kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    chart = engine.calculate_chart(**kwargs)
+    return chart, engine.render_report(chart)
+
+
+def _job_compare(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return engine.compare_ayanamsas(**kwargs)
+
+
+def _job_vedic(jd: float, lat: float, lon: float, ayanamsa: str) -> Dict[str, Any]:
+    calculator, _ = engine.load_engine()
+    return calculator.calculate_vedic_positions(jd, lat, lon, ayanamsa)
+
+
+def _job_western(jd: float, lat: float, lon: float) -> Dict[str, Any]:
+    calculator, _ = engine.load_engine()
+    return calculator.calculate_western_positions(jd, lat, lon)
+
+
+def _job_warmup() -> int:
+    return os.getpid()
+
+
+# -----------------------------------------------------------------------------
+# Parent side
+# -----------------------------------------------------------------------------
+
+class WorkerPool:
+    def __init__(
+        self,
+        size: int,
+        queue_depth: int,
+        job_timeout: float,
+        ephe_path: str = "",
+        transit_year: Optional[int] = None,
+    ):
+        self.size = max(1, size)
+        self.queue_depth = max(0, queue_depth)
+        self.job_timeout = job_timeout
+        # "spawn" so workers never inherit the server's threads or sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(ephe_path, transit_year),
+        )
+        self._slots = threading.BoundedSemaphore(self.size + self.queue_depth)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_job_seconds = 1.0
+
+    def warm_up(self) -> None:
+        """Start every worker now so the first requests don't pay for it."""
+        futures = [self._executor.submit(_job_warmup) for _ in range(self.size)]
+        for f in futures:
+            f.result()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a job, or raise PoolBusyError if the queue is already full."""
+        if not self._slots.acquire(blocking=False):
+            raise PoolBusyError(self._retry_after())
+
+        started = time.monotonic()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release(started)
+            raise
+        future.add_done_callback(lambda _f: self._release(started))
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """submit() and wait up to job_timeout seconds for the result."""
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=self.job_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PoolTimeoutError(f"Chart job exceeded {self.job_timeout:g}s.")
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Like run(), but awaits the result instead of blocking a thread."""
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.job_timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise PoolTimeoutError(f"Chart job exceeded {self.job_timeout:g}s.")
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, started: float) -> None:
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._in_flight -= 1
+            # EWMA of end-to-end job time, used for the retry hint
+            self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * elapsed
+        self._slots.release()
+
+    def _retry_after(self) -> int:
+        with self._lock:
+            waves = self._in_flight / self.size
+            return max(1, math.ceil(waves * self._avg_job_seconds))
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> WorkerPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = WorkerPool(
+                    size=config.POOL_SIZE,
+                    queue_depth=config.POOL_QUEUE_DEPTH,
+                    job_timeout=config.POOL_JOB_TIMEOUT,
+                    ephe_path=config.EPHE_PATH,
+                    transit_year=config.TRANSIT_YEAR,
+                )
+    return _pool
+
+
+def start_pool() -> None:
+    get_pool().warm_up()
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def calculate_chart(**kwargs: Any) -> Dict[str, Any]:
+    """engine.calculate_chart, run on a pool worker."""
+    return get_pool().run(_job_chart, kwargs)
+
+
+async def calculate_chart_async(**kwargs: Any) -> Dict[str, Any]:
+    return await get_pool().run_async(_job_chart, kwargs)
+
+
+def render_report(chart: Dict[str, Any]) -> str:
+    """engine.render_report, run on a pool worker."""
+    return get_pool().run(_job_report, chart)
+
+
+def calculate_reading(**kwargs: Any) -> Tuple[Dict[str, Any], str]:
+    """Chart + rendered report as a single pool job."""
+    return get_pool().run(_job_reading, kwargs)
+
+
+async def calculate_reading_async(**kwargs: Any) -> Tuple[Dict[str, Any], str]:
+    return await get_pool().run_async(_job_reading, kwargs)
+
+
+async def render_report_async(chart: Dict[str, Any]) -> str:
+    return await get_pool().run_async(_job_report, chart)
+
+
+def compare_ayanamsas(**kwargs: Any) -> Dict[str, Any]:
+    """engine.compare_ayanamsas, run on a pool worker."""
+    return get_pool().run(_job_compare, kwargs)
+
+
+async def compare_ayanamsas_async(**kwargs: Any) -> Dict[str, Any]:
+    return await get_pool().run_async(_job_compare, kwargs)
+
+
+def calculate_vedic_positions(jd: float, lat: float, lon: float, ayanamsa: str = "raman") -> Dict[str, Any]:
+    return get_pool().run(_job_vedic, jd, lat, lon, ayanamsa)
+
+
+def calculate_western_positions(jd: float, lat: float, lon: float) -> Dict[str, Any]:
+    return get_pool().run(_job_western, jd, lat, lon)
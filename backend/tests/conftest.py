@@ -0,0 +1,16 @@
+"""
+Puts backend/ (for `src`) and the astrology scripts on sys.path, so tests
+run with a plain `python -m pytest` from backend/.
+"""
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services.script_runner import get_scripts_dir  # noqa: E402
+
+SCRIPTS_DIR = str(get_scripts_dir())
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
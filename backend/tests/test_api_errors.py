@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.services.chart_store import ChartStoreError
+from src.services.worker_pool import PoolBusyError
+
+BIRTH = {"name": "Test", "date": "1999-11-13", "time": "16:20:00", "place": "Visakhapatnam"}
+
+
+def _raising(exc):
+    async def service(*args, **kwargs):
+        raise exc
+    return service
+
+
+@pytest.fixture
+def client():
+    # no lifespan: no worker pool, job workers or storage sweeps
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize(
+    "exc, status",
+    [
+        (ValueError("Place not found"), 400),
+        (ChartStoreError("disk full"), 500),
+        (PoolBusyError(retry_after=3), 503),
+        (TimeoutError("Deadline exceeded"), 504),
+    ],
+)
+@pytest.mark.parametrize(
+    "path, service",
+    [
+        ("/reading/generate", "generate_reading_async"),
+        ("/charts/calculate", "calculate_stored_chart_async"),
+        ("/reading/ayanamsa-comparison", "ayanamsa_comparison_async"),
+    ],
+)
+def test_service_errors_map_to_status(client, monkeypatch, path, service, exc, status):
+    monkeypatch.setattr(main, service, _raising(exc))
+    resp = client.post(path, json=BIRTH)
+    assert resp.status_code == status
+    assert resp.json()["detail"] == str(exc)
+    if status == 503:
+        assert resp.headers["Retry-After"] == "3"
+
+
+def test_report_render_error_is_server_error(client, monkeypatch):
+    monkeypatch.setattr(main, "combined_report_async", _raising(ValueError("bad chart")))
+    resp = client.post("/reports/combined", json={"chart_id": "x"})
+    assert resp.status_code == 500
+
+
+def test_unknown_chart_is_404(client, monkeypatch):
+    async def missing(chart_id):
+        return None
+    monkeypatch.setattr(main, "get_stored_chart_async", missing)
+    assert client.get("/charts/nope").status_code == 404
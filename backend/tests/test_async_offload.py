@@ -0,0 +1,76 @@
+"""
+The async request paths keep blocking calls (chart cache, gazetteer, geocode
+cache) off the event loop thread.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.location import osm_resolver
+from src.services import reading_service
+
+BIRTH = dict(name="Test", date="1999-11-13", time="16:20:00", place="Somewhere", ayanamsa="raman")
+LOC = {"place": "Somewhere", "latitude": 17.69, "longitude": 83.22, "timezone_name": "Asia/Kolkata"}
+
+
+class Recorder:
+    def __init__(self):
+        self.threads = []
+
+    def wrap(self, fn):
+        def recorded(*args, **kwargs):
+            self.threads.append(threading.current_thread())
+            return fn(*args, **kwargs)
+        return recorded
+
+    def assert_off_loop(self, loop_thread):
+        assert self.threads, "not called"
+        assert loop_thread not in self.threads
+
+
+def _run(coro):
+    loop_thread = threading.current_thread()  # asyncio.run drives the loop from this thread
+    return asyncio.run(coro), loop_thread
+
+
+def test_resolver_reads_gazetteer_off_loop(monkeypatch):
+    rec = Recorder()
+    monkeypatch.setattr(osm_resolver, "get_gazetteer", rec.wrap(osm_resolver.get_gazetteer))
+    loc, loop_thread = _run(osm_resolver.resolve_place_india_async("Visakhapatnam", "1999-11-13", "16:20:00"))
+    rec.assert_off_loop(loop_thread)
+    assert loc["timezone_offset"] == 5.5
+
+
+def test_resolver_reads_geocode_cache_off_loop(monkeypatch):
+    rec = Recorder()
+    monkeypatch.setattr(osm_resolver, "_from_gazetteer", lambda place: None)
+    fake_cache = type("Cache", (), {"get": rec.wrap(lambda self, key, allow_stale=False: (True, dict(LOC)))})()
+    monkeypatch.setattr(osm_resolver, "geocode_cache", fake_cache)
+    loc, loop_thread = _run(osm_resolver.resolve_place_india_async("Somewhere", "1999-11-13", "16:20:00"))
+    rec.assert_off_loop(loop_thread)
+    assert loc["latitude"] == LOC["latitude"]
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_chart_cache_runs_off_loop(monkeypatch, cached):
+    chart = {"meta": {"name": "Test", "birth_date": "1999-11-13", "birth_time": "16:20:00", "birth_place": "Somewhere"}}
+    rec = Recorder()
+
+    async def resolve(place, place_id, date, time):
+        return {**LOC, "timezone_offset": 5.5}
+
+    async def calculate(**inputs):
+        return chart
+
+    monkeypatch.setattr(reading_service, "_resolve_place_async", resolve)
+    monkeypatch.setattr(reading_service, "_calculate_chart_async", calculate)
+    monkeypatch.setattr(reading_service.chart_cache, "get", rec.wrap(lambda key, meta: chart if cached else None))
+    monkeypatch.setattr(reading_service.chart_cache, "put", rec.wrap(lambda key, chart: None))
+    monkeypatch.setattr(reading_service.chart_store, "put_chart", lambda *args: None)
+    monkeypatch.setattr(reading_service.storage_manager, "nudge", lambda: None)
+
+    result, loop_thread = _run(reading_service.calculate_stored_chart_async(**BIRTH))
+    rec.assert_off_loop(loop_thread)
+    assert len(rec.threads) == (1 if cached else 2)
+    assert result["meta"]["name"] == "Test"
@@ -0,0 +1,72 @@
+"""Batch ephemeris rows agree with the calculator's Vedic and Western sections."""
+import numpy as np
+import pytest
+
+import multi_system_calculator as calc
+from batch_ephemeris import NAKSHATRA_NAMES, RASHI_NAMES, SIGN_NAMES, batch_positions
+from ingress_index import STATION, find_events
+
+CHARTS = [
+    # jd (UT), lat, lon, ayanamsa
+    (calc.swe.julday(1999, 11, 13, 10.8333), 17.6868, 83.2185, "raman"),
+    (calc.swe.julday(1987, 3, 2, 23.5), 28.6139, 77.2090, "lahiri"),
+    (calc.swe.julday(2026, 6, 21, 4.25), 51.5074, -0.1278, "krishnamurti"),
+]
+
+
+def _check_row(row, vedic, western):
+    assert row["sidereal"] == pytest.approx(vedic["longitude"], abs=1e-9)
+    assert row["tropical"] == pytest.approx(western["longitude"], abs=1e-9)
+    assert str(NAKSHATRA_NAMES[row["nakshatra"]]) == vedic["nakshatra"]["name"]
+    assert row["pada"] == vedic["nakshatra"]["pada"]
+    assert row["rashi"] + 1 == vedic["rashi"]["index"]
+    assert str(RASHI_NAMES[row["rashi"]]) == vedic["rashi"]["name"]
+    assert str(SIGN_NAMES[row["sign"]]) == western["sign"]["sign"]
+
+
+@pytest.mark.parametrize("jd,lat,lon,ayanamsa", CHARTS)
+def test_batch_matches_calculator(jd, lat, lon, ayanamsa):
+    vedic = calc.calculate_vedic_positions(jd, lat, lon, ayanamsa)
+    western = calc.calculate_western_positions(jd, lat, lon)
+    result = batch_positions([jd], lat, lon, ayanamsa)
+    rows = dict(zip(result["bodies"], result["positions"][0]))
+
+    assert result["ayanamsa"][0] == pytest.approx(vedic["ayanamsa"], abs=1e-12)
+    for name, row in rows.items():
+        if name == "Ketu":
+            _check_row(row, vedic["planets"]["ketu"], {
+                "longitude": row["tropical"],
+                "sign": calc.get_western_sign(float(row["tropical"])),
+            })
+            assert row["retrograde"] and vedic["planets"]["ketu"]["retrograde"]
+            continue
+        western_row = western["planets"][name.lower()]
+        assert row["retrograde"] == western_row["retrograde"]
+        if name in calc.OUTER_PLANETS:
+            continue
+        vedic_row = vedic["planets"][name.lower()]
+        _check_row(row, vedic_row, western_row)
+        assert row["latitude"] == pytest.approx(vedic_row["latitude"], abs=1e-12)
+        assert row["speed"] == pytest.approx(vedic_row["speed"], abs=1e-12)
+
+    asc = result["ascendant"][0]
+    assert asc["sidereal"] == pytest.approx(vedic["ascendant"]["longitude"], abs=1e-9)
+    assert str(NAKSHATRA_NAMES[asc["nakshatra"]]) == vedic["ascendant"]["nakshatra"]["name"]
+    assert asc["pada"] == vedic["ascendant"]["nakshatra"]["pada"]
+    assert str(SIGN_NAMES[asc["sign"]]) == western["ascendant"]["sign"]["sign"]
+
+
+def test_retrograde_flag_at_a_station_follows_tropical_speed():
+    # just after Mercury stations direct the tropical speed is positive but
+    # still smaller than the ayanamsa rate, so the sidereal speed is negative
+    stations = find_events("Mercury", STATION, calc.swe.julday(2026, 1, 1, 0.0), calc.swe.julday(2027, 1, 1, 0.0))
+    direct = next(e["jd"] for e in stations[1:] if e["value"] == 0)
+    jd = float(direct) + 1e-4
+
+    western = calc.calculate_western_positions(jd, 0.0, 0.0)["planets"]["mercury"]
+    vedic = calc.calculate_vedic_positions(jd, 0.0, 0.0, "raman")["planets"]["mercury"]
+    row = batch_positions(np.array([jd]))["positions"][0][list(calc.PLANETS).index("Mercury")]
+
+    assert vedic["retrograde"] and not western["retrograde"]  # the two speeds disagree here
+    assert row["retrograde"] == western["retrograde"]
+    assert row["speed"] == pytest.approx(vedic["speed"], abs=1e-12)
@@ -0,0 +1,78 @@
+"""
+Chart store listing pages through charts created in the same instant, and
+SQLite failures surface as ChartStoreError.
+"""
+import sqlite3
+
+import pytest
+
+from src.services import chart_store as chart_store_module
+from src.services.chart_store import ChartStore, ChartStoreError
+
+
+def _chart(name):
+    return {"meta": {"name": name, "birth_date": "1999-11-13", "birth_time": "16:20:00", "birth_place": "Vizag"}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChartStore(tmp_path / "charts.sqlite3")
+
+
+def test_list_pages_through_tied_timestamps(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(chart_store_module.time, "time", lambda: now[0])
+    ids = []
+    for i in range(7):
+        if i in (2, 5):  # two charts alone in their instant, five sharing one
+            now[0] += 1.0
+        ids.append(f"chart{i}")
+        store.put_chart(ids[-1], "hash", _chart(f"User{i}"))
+
+    seen, before, before_id = [], None, ""
+    while True:
+        page = store.list_charts(limit=2, before=before, before_id=before_id)
+        seen.extend(c["chart_id"] for c in page)
+        if len(page) < 2:
+            break
+        before, before_id = page[-1]["created_at"], page[-1]["chart_id"]
+
+    assert sorted(seen) == ids
+    assert len(seen) == len(set(seen))
+    stamps = [(c["created_at"], c["chart_id"]) for c in store.list_charts(limit=10)]
+    assert stamps == sorted(stamps, reverse=True)
+
+
+def test_list_before_alone_keeps_old_cursor(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(chart_store_module.time, "time", lambda: now[0])
+    for i in range(3):
+        now[0] += 1.0
+        store.put_chart(f"chart{i}", "hash", _chart("User"))
+    assert [c["chart_id"] for c in store.list_charts(before=1003.0)] == ["chart1", "chart0"]
+
+
+class BrokenConnection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda s: s.usage(),
+        lambda s: s.least_recent_reports(),
+        lambda s: s.evict_reports([(0.0, "chart0")]),
+        lambda s: s.list_charts(),
+    ],
+)
+def test_sqlite_errors_raise_chart_store_error(store, monkeypatch, call):
+    monkeypatch.setattr(store, "_conn", lambda: BrokenConnection())
+    with pytest.raises(ChartStoreError, match="disk I/O error"):
+        call(store)
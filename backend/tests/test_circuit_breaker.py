@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from src.location.nominatim_client import CircuitBreaker, UpstreamUnavailableError
+
+
+def _open_breaker(reset_timeout: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold():
+    breaker = _open_breaker(reset_timeout=60)
+    assert breaker.state == "open"
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+
+
+def test_half_open_allows_one_trial():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_release_trial_keeps_breaker_half_open():
+    # a trial refused locally (rate limiter) says nothing about the upstream
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.release_trial()
+    assert breaker.state == "half_open"
+    breaker.before_call()  # the next trial may go
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_release_trial_keeps_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.release_trial()
+    breaker.record_failure()
+    assert breaker.state == "open"
@@ -0,0 +1,31 @@
+"""Compact charts agree with the calculator's own positions and survive every format."""
+import pytest
+
+import multi_system_calculator as calc
+from compact_chart import CompactChart, calculate_compact_chart
+
+BIRTHS = [
+    ("1999-11-13", "16:20:00", 17.69, 83.22, 5.5, "raman"),
+    ("1947-08-15", "00:00:00", 28.61, 77.21, 5.5, "lahiri"),
+    ("1985-03-02", "07:45:00", 40.71, -74.01, -5.0, "kp"),
+    ("2010-12-31", "23:59:00", -33.87, 151.21, 11.0, "true_chitra"),
+]
+
+
+@pytest.mark.parametrize("date, time, lat, lon, tz, ayanamsa", BIRTHS)
+def test_positions_match_calculator(date, time, lat, lon, tz, ayanamsa):
+    chart = calculate_compact_chart("Test", date, time, lat, lon, tz, "", ayanamsa).to_chart()
+    jd = chart["meta"]["julian_day"]
+    ctx = calc.ChartContext(jd, lat, lon)
+    assert chart["vedic"] == calc.calculate_vedic_positions(jd, lat, lon, ayanamsa, ctx)
+    assert chart["western"] == calc.calculate_western_positions(jd, lat, lon, ctx)
+
+
+@pytest.mark.parametrize("date, time, lat, lon, tz, ayanamsa", BIRTHS[:2])
+def test_formats_round_trip(date, time, lat, lon, tz, ayanamsa):
+    compact = calculate_compact_chart("Test", date, time, lat, lon, tz, "", ayanamsa)
+    now = 2461000.5
+    expected = compact.to_chart(now)
+    assert CompactChart.from_bytes(compact.to_bytes()).to_chart(now) == expected
+    assert CompactChart.from_compact(compact.to_compact()).to_chart(now) == expected
+    assert CompactChart.from_chart(expected).to_chart(now) == expected
@@ -0,0 +1,56 @@
+"""EphemerisTable lookups against swisseph, within the bound stored per series."""
+import numpy as np
+import pytest
+
+from ephemeris_table import EphemerisTable, build_table
+from multi_system_calculator import AYANAMSAS, PLANETS, SWE_LOCK, ChartContext, _prepare_thread, swe
+
+SAMPLES = 3000
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("ephemeris") / "ephemeris.tbl")
+    build_table(path, swe.julday(2000, 1, 1, 0.0), swe.julday(2002, 1, 1, 0.0))
+    table = EphemerisTable(path)
+    yield table
+    table.close()
+
+
+@pytest.fixture(scope="module")
+def instants(table):
+    rng = np.random.default_rng(15)
+    return rng.uniform(table.jd_start, table.jd_end, SAMPLES)
+
+
+def _angle_diff(a, b):
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+
+@pytest.mark.parametrize("body", list(PLANETS))
+def test_longitude_within_bound(table, instants, body):
+    _prepare_thread()
+    actual = [swe.calc_ut(jd, PLANETS[body], ChartContext.CALC_FLAGS)[0][0] for jd in instants]
+    error = _angle_diff(table.longitude(body, instants), actual).max()
+    assert error <= table.error_bound(body)
+
+
+@pytest.mark.parametrize("ayanamsa", list(AYANAMSAS))
+def test_ayanamsa_within_bound(table, instants, ayanamsa):
+    with SWE_LOCK:
+        swe.set_sid_mode(AYANAMSAS[ayanamsa][0])
+        actual = [swe.get_ayanamsa_ex_ut(jd, 0)[1] for jd in instants]
+    error = _angle_diff(table.ayanamsa(ayanamsa, instants), actual).max()
+    assert error <= table.error_bound(f"ayanamsa:{ayanamsa}")
+
+
+def test_speed_matches_swisseph(table, instants):
+    _prepare_thread()
+    jds = instants[:200]
+    actual = [swe.calc_ut(jd, PLANETS["Mars"], ChartContext.CALC_FLAGS)[0][3] for jd in jds]
+    assert np.abs(table.speed("Mars", jds) - actual).max() < 1e-4
+
+
+def test_outside_range_is_rejected(table):
+    with pytest.raises(ValueError):
+        table.longitude("Sun", [table.jd_end + 1.0])
@@ -0,0 +1,48 @@
+"""The ingress index and the yearly transit calendar share one event search."""
+import pytest
+
+import multi_system_calculator as calc
+from ingress_index import RASHI, SIGN, STATION, IngressIndex, build_index, find_events, swe
+
+YEAR = 2026
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("ingress") / "ingress.idx")
+    build_index(path, swe.julday(YEAR, 1, 1, 0.0), swe.julday(YEAR + 1, 1, 1, 0.0), "raman")
+    index = IngressIndex(path)
+    yield index
+    index.close()
+
+
+@pytest.fixture(scope="module")
+def calendar():
+    return calc.calculate_year_transits(YEAR, "raman")
+
+
+def _date(jd: float) -> str:
+    year, month, day, _ = swe.revjul(jd)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+@pytest.mark.parametrize("planet", ["Mercury", "Venus"])
+def test_retrograde_windows_match_index(index, calendar, planet):
+    jd_start, jd_end = index.jd_start, index.jd_end
+    stations = index.between(planet, STATION, jd_start, jd_end)
+    retrograde_starts = [_date(e["jd"]) for e in stations if e["value"]]
+    windows = calendar[f"{planet.lower()}_retrogrades"]
+    in_year = [w["start"] for w in windows if f"{YEAR}-01-01" <= w["start"]]
+    assert in_year == retrograde_starts
+
+
+def test_ingresses_match_index(index, calendar):
+    for entry in calendar["major_transits"]:
+        kind = RASHI if entry["zodiac"] == "sidereal" else SIGN
+        events = index.between(entry["planet"], kind, index.jd_start, index.jd_end)
+        assert entry["date"] in {_date(e["jd"]) for e in events}, entry["event"]
+
+
+def test_find_events_matches_built_index(index):
+    found = find_events("Mars", SIGN, index.jd_start, index.jd_end)
+    assert list(found["jd"]) == list(index.events("Mars", SIGN)["jd"])
@@ -0,0 +1,109 @@
+"""
+Place autocomplete: prefix and typo-tolerant matches over the gazetteer, and
+the pruned trigram search finding exactly what a full scan would.
+"""
+import random
+
+import pytest
+
+from src.location import place_suggest
+from src.location.gazetteer import Gazetteer, build_index
+from src.location.place_suggest import MIN_SIMILARITY, PlaceSuggestIndex, _trigrams, get_suggest_index
+
+SYLLABLES = ["ra", "ja", "pur", "na", "ga", "bad", "ko", "li", "ta", "ma", "vi", "sha", "kha", "pat", "nam", "dh"]
+
+
+@pytest.fixture(scope="module")
+def bundled():
+    index = get_suggest_index()
+    if index is None:
+        pytest.skip("bundled gazetteer unavailable")
+    return index
+
+
+@pytest.fixture(scope="module")
+def synthetic(tmp_path_factory):
+    rng = random.Random(8)
+    tmp = tmp_path_factory.mktemp("suggest")
+    rows = []
+    for gid in range(1, 3001):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))).capitalize()
+        alt = name[:-1] if rng.random() < 0.3 else ""
+        cols = [str(gid * 7), name, name, alt, "20.0", "80.0", "P", "", "IN", "", "02",
+                "", "", "", str(rng.randint(0, 10 ** 6)), "", "", "Asia/Kolkata", ""]
+        rows.append("\t".join(cols))
+    tsv = tmp / "places.tsv"
+    tsv.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    build_index(tsv, tmp / "places.idx")
+    gazetteer = Gazetteer(tmp / "places.idx")
+    yield gazetteer
+    gazetteer.close()
+
+
+@pytest.mark.parametrize(
+    "query,name",
+    [
+        ("visak", "Visakhapatnam"),
+        ("vishakapatnam", "Visakhapatnam"),  # typo
+        ("Vizag", "Visakhapatnam"),  # alternate name
+        ("hyderbad", "Hyderabad"),
+        ("dehli", "Delhi"),
+        ("bezwada", "Vijayawada"),
+        ("nagpur, mah", "Nagpur"),
+    ],
+)
+def test_suggest_finds_place(bundled, query, name):
+    assert bundled.suggest(query, limit=3, country_code="IN")[0]["name"] == name
+
+
+def test_place_ids_are_geonameids(bundled):
+    top = bundled.suggest("Visakhapatnam", limit=1)[0]
+    assert top["place_id"] == 1253102
+    assert bundled.place(1253102)["name"] == "Visakhapatnam"
+    assert bundled.place(1) is None
+
+
+def _full_scan(gazetteer, q):
+    grams = _trigrams(q)
+    best = {}
+    for key, rec in gazetteer.keys():
+        own = _trigrams(key)
+        shared = len(grams & own)
+        similarity = shared / (len(grams) + len(own) - shared)
+        if similarity >= MIN_SIMILARITY and similarity > best.get(rec, 0.0):
+            best[rec] = similarity
+    return best
+
+
+def test_pruned_fuzzy_search_matches_full_scan(synthetic, monkeypatch):
+    monkeypatch.setattr(place_suggest, "MAX_POSTINGS_PER_GRAM", 10 ** 9)
+    index = PlaceSuggestIndex(synthetic)
+    rng = random.Random(3)
+    for _ in range(200):
+        key, _ = synthetic.key(rng.randrange(synthetic.n_keys))
+        chars = list(key)
+        for _ in range(rng.randint(0, 3)):  # typos: drop, swap or replace a letter
+            i = rng.randrange(len(chars))
+            op = rng.random()
+            if op < 0.3 and len(chars) > 3:
+                del chars[i]
+            elif op < 0.6 and i + 1 < len(chars):
+                chars[i], chars[i + 1] = chars[i + 1], chars[i]
+            else:
+                chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        q = "".join(chars)
+        scores = {}
+        index._fuzzy_matches(q, scores)
+        expected = _full_scan(synthetic, q)
+        assert scores.keys() == expected.keys(), q
+        for rec, similarity in expected.items():
+            assert scores[rec] == pytest.approx(similarity)
+
+
+def test_postings_are_most_populous_first(synthetic):
+    # so a capped read of a common trigram keeps the biggest places
+    index = PlaceSuggestIndex(synthetic)
+    for gid in index._gram_ids.values():
+        entries = index._postings[index._gram_starts[gid]:index._gram_starts[gid + 1]]
+        pops = [synthetic.population(synthetic.key(index._key_positions[e])[1]) for e in entries]
+        assert pops == sorted(pops, reverse=True)
@@ -0,0 +1,56 @@
+"""
+The request deadline is told apart from timeouts raised inside the pipeline
+by which awaitable timed out, not by the exception's message.
+"""
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+
+from src import config
+from src.services import reading_service
+from src.services.worker_pool import WorkerPool
+
+
+@pytest.fixture(autouse=True)
+def short_deadline(monkeypatch):
+    monkeypatch.setattr(config, "REQUEST_TIMEOUT", 0.2)
+
+
+@pytest.mark.parametrize("exc", [TimeoutError(), TimeoutError("Chart job exceeded 5s.")])
+def test_pipeline_timeouts_pass_through(exc):
+    async def pipeline():
+        raise exc
+
+    with pytest.raises(TimeoutError) as raised:
+        asyncio.run(reading_service._with_deadline(pipeline()))
+    assert raised.value is exc
+
+
+def test_deadline_cancels_pipeline():
+    cancelled = []
+
+    async def pipeline():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError, match="0.2s deadline"):
+        asyncio.run(reading_service._with_deadline(pipeline()))
+    assert cancelled
+
+
+def test_pool_job_timeout_is_not_the_deadline():
+    # a chart job that never finishes times out well inside the deadline
+    pool = WorkerPool.__new__(WorkerPool)
+    pool.job_timeout = 0.05
+    pool.submit = lambda fn, *args: Future()
+
+    async def pipeline():
+        with reading_service._engine_errors():
+            return await pool.run_async(print)
+
+    with pytest.raises(TimeoutError, match="Chart job exceeded 0.05s"):
+        asyncio.run(reading_service._with_deadline(pipeline()))
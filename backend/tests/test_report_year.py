@@ -0,0 +1,38 @@
+"""Year-specific report text comes from the transit calendar, not from 2026."""
+import pytest
+
+import generate_combined_report as report
+import multi_system_calculator as calc
+
+
+def _report(year: int) -> str:
+    chart = calc.generate_full_report("Test", "1999-11-13", "16:20:00", 17.69, 83.22, 5.5, "Visakhapatnam", "raman", year)
+    return report.generate_full_report(chart)
+
+
+@pytest.fixture(scope="module")
+def calendar_2027():
+    return calc.get_year_transits(2027, "raman")
+
+
+def test_2027_has_no_2026_events(calendar_2027):
+    text = _report(2027)
+    assert not calendar_2027["venus_retrogrades"]
+    assert "Venus Rx" not in text
+    assert "Fire Horse" not in text
+    assert "Fire Goat" in text
+
+
+def test_month_table_follows_calendar(calendar_2027):
+    text = _report(2027)
+    for r in calendar_2027["mercury_retrogrades"]:
+        if r["start"].startswith("2027"):
+            assert f"Mercury Rx {report._short_date(r['start'])} - {report._short_date(r['end'])}" in text
+    for e in calendar_2027["eclipses"]:
+        assert f"{e['type']} Eclipse {report._short_date(e['date'])}" in text
+
+
+def test_2026_venus_retrograde_is_dated():
+    text = _report(2026)
+    venus = calc.get_year_transits(2026, "raman")["venus_retrogrades"][0]
+    assert f"Venus Rx ({report._short_date(venus['start'])} - {report._short_date(venus['end'])})" in text
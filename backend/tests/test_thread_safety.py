@@ -0,0 +1,71 @@
+"""
+Charts with different ayanamsas computed concurrently must match serial runs
+(SWE_LOCK / ChartContext in multi_system_calculator.py).
+"""
+import json
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import multi_system_calculator as calc
+
+THREADS = 16
+CHARTS = 120
+
+
+@pytest.fixture
+def fast_switching():
+    # switch threads as often as possible, so a set-then-read of the
+    # sidereal mode is interleaved with other threads' if it is unguarded
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _births(n: int):
+    rnd = random.Random(13)
+    ayanamsas = sorted(calc.AYANAMSAS)
+    return [
+        (
+            f"{rnd.randint(1950, 2020)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:00",
+            rnd.uniform(-40, 60),
+            rnd.uniform(-120, 150),
+            ayanamsas[i % len(ayanamsas)],
+        )
+        for i in range(n)
+    ]
+
+
+def _chart(birth) -> str:
+    date, time, lat, lon, ayanamsa = birth
+    chart = calc.generate_full_report("Test", date, time, lat, lon, 0.0, "", ayanamsa)
+    chart["meta"].pop("generated_at", None)
+    return json.dumps(chart, sort_keys=True)
+
+
+def test_mixed_ayanamsa_charts_match_serial(fast_switching):
+    births = _births(CHARTS)
+    serial = [_chart(b) for b in births]
+    for _ in range(2):
+        with ThreadPoolExecutor(THREADS) as pool:
+            concurrent = list(pool.map(_chart, births))
+        mismatched = [births[i] for i, (a, b) in enumerate(zip(serial, concurrent)) if a != b]
+        assert not mismatched
+
+
+def test_ayanamsa_values_match_serial(fast_switching):
+    jd = 2451496.0
+    ayanamsas = sorted(calc.AYANAMSAS)
+    expected = {a: calc.ChartContext(jd, 0.0, 0.0).ayanamsa(a) for a in ayanamsas}
+
+    def value(i: int):
+        a = ayanamsas[i % len(ayanamsas)]
+        return a, calc.ChartContext(jd, 0.0, 0.0).ayanamsa(a)
+
+    with ThreadPoolExecutor(THREADS * 2) as pool:
+        results = list(pool.map(value, range(20000)))
+    assert all(v == expected[a] for a, v in results)
@@ -0,0 +1,160 @@
+"""
+Offline timezone resolution: single-zone countries answer by country code,
+other points from the zone boundaries or the nearest gazetteer place, and
+points none of those can place are an error rather than a guess.
+"""
+import pytest
+
+from src.location import osm_resolver, timezones
+from src.location.osm_resolver import LocationResolveError
+from src.location.timezones import (
+    TimezoneGrid,
+    TimezoneResolveError,
+    get_boundary_finder,
+    get_timezone_grid,
+    read_zone_tab,
+    timezone_at,
+    utc_offset_hours,
+)
+
+pytestmark = pytest.mark.skipif(get_timezone_grid() is None, reason="no gazetteer or zone.tab")
+
+CITIES = [
+    # name, lat, lon, country, zone
+    ("Kathmandu", 27.7172, 85.3240, "NP", "Asia/Kathmandu"),
+    ("Dhaka", 23.8103, 90.4125, "BD", "Asia/Dhaka"),
+    ("London", 51.5074, -0.1278, "GB", "Europe/London"),
+    ("Visakhapatnam", 17.6868, 83.2185, "IN", "Asia/Kolkata"),
+    ("Tokyo", 35.6762, 139.6503, "JP", "Asia/Tokyo"),
+]
+
+
+@pytest.mark.parametrize("name,lat,lon,country,zone", CITIES)
+def test_city_zone_without_country(name, lat, lon, country, zone):
+    assert timezone_at(lat, lon) == zone
+
+
+@pytest.mark.parametrize("name,lat,lon,country,zone", CITIES)
+def test_city_zone_with_country(name, lat, lon, country, zone):
+    assert timezone_at(lat, lon, country) == zone
+    assert timezone_at(lat, lon, country.lower()) == zone
+
+
+# bar New York, none of these is a zone.tab reference point, and the nearest
+# reference point is in another zone for each of them
+US_CITIES = [
+    # name, lat, lon, zone
+    ("Dallas", 32.7767, -96.7970, "America/Chicago"),
+    ("Atlanta", 33.7490, -84.3880, "America/New_York"),
+    ("El Paso", 31.7619, -106.4850, "America/Denver"),
+    ("Amarillo", 35.2220, -101.8313, "America/Chicago"),
+    ("New York", 40.7128, -74.0060, "America/New_York"),
+]
+
+needs_boundaries = pytest.mark.skipif(get_boundary_finder() is None, reason="timezonefinder not installed")
+
+
+@pytest.fixture
+def no_boundaries(monkeypatch):
+    monkeypatch.setattr(timezones, "get_boundary_finder", lambda: None)
+
+
+@needs_boundaries
+@pytest.mark.parametrize("name,lat,lon,zone", US_CITIES)
+@pytest.mark.parametrize("country", [None, "US"])
+def test_multi_zone_country_from_boundaries(name, lat, lon, zone, country):
+    assert timezone_at(lat, lon, country) == zone
+
+
+@needs_boundaries
+def test_multi_zone_offsets():
+    assert utc_offset_hours(timezone_at(32.7767, -96.7970, "US"), "2020-07-01", "12:00") == -5.0
+    assert utc_offset_hours(timezone_at(33.7490, -84.3880, "US"), "1990-07-01", "12:00") == -4.0
+
+
+@pytest.mark.parametrize("name,lat,lon,zone", US_CITIES)
+@pytest.mark.parametrize("country", [None, "US"])
+def test_multi_zone_country_without_places_is_unresolved(no_boundaries, name, lat, lon, zone, country):
+    # the bundled gazetteer has no US places, and zone.tab reference points
+    # are never used for multi-zone countries
+    with pytest.raises(TimezoneResolveError):
+        timezone_at(lat, lon, country)
+
+
+def test_grid_uses_per_place_zones_for_multi_zone_country():
+    places = [
+        # GeoNames cities15000 rows: lat, lon, population, timezone, country
+        (32.78306, -96.80667, 1300092, "America/Chicago", "US"),
+        (32.72541, -97.32085, 918915, "America/Chicago", "US"),
+        (33.749, -84.38798, 498044, "America/New_York", "US"),
+        (31.75872, -106.48693, 678815, "America/Denver", "US"),
+        (32.31232, -106.77834, 111385, "America/Denver", "US"),
+        (35.222, -101.8313, 200393, "America/Chicago", "US"),
+    ]
+    grid = TimezoneGrid(
+        places, cell_deg=1.0, max_km=300.0, references=read_zone_tab(timezones._zone_tab_path())
+    )
+    assert grid.single_zone("US") is None
+    assert grid.single_zone("np") == "Asia/Kathmandu"
+    assert grid.zone_at(32.7357, -97.1081, "US") == "America/Chicago"  # Arlington, TX
+    assert grid.zone_at(31.8457, -106.5600, "US") == "America/Denver"  # north El Paso
+    assert grid.zone_at(34.0007, -84.1477) == "America/New_York"  # Duluth, GA
+    assert grid.zone_at(44.9778, -93.2650, "US") is None  # Minneapolis: no place nearby
+
+
+def test_border_town_uses_its_own_country():
+    # Birgunj, on the Nepal-India border
+    assert timezone_at(27.0104, 84.8821, "NP") == "Asia/Kathmandu"
+
+
+@pytest.mark.parametrize(
+    "lat,lon",
+    [
+        (0.0, -150.0),  # open Pacific
+        (-45.0, 80.0),  # southern Indian Ocean
+    ],
+)
+def test_points_at_sea_raise_instead_of_nautical_zone(lat, lon):
+    with pytest.raises(TimezoneResolveError):
+        timezone_at(lat, lon)
+
+
+def test_remote_land_point_without_boundaries_is_unresolved(no_boundaries):
+    with pytest.raises(TimezoneResolveError):
+        timezone_at(23.0, 12.0)  # central Sahara, no place within range
+
+
+def test_country_places_remote_land_point():
+    assert timezone_at(23.0, 12.0, "LY") == "Africa/Tripoli"
+
+
+def test_grid_country_check_beats_nearer_foreign_place():
+    grid = TimezoneGrid(
+        [
+            (27.00, 84.90, 100000, "Asia/Kolkata", "IN"),
+            (27.72, 85.32, 1000000, "Asia/Kathmandu", "NP"),
+        ],
+        cell_deg=1.0,
+        max_km=300.0,
+    )
+    assert grid.zone_at(27.01, 84.88) == "Asia/Kolkata"
+    assert grid.zone_at(27.01, 84.88, "NP") == "Asia/Kathmandu"
+    assert grid.nearby_zone(27.01, 84.88, "NP") == "Asia/Kathmandu"
+    assert grid.zone_at(10.0, 10.0) is None
+
+
+def test_nominatim_result_uses_address_country():
+    results = [{"lat": "27.0104", "lon": "84.8821", "address": {"country_code": "np"}}]
+    loc = osm_resolver._location_from_results("Birgunj", results)
+    assert loc["timezone_name"] == "Asia/Kathmandu"
+
+
+def test_nominatim_result_at_sea_is_a_resolve_error():
+    with pytest.raises(LocationResolveError):
+        osm_resolver._location_from_results("Nowhere", [{"lat": "0", "lon": "-150"}])
+
+
+def test_historical_offsets():
+    assert utc_offset_hours("Asia/Kolkata", "1943-06-01", "12:00") == 6.5
+    assert utc_offset_hours("Asia/Kathmandu", "1990-01-01", "12:00:00") == 5.75
+    assert utc_offset_hours("Europe/London", "2000-07-01", "12:00") == 1.0
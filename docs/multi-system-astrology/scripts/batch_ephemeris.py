@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Batch Ephemeris
+Positions for every planet over arrays of Julian days, as NumPy arrays.
+
+For research and batch jobs that need millions of positions: the ephemeris
+is still called once per planet per day, but signs, nakshatras and padas are
+computed with array arithmetic instead of building a dict per point.
+Results match multi_system_calculator (same flags, same ayanamsa handling):
+`speed` is the sidereal speed of the Vedic section, and `retrograde` comes
+from the tropical speed, as in the Western section, the compact chart and
+the station index. The two speeds differ by the ayanamsa rate, so within
+about a minute of a station their signs can disagree.
+"""
+
+import argparse
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    if __name__ == "__main__":
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    raise
+
+from multi_system_calculator import (
+    AYANAMSAS,
+    NAKSHATRAS,
+    PLANETS,
+    RASHIS_VEDIC,
+    SIGNS_WESTERN,
+    SWE_LOCK,
+    ChartContext,
+    _prepare_thread,
+    swe,
+)
+
+NAKSHATRA_SPAN = 360.0 / 27
+PADA_SPAN = NAKSHATRA_SPAN / 4
+
+# index -> name lookups; fancy-index with the integer arrays below
+NAKSHATRA_NAMES = np.array([n["name"] for n in NAKSHATRAS])
+RASHI_NAMES = np.array([r["name"] for r in RASHIS_VEDIC])
+SIGN_NAMES = np.array(SIGNS_WESTERN)
+
+# one row per Julian day, one column per body (PLANETS order, then Ketu)
+POSITION_DTYPE = np.dtype([
+    ("tropical", "f8"),
+    ("sidereal", "f8"),
+    ("latitude", "f8"),
+    ("speed", "f8"),       # sidereal, as in the Vedic section
+    ("retrograde", "?"),   # tropical, as in the Western section
+    ("sign", "u1"),        # tropical sign index 0-11
+    ("rashi", "u1"),       # sidereal sign index 0-11
+    ("nakshatra", "u1"),   # 0-26
+    ("pada", "u1"),        # 1-4
+])
+
+ASCENDANT_DTYPE = np.dtype([
+    ("tropical", "f8"),
+    ("sidereal", "f8"),
+    ("sign", "u1"),
+    ("rashi", "u1"),
+    ("nakshatra", "u1"),
+    ("pada", "u1"),
+])
+
+
+# =============================================================================
+# VECTORIZED SIGN / NAKSHATRA HELPERS
+# =============================================================================
+
+def nakshatras(longitude: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vectorized get_nakshatra: index (0-26), pada (1-4) and navamsa sign index."""
+    longitude = np.asarray(longitude, dtype="f8")
+    index = (np.floor(longitude / NAKSHATRA_SPAN) % 27).astype("u1")
+    pada = (np.floor(np.mod(longitude, NAKSHATRA_SPAN) / PADA_SPAN) + 1).astype("u1")
+    navamsa = ((index.astype("i4") * 4 + pada - 1) % 12).astype("u1")
+    return {"index": index, "pada": pada, "navamsa": navamsa}
+
+
+def rashis(longitude: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vectorized get_rashi: sign index (0-11) and degree within the sign."""
+    longitude = np.asarray(longitude, dtype="f8")
+    return {
+        "index": (np.floor(longitude / 30) % 12).astype("u1"),
+        "degree_in_sign": np.mod(longitude, 30),
+    }
+
+
+def western_signs(longitude: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vectorized get_western_sign: sign index (0-11) and degree within the sign."""
+    signs = rashis(longitude)
+    return {"index": signs["index"], "degree": signs["degree_in_sign"]}
+
+
+# =============================================================================
+# BATCH POSITIONS
+# =============================================================================
+
+def ayanamsa_series(jds: np.ndarray, ayanamsa: str = "raman") -> Dict[str, np.ndarray]:
+    """
+    Per Julian day: the reported ayanamsa (as in the chart JSON, used for the
+    ascendant), the mean value used for planets, and its daily rate.
+    """
+    jds = np.asarray(jds, dtype="f8")
+    reported = np.empty_like(jds)
+    mean = np.empty_like(jds)
+    ahead = np.empty_like(jds)
+    _prepare_thread()
+    with SWE_LOCK:
+        swe.set_sid_mode(AYANAMSAS.get(ayanamsa, AYANAMSAS["raman"])[0])
+        for i, jd in enumerate(jds):
+            reported[i] = swe.get_ayanamsa(jd)
+            mean[i] = swe.get_ayanamsa_ex_ut(jd, 0)[1]
+            ahead[i] = swe.get_ayanamsa_ex_ut(jd + 1, 0)[1]
+    return {"reported": reported, "mean": mean, "rate": ahead - mean}
+
+
+def _fill_derived(out: np.ndarray) -> None:
+    out["sign"] = rashis(out["tropical"])["index"]
+    out["rashi"] = rashis(out["sidereal"])["index"]
+    nak = nakshatras(out["sidereal"])
+    out["nakshatra"] = nak["index"]
+    out["pada"] = nak["pada"]
+
+
+def batch_positions(
+    jds: Sequence[float],
+    lat: Optional[Sequence[float]] = None,
+    lon: Optional[Sequence[float]] = None,
+    ayanamsa: str = "raman",
+) -> Dict[str, Any]:
+    """
+    Positions of every body in PLANETS (plus Ketu) for each Julian day (UT).
+
+    Returns {"bodies": names, "ayanamsa": per-day values, "positions":
+    POSITION_DTYPE array of shape (len(jds), len(bodies)), "ascendant":
+    ASCENDANT_DTYPE array of shape (len(jds),) or None}. The ascendant needs
+    lat and lon (scalars or arrays matching jds).
+    """
+    jds = np.atleast_1d(np.asarray(jds, dtype="f8"))
+    bodies = list(PLANETS) + ["Ketu"]
+    n = len(jds)
+
+    raw = np.empty((n, len(PLANETS), 3), dtype="f8")
+    planet_ids = list(PLANETS.values())
+    _prepare_thread()
+    # day-major: Swiss Ephemeris reuses per-date work (nutation, Earth) across planets
+    for i, jd in enumerate(jds):
+        for j, planet_id in enumerate(planet_ids):
+            pos = swe.calc_ut(jd, planet_id, ChartContext.CALC_FLAGS)[0]
+            raw[i, j] = pos[0], pos[1], pos[3]
+
+    ayan = ayanamsa_series(jds, ayanamsa)
+
+    out = np.zeros((n, len(bodies)), dtype=POSITION_DTYPE)
+    body = out[:, :len(PLANETS)]
+    body["tropical"] = np.mod(raw[:, :, 0], 360)
+    body["latitude"] = raw[:, :, 1]
+    body["sidereal"] = np.mod(raw[:, :, 0] - ayan["mean"][:, None], 360)
+    body["speed"] = raw[:, :, 2] - ayan["rate"][:, None]
+    body["retrograde"] = raw[:, :, 2] < 0
+
+    # Ketu: opposite Rahu, always retrograde
+    rahu = bodies.index("Rahu")
+    ketu = out[:, -1]
+    ketu["tropical"] = np.mod(out[:, rahu]["tropical"] + 180, 360)
+    ketu["sidereal"] = np.mod(out[:, rahu]["sidereal"] + 180, 360)
+    ketu["latitude"] = -out[:, rahu]["latitude"]
+    ketu["speed"] = out[:, rahu]["speed"]
+    ketu["retrograde"] = True
+
+    _fill_derived(out)
+
+    ascendant = None
+    if lat is not None and lon is not None:
+        lats = np.broadcast_to(np.asarray(lat, dtype="f8"), jds.shape)
+        lons = np.broadcast_to(np.asarray(lon, dtype="f8"), jds.shape)
+        asc = np.array([swe.houses(jd, la, lo, b'P')[1][0] for jd, la, lo in zip(jds, lats, lons)])
+        ascendant = np.zeros(n, dtype=ASCENDANT_DTYPE)
+        ascendant["tropical"] = asc
+        ascendant["sidereal"] = np.mod(asc - ayan["reported"], 360)
+        ascendant["sign"] = rashis(asc)["index"]
+        ascendant["rashi"] = rashis(ascendant["sidereal"])["index"]
+        nak = nakshatras(ascendant["sidereal"])
+        ascendant["nakshatra"] = nak["index"]
+        ascendant["pada"] = nak["pada"]
+
+    return {
+        "bodies": bodies,
+        "ayanamsa": ayan["reported"],
+        "positions": out,
+        "ascendant": ascendant,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch planetary positions over a date range")
+    parser.add_argument("--start", type=float, required=True, help="First Julian day (UT)")
+    parser.add_argument("--end", type=float, required=True, help="Last Julian day (UT, inclusive)")
+    parser.add_argument("--step", type=float, default=1.0, help="Step in days (default: 1)")
+    parser.add_argument("--lat", type=float, default=None, help="Latitude, for the ascendant")
+    parser.add_argument("--lon", type=float, default=None, help="Longitude, for the ascendant")
+    parser.add_argument("--ayanamsa", default="raman", choices=list(AYANAMSAS.keys()),
+                        help="Ayanamsa system (default: raman)")
+    parser.add_argument("--output", required=True, help="Output .npz file")
+
+    args = parser.parse_args()
+
+    jds = np.arange(args.start, args.end + args.step / 2, args.step)
+    result = batch_positions(jds, args.lat, args.lon, args.ayanamsa)
+    arrays = {"jd": jds, "bodies": np.array(result["bodies"]), "ayanamsa": result["ayanamsa"],
+              "positions": result["positions"]}
+    if result["ascendant"] is not None:
+        arrays["ascendant"] = result["ascendant"]
+    np.savez_compressed(args.output, **arrays)
+    print(f"{len(jds)} days x {len(result['bodies'])} bodies saved to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
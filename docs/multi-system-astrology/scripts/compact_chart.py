@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Compact Chart
+A birth chart as the numbers it is made of: per body the tropical and
+sidereal longitude, latitude, speed and retrograde flag, the ascendant, the
+ayanamsa, and the year's transit hits, in NumPy records (about 2 KB).
+
+The chart JSON repeats the nakshatra and rashi records and DMS strings for
+every point (about 16 KB). Those are table lookups and formatting, so
+CompactChart keeps only the numbers and builds the JSON in to_chart(), with
+the same helpers as the calculator: the output is identical. Sections that
+are the same for every chart (the transit calendar) are shared, not stored,
+and the dashas are worked out at expansion so their running periods are
+always current.
+
+Three serialized forms: the full chart JSON (the export format), the
+compact JSON (to_compact), and a versioned binary layout (to_bytes) that is
+the records' raw bytes behind a fixed header, for storage. read_chart() and
+write_chart() take any of them by name.
+"""
+
+import argparse
+import json
+import math
+import struct
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    if __name__ == "__main__":
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    raise
+
+from multi_system_calculator import (
+    AYANAMSAS,
+    DEFAULT_TRANSIT_YEAR,
+    OUTER_PLANETS,
+    PLANETS,
+    SIGNS_WESTERN,
+    ChartContext,
+    _jd_to_date,
+    _now_jd,
+    calculate_dasha,
+    calculate_julian_day,
+    get_chinese_zodiac,
+    get_year_transits,
+    ketu_longitude,
+    swe,
+    vedic_planet_entry,
+    vedic_point_entry,
+    western_planet_entry,
+    western_point_entry,
+)
+from eclipses import get_eclipse_table
+from transit_aspects import ASPECTS, TRANSIT_BODIES, _jd_to_time, year_transit_aspects
+
+COMPACT_VERSION = 1
+FORMATS = ("json", "compact", "binary")
+
+# binary layout, little-endian:
+#   header   magic, version, body count, hit count, transit year,
+#            ayanamsa value, ascendant tropical, ascendant sidereal, text length
+#   bodies   body count x BODY_DTYPE
+#   hits     hit count x HIT_DTYPE
+#   text     UTF-8 JSON [meta, ayanamsa key, errors, eclipse_hits]
+BINARY_MAGIC = b"AACH"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sBBHHdddI")
+
+BODY_NAMES = list(PLANETS)
+# natal points a transit or eclipse can hit: the bodies, then the ascendant
+POINT_NAMES = BODY_NAMES + ["Ascendant"]
+ASPECT_NAMES = list(ASPECTS)
+
+# one row per BODY_NAMES entry; sidereal, latitude and speed are NaN for
+# OUTER_PLANETS, everything is NaN for a body the ephemeris failed on
+BODY_DTYPE = np.dtype([
+    ("tropical", "<f8"),
+    ("sidereal", "<f8"),
+    ("latitude", "<f8"),
+    ("speed", "<f8"),       # sidereal, as in the Vedic section
+    ("retrograde", "?"),    # tropical, as in the Western section
+])
+
+# one row per transit_aspects hit; start/end are days (JD of 0h UT + 0.5), 0 if open
+HIT_DTYPE = np.dtype([
+    ("jd", "<f8"),
+    ("start", "<i4"),
+    ("end", "<i4"),
+    ("transit", "u1"),      # TRANSIT_BODIES index
+    ("aspect", "u1"),       # ASPECT_NAMES index
+    ("natal", "u1"),        # POINT_NAMES index
+    ("transit_sign", "u1"),
+    ("retrograde", "?"),
+    ("pass", "u1"),
+    ("passes", "u1"),
+])
+
+
+def _day(date: Optional[str]) -> int:
+    if date is None:
+        return 0
+    year, month, day = (int(x) for x in date.split("-"))
+    return int(swe.julday(year, month, day, 0.0) + 0.5)
+
+
+def _date(day: int) -> Optional[str]:
+    return _jd_to_date(day - 0.5) if day else None
+
+
+def _ayanamsa_key(name: str) -> str:
+    for key, (_, label) in AYANAMSAS.items():
+        if label == name:
+            return key
+    return "raman"
+
+
+class CompactChart:
+    """A chart's numbers; to_chart() gives the chart JSON."""
+
+    __slots__ = (
+        "meta", "ayanamsa", "ayanamsa_value", "bodies", "errors", "ascendant",
+        "transit_year", "eclipse_hits", "transit_aspects",
+    )
+
+    def __init__(
+        self,
+        meta: Dict[str, Any],
+        ayanamsa: str,
+        ayanamsa_value: float,
+        bodies: np.ndarray,
+        errors: Dict[str, str],
+        ascendant: np.ndarray,
+        transit_year: int,
+        eclipse_hits: List[Dict[str, Any]],
+        transit_aspects: np.ndarray,
+    ):
+        self.meta = meta
+        self.ayanamsa = ayanamsa
+        self.ayanamsa_value = ayanamsa_value
+        self.bodies = bodies
+        self.errors = errors
+        self.ascendant = ascendant  # [tropical, sidereal]
+        self.transit_year = transit_year
+        self.eclipse_hits = eclipse_hits  # rare and few; kept as they are
+        self.transit_aspects = transit_aspects
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the array data (the Python object overhead is a few hundred bytes more)."""
+        return self.bodies.nbytes + self.ascendant.nbytes + self.transit_aspects.nbytes
+
+    def points(self) -> Dict[str, float]:
+        """Tropical longitudes of the planets and ascendant, as eclipses/transits match them."""
+        points = {name: float(row["tropical"]) for name, row in zip(BODY_NAMES, self.bodies)
+                  if name not in self.errors}
+        points["Ascendant"] = float(self.ascendant[0])
+        return points
+
+    # -------------------------------------------------------------------------
+    # expansion
+    # -------------------------------------------------------------------------
+
+    def _vedic(self) -> Dict[str, Any]:
+        positions = {}
+        for name, row in zip(BODY_NAMES, self.bodies):
+            if name in OUTER_PLANETS:
+                continue
+            if name in self.errors:
+                positions[name.lower()] = {"error": self.errors[name]}
+                continue
+            positions[name.lower()] = vedic_planet_entry(
+                name, float(row["sidereal"]), float(row["latitude"]), float(row["speed"])
+            )
+        if "Rahu" not in self.errors:
+            ketu = ketu_longitude(positions["rahu"]["longitude"])
+            positions["ketu"] = vedic_point_entry(ketu, name="Ketu", retrograde=True)
+        return {
+            "ayanamsa": self.ayanamsa_value,
+            "ayanamsa_type": AYANAMSAS[self.ayanamsa][1],
+            "ascendant": vedic_point_entry(float(self.ascendant[1])),
+            "planets": positions,
+        }
+
+    def _western(self) -> Dict[str, Any]:
+        positions = {}
+        for name, row in zip(BODY_NAMES, self.bodies):
+            if name in self.errors:
+                positions[name.lower()] = {"error": self.errors[name]}
+                continue
+            positions[name.lower()] = western_planet_entry(name, float(row["tropical"]), bool(row["retrograde"]))
+        return {"ascendant": western_point_entry(float(self.ascendant[0])), "planets": positions}
+
+    def _transit_aspects(self) -> List[Dict[str, Any]]:
+        hits = []
+        for row in self.transit_aspects:
+            natal = POINT_NAMES[row["natal"]]
+            natal_lon = self.ascendant[0] if natal == "Ascendant" else self.bodies[row["natal"]]["tropical"]
+            jd = float(row["jd"])
+            hits.append({
+                "jd": jd,
+                "transit": TRANSIT_BODIES[row["transit"]],
+                "aspect": ASPECT_NAMES[row["aspect"]],
+                "natal": natal,
+                "natal_sign": SIGNS_WESTERN[int(natal_lon // 30) % 12],
+                "transit_sign": SIGNS_WESTERN[row["transit_sign"]],
+                "exact": _jd_to_date(jd),
+                "exact_time": _jd_to_time(jd),
+                "retrograde": bool(row["retrograde"]),
+                "start": _date(int(row["start"])),
+                "end": _date(int(row["end"])),
+                "pass": int(row["pass"]),
+                "passes": int(row["passes"]),
+            })
+        return hits
+
+    def to_chart(self, now_jd: Optional[float] = None) -> Dict[str, Any]:
+        """The chart JSON, as generate_full_report returns it; dashas run as of now_jd (default: now)."""
+        meta = self.meta
+        now_jd = _now_jd() if now_jd is None else now_jd
+        year, month, day = (int(x) for x in meta["birth_date"].split("-"))
+        vedic = self._vedic()
+        moon = vedic["planets"]["moon"]["longitude"]
+        jd, tz = meta["julian_day"], meta["timezone_offset"]
+        return {
+            "meta": dict(meta),
+            "vedic": vedic,
+            "western": self._western(),
+            "chinese": get_chinese_zodiac(year, month, day),
+            "vimshottari_dasha": calculate_dasha("vimshottari", moon, jd, tz, now_jd),
+            "yogini_dasha": calculate_dasha("yogini", moon, jd, tz, now_jd),
+            f"transits_{self.transit_year}": get_year_transits(self.transit_year, self.ayanamsa),
+            "eclipse_hits": self.eclipse_hits,
+            "transit_aspects": self._transit_aspects(),
+        }
+
+    # -------------------------------------------------------------------------
+    # compact JSON
+    # -------------------------------------------------------------------------
+
+    def to_compact(self) -> Dict[str, Any]:
+        """JSON-safe compact form: columns of numbers, no lookups or formatting."""
+        def column(array: np.ndarray, field: str) -> list:
+            values = array[field].tolist()
+            if array.dtype[field].kind == "f":
+                return [None if math.isnan(v) else v for v in values]
+            return values
+
+        return {
+            "format": "compact",
+            "version": COMPACT_VERSION,
+            "meta": self.meta,
+            "ayanamsa": self.ayanamsa,
+            "ayanamsa_value": self.ayanamsa_value,
+            "bodies": {field: column(self.bodies, field) for field in BODY_DTYPE.names},
+            "errors": self.errors,
+            "ascendant": self.ascendant.tolist(),
+            "transit_year": self.transit_year,
+            "eclipse_hits": self.eclipse_hits,
+            "transit_aspects": {field: column(self.transit_aspects, field) for field in HIT_DTYPE.names},
+        }
+
+    @classmethod
+    def from_compact(cls, data: Dict[str, Any]) -> "CompactChart":
+        if data.get("format") != "compact" or data.get("version") != COMPACT_VERSION:
+            raise ValueError(f"Not a version {COMPACT_VERSION} compact chart")
+
+        def records(columns: Dict[str, list], dtype: np.dtype) -> np.ndarray:
+            n = len(columns[dtype.names[0]])
+            out = np.zeros(n, dtype=dtype)
+            for field in dtype.names:
+                values = columns[field]
+                if dtype[field].kind == "f":
+                    values = [math.nan if v is None else v for v in values]
+                out[field] = values
+            return out
+
+        return cls(
+            meta=data["meta"],
+            ayanamsa=data["ayanamsa"],
+            ayanamsa_value=data["ayanamsa_value"],
+            bodies=records(data["bodies"], BODY_DTYPE),
+            errors=data["errors"],
+            ascendant=np.array(data["ascendant"], dtype="f8"),
+            transit_year=data["transit_year"],
+            eclipse_hits=data["eclipse_hits"],
+            transit_aspects=records(data["transit_aspects"], HIT_DTYPE),
+        )
+
+    # -------------------------------------------------------------------------
+    # binary
+    # -------------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Binary form (BINARY_VERSION layout)."""
+        text = json.dumps(
+            [self.meta, self.ayanamsa, self.errors, self.eclipse_hits],
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8")
+        header = _HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION, len(self.bodies), len(self.transit_aspects), self.transit_year,
+            self.ayanamsa_value, self.ascendant[0], self.ascendant[1], len(text),
+        )
+        return b"".join((header, self.bodies.tobytes(), self.transit_aspects.tobytes(), text))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactChart":
+        if len(data) < _HEADER.size or data[:4] != BINARY_MAGIC:
+            raise ValueError("Not a binary chart")
+        (_, version, n_bodies, n_hits, transit_year,
+         ayanamsa_value, asc_tropical, asc_sidereal, text_len) = _HEADER.unpack_from(data)
+        if version != BINARY_VERSION:
+            raise ValueError(f"Binary chart version {version} is not supported (expected {BINARY_VERSION})")
+        hits_at = _HEADER.size + n_bodies * BODY_DTYPE.itemsize
+        text_at = hits_at + n_hits * HIT_DTYPE.itemsize
+        if n_bodies != len(BODY_NAMES) or len(data) != text_at + text_len:
+            raise ValueError("Truncated or malformed binary chart")
+        meta, ayanamsa, errors, eclipse_hits = json.loads(data[text_at:].decode("utf-8"))
+        return cls(
+            meta=meta,
+            ayanamsa=ayanamsa,
+            ayanamsa_value=ayanamsa_value,
+            bodies=np.frombuffer(data, BODY_DTYPE, n_bodies, _HEADER.size).copy(),
+            errors=errors,
+            ascendant=np.array([asc_tropical, asc_sidereal]),
+            transit_year=transit_year,
+            eclipse_hits=eclipse_hits,
+            transit_aspects=np.frombuffer(data, HIT_DTYPE, n_hits, hits_at).copy(),
+        )
+
+    @classmethod
+    def from_chart(cls, chart: Dict[str, Any]) -> "CompactChart":
+        """Read a chart JSON back. Its transit calendar is not kept: to_chart() uses the shared one."""
+        meta = chart["meta"]
+        vedic, western = chart["vedic"], chart["western"]
+        ayanamsa = _ayanamsa_key(vedic["ayanamsa_type"])
+        transit_year = meta.get("transit_year", DEFAULT_TRANSIT_YEAR)
+
+        bodies = np.full(len(BODY_NAMES), np.nan, dtype=BODY_DTYPE)
+        bodies["retrograde"] = False
+        errors = {}
+        for i, name in enumerate(BODY_NAMES):
+            w = western["planets"][name.lower()]
+            if "error" in w:
+                errors[name] = w["error"]
+                continue
+            bodies[i]["tropical"] = w["longitude"]
+            bodies[i]["retrograde"] = w["retrograde"]
+            if name not in OUTER_PLANETS:
+                v = vedic["planets"][name.lower()]
+                bodies[i]["sidereal"] = v["longitude"]
+                bodies[i]["latitude"] = v["latitude"]
+                bodies[i]["speed"] = v["speed"]
+
+        return cls(
+            meta=dict(meta),
+            ayanamsa=ayanamsa,
+            ayanamsa_value=vedic["ayanamsa"],
+            bodies=bodies,
+            errors=errors,
+            ascendant=np.array([western["ascendant"]["longitude"], vedic["ascendant"]["longitude"]]),
+            transit_year=transit_year,
+            eclipse_hits=chart.get("eclipse_hits", []),
+            transit_aspects=_hit_records(chart.get("transit_aspects", [])),
+        )
+
+
+def _hit_records(hits: List[Dict[str, Any]]) -> np.ndarray:
+    """transit_aspects hits (transit_aspects.aspect_timeline) as HIT_DTYPE rows."""
+    records = np.zeros(len(hits), dtype=HIT_DTYPE)
+    for row, hit in zip(records, hits):
+        row["jd"] = hit["jd"]
+        row["start"] = _day(hit["start"])
+        row["end"] = _day(hit["end"])
+        row["transit"] = TRANSIT_BODIES.index(hit["transit"])
+        row["aspect"] = ASPECT_NAMES.index(hit["aspect"])
+        row["natal"] = POINT_NAMES.index(hit["natal"])
+        row["transit_sign"] = SIGNS_WESTERN.index(hit["transit_sign"])
+        row["retrograde"] = hit["retrograde"]
+        row["pass"] = hit["pass"]
+        row["passes"] = hit["passes"]
+    return records
+
+
+def read_chart(data: bytes) -> CompactChart:
+    """A chart in any of FORMATS, told apart by its first bytes."""
+    if data[:4] == BINARY_MAGIC:
+        return CompactChart.from_bytes(data)
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        raise ValueError("Not a chart: neither binary nor JSON")
+    if not isinstance(parsed, dict):
+        raise ValueError("Not a chart")
+    if parsed.get("format") == "compact":
+        return CompactChart.from_compact(parsed)
+    try:
+        return CompactChart.from_chart(parsed)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Not a chart: missing {e}")
+
+
+def write_chart(chart: CompactChart, fmt: str = "binary") -> bytes:
+    """A chart serialized in one of FORMATS; json is the full chart JSON."""
+    if fmt == "binary":
+        return chart.to_bytes()
+    if fmt == "compact":
+        return json.dumps(chart.to_compact(), ensure_ascii=False).encode("utf-8")
+    if fmt == "json":
+        return json.dumps(chart.to_chart(), indent=2, ensure_ascii=False).encode("utf-8")
+    raise ValueError(f"Unknown chart format: {fmt} (choose from {', '.join(FORMATS)})")
+
+
+def calculate_compact_chart(
+    name: str,
+    date_str: str,
+    time_str: str,
+    latitude: float,
+    longitude: float,
+    tz_offset: float,
+    place: str = "",
+    ayanamsa: str = "raman",
+    transit_year: int = DEFAULT_TRANSIT_YEAR,
+) -> CompactChart:
+    """The chart's numbers straight from the ephemeris; see generate_full_report."""
+    year, month, day = (int(x) for x in date_str.split("-"))
+    time_parts = [int(x) for x in time_str.split(":")]
+    hour = time_parts[0] + time_parts[1]/60 + (time_parts[2]/3600 if len(time_parts) > 2 else 0)
+    jd = calculate_julian_day(year, month, day, hour, tz_offset)
+    if ayanamsa not in AYANAMSAS:
+        ayanamsa = "raman"
+
+    ctx = ChartContext(jd, latitude, longitude)
+    bodies = np.full(len(BODY_NAMES), np.nan, dtype=BODY_DTYPE)
+    bodies["retrograde"] = False
+    errors = {}
+    for i, body in enumerate(BODY_NAMES):
+        pos = ctx.tropical[body]
+        if isinstance(pos, Exception):
+            errors[body] = str(pos)
+            continue
+        # the same values calculate_vedic_positions / calculate_western_positions report
+        bodies[i]["tropical"] = pos[0] % 360
+        bodies[i]["retrograde"] = pos[3] < 0
+        if body not in OUTER_PLANETS:
+            bodies[i]["sidereal"], bodies[i]["latitude"], bodies[i]["speed"] = ctx.sidereal(body, ayanamsa)
+    ascendant = np.array([ctx.ascendant(), ctx.ascendant(ayanamsa)])
+
+    chart = CompactChart(
+        meta={
+            "name": name,
+            "birth_date": date_str,
+            "birth_time": time_str,
+            "birth_place": place,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone_offset": tz_offset,
+            "julian_day": jd,
+            "transit_year": transit_year,
+            "generated_at": datetime.now().isoformat(),
+        },
+        ayanamsa=ayanamsa,
+        ayanamsa_value=ctx.ayanamsa(ayanamsa)[0],
+        bodies=bodies,
+        errors=errors,
+        ascendant=ascendant,
+        transit_year=transit_year,
+        eclipse_hits=[],
+        transit_aspects=np.zeros(0, dtype=HIT_DTYPE),
+    )
+    # which of the year's eclipses and slow transits hit this chart
+    points = chart.points()
+    chart.eclipse_hits = get_eclipse_table(transit_year).natal_hits(points)
+    chart.transit_aspects = _hit_records(year_transit_aspects(points, transit_year))
+    return chart
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a chart between the JSON, compact and binary formats")
+    parser.add_argument("chart", help="Chart from multi_system_calculator.py, in any --format")
+    parser.add_argument("--format", default="json", choices=FORMATS, help="Output format (default: json)")
+    parser.add_argument("--output", default="-", help="Output file (default: stdout)")
+
+    args = parser.parse_args()
+    with open(args.chart, "rb") as f:
+        try:
+            data = write_chart(read_chart(f.read()), args.format)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.output == "-":
+        sys.stdout.buffer.write(data + (b"" if args.format == "binary" else b"\n"))
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+        print(f"Chart saved to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Dasha Engine
+Planetary periods as a tree: mahadashas, each split into antardashas, each
+into pratyantardashas, and so on down to prana (five levels). Boundaries are
+Julian days (UT), so finding the period running on any date is a binary
+search per level.
+
+Sub-periods are only worked out when a node is opened: a frontend drilling
+into one antardasha costs nine divisions, not the 729 pratyantardashas of a
+full Vimshottari table. Vimshottari and Yogini dasha share the machinery;
+a system is just its lords, their years, and where the Moon's nakshatra
+starts the sequence.
+"""
+
+import argparse
+import json
+import sys
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from multi_system_calculator import (
+    DASHA_SEQUENCE,
+    DASHA_YEARS,
+    _jd_to_date,
+    get_nakshatra,
+    swe,
+)
+
+DASHA_YEAR_DAYS = 365.25
+LEVELS = ["mahadasha", "antardasha", "pratyantardasha", "sookshma", "prana"]
+
+# lords: (name, ruling planet, years) in sequence order. The Moon's nakshatra
+# (0-26) plus nakshatra_offset, modulo the number of lords, picks the first
+# mahadasha; `cycles` rounds of the sequence make up the top level.
+DASHA_SYSTEMS = {
+    "vimshottari": {
+        "name": "Vimshottari",
+        "lords": [(planet, planet, DASHA_YEARS[planet]) for planet in DASHA_SEQUENCE],
+        "nakshatra_offset": 0,
+        "cycles": 1,
+    },
+    "yogini": {
+        "name": "Yogini",
+        "lords": [
+            ("Mangala", "Moon", 1), ("Pingala", "Sun", 2), ("Dhanya", "Jupiter", 3),
+            ("Bhramari", "Mars", 4), ("Bhadrika", "Mercury", 5), ("Ulka", "Saturn", 6),
+            ("Siddha", "Venus", 7), ("Sankata", "Rahu", 8),
+        ],
+        # (nakshatra number + 3) mod 8, counted from Mangala = 1
+        "nakshatra_offset": 3,
+        "cycles": 4,  # 36-year rounds; four cover a lifetime
+    },
+}
+
+
+class DashaPeriod:
+    """One period of the tree. children() divides it on first call and keeps the result."""
+
+    __slots__ = ("tree", "lord", "level", "path", "start", "end", "_children", "_ends")
+
+    def __init__(self, tree: "DashaTree", lord: int, level: int, path: Tuple[int, ...], start: float, end: float):
+        self.tree = tree
+        self.lord = lord  # index into the system's lords
+        self.level = level
+        self.path = path
+        self.start = start
+        self.end = end
+        self._children: Optional[List["DashaPeriod"]] = None
+        self._ends: Optional[List[float]] = None
+
+    @property
+    def name(self) -> str:
+        return self.tree.lords[self.lord][0]
+
+    @property
+    def planet(self) -> str:
+        return self.tree.lords[self.lord][1]
+
+    def children(self) -> List["DashaPeriod"]:
+        """Sub-periods: every lord in sequence from this one, sharing the span by their years."""
+        if self._children is None:
+            if self.level + 1 >= len(LEVELS):
+                self._children, self._ends = [], []
+            else:
+                lords = self.tree.lords
+                span = self.end - self.start
+                children, start = [], self.start
+                for i in range(len(lords)):
+                    lord = (self.lord + i) % len(lords)
+                    end = start + span * lords[lord][2] / self.tree.total_years
+                    children.append(DashaPeriod(self.tree, lord, self.level + 1, self.path + (i,), start, end))
+                    start = end
+                children[-1].end = self.end  # no rounding drift at the parent's boundary
+                self._children = children
+                self._ends = [child.end for child in children]
+        return self._children
+
+    def child_at(self, jd: float) -> Optional["DashaPeriod"]:
+        children = self.children()
+        i = bisect_right(self._ends, jd)
+        return children[i] if i < len(children) and children[i].start <= jd else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON view. Dates are local to the birth place; the first period starts at birth."""
+        start = max(self.start, self.tree.birth_jd)
+        return {
+            "level": LEVELS[self.level],
+            "path": ".".join(str(i) for i in self.path),
+            "lord": self.name,
+            "planet": self.planet,
+            "years": round((self.end - start) / DASHA_YEAR_DAYS, 2),
+            "start": self.tree.date(start),
+            "end": self.tree.date(self.end),
+            "start_jd": start,
+            "end_jd": self.end,
+            "has_children": self.level + 1 < len(LEVELS),
+        }
+
+
+class DashaTree:
+    """
+    Periods of one system for one chart. The top level is built up front;
+    everything below is divided on demand. The first mahadasha begins before
+    birth (only its balance is lived); its true start is kept so that its
+    sub-periods fall where the tradition puts them.
+    """
+
+    def __init__(self, system: str, moon_longitude: float, birth_jd: float, tz_offset: float = 0.0):
+        if system not in DASHA_SYSTEMS:
+            raise ValueError(f"Unknown dasha system: {system} (choose from {', '.join(DASHA_SYSTEMS)})")
+        spec = DASHA_SYSTEMS[system]
+        self.system = system
+        self.lords = spec["lords"]
+        self.total_years = sum(years for _, _, years in self.lords)
+        self.birth_jd = birth_jd
+        self.tz_offset = tz_offset
+        self.nakshatra = get_nakshatra(moon_longitude)
+
+        # the Moon's progress through its nakshatra is the part of the first period already spent
+        nakshatra_span = 360.0 / 27
+        elapsed_fraction = (moon_longitude % nakshatra_span) / nakshatra_span
+        first = (self.nakshatra["index"] - 1 + spec["nakshatra_offset"]) % len(self.lords)
+
+        periods = []
+        start = birth_jd - elapsed_fraction * self.lords[first][2] * DASHA_YEAR_DAYS
+        for i in range(spec["cycles"] * len(self.lords)):
+            lord = (first + i) % len(self.lords)
+            end = start + self.lords[lord][2] * DASHA_YEAR_DAYS
+            periods.append(DashaPeriod(self, lord, 0, (i,), start, end))
+            start = end
+        self.periods = periods
+        self._ends = [p.end for p in periods]
+
+    def date(self, jd: float) -> str:
+        return _jd_to_date(jd, self.tz_offset)
+
+    def jd(self, date: str) -> float:
+        """Julian day of local noon on a YYYY-MM-DD date at the birth place."""
+        try:
+            d = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"Invalid date: {date!r} (expected YYYY-MM-DD)")
+        return swe.julday(d.year, d.month, d.day, 12.0 - self.tz_offset)
+
+    def at(self, jd: float, depth: int = 3) -> List[DashaPeriod]:
+        """The running period at each level, mahadasha first, down to `depth` levels."""
+        i = bisect_right(self._ends, jd)
+        if i >= len(self.periods) or jd < max(self.periods[0].start, self.birth_jd):
+            return []
+        path = [self.periods[i]]
+        while len(path) < min(depth, len(LEVELS)):
+            child = path[-1].child_at(jd)
+            if child is None:
+                break
+            path.append(child)
+        return path
+
+    def node(self, path: Sequence[int]) -> DashaPeriod:
+        """Period at an index path, e.g. (3, 2): the third antardasha of the fourth mahadasha."""
+        if not path:
+            raise ValueError("Empty dasha path")
+        level = self.periods
+        node = None
+        for i in path:
+            if not 0 <= i < len(level):
+                raise ValueError(f"No dasha period at path {'.'.join(str(p) for p in path)}")
+            node = level[i]
+            level = node.children()
+        return node
+
+    def summary(self, jd: float, depth: int = 3) -> Dict[str, Any]:
+        """The chart JSON section: the top level, and the running periods on `jd`."""
+        current = self.at(jd, depth)
+        return {
+            "system": self.system,
+            "starting_dasha": self.periods[0].name,
+            "moon_nakshatra": self.nakshatra["name"],
+            "current_dasha": current[0].name if current else None,
+            "current_path": [p.to_dict() for p in current],
+            "periods": [p.to_dict() for p in self.periods],
+        }
+
+
+def parse_path(path: Optional[str]) -> Tuple[int, ...]:
+    """'3.2' -> (3, 2); empty or None -> ()."""
+    if not path:
+        return ()
+    try:
+        return tuple(int(part) for part in path.split("."))
+    except ValueError:
+        raise ValueError(f"Invalid dasha path: {path!r} (expected indices like 3.2)")
+
+
+def tree_from_chart(chart: Dict[str, Any], system: str = "vimshottari") -> DashaTree:
+    """Dasha tree for a chart JSON from multi_system_calculator.py."""
+    meta = chart["meta"]
+    moon = chart["vedic"]["planets"]["moon"]["longitude"]
+    return DashaTree(system, moon, meta["julian_day"], meta.get("timezone_offset", 0.0))
+
+
+def expand(tree: DashaTree, path: Sequence[int] = ()) -> Dict[str, Any]:
+    """One drill-down step: the period at `path` (the top level if empty) and its sub-periods."""
+    if not path:
+        return {"system": tree.system, "period": None, "children": [p.to_dict() for p in tree.periods]}
+    node = tree.node(path)
+    children = [c for c in node.children() if c.end > tree.birth_jd]
+    return {"system": tree.system, "period": node.to_dict(), "children": [c.to_dict() for c in children]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dasha periods for a chart, one level at a time")
+    parser.add_argument("chart", help="Chart JSON from multi_system_calculator.py")
+    parser.add_argument("--system", default="vimshottari", choices=list(DASHA_SYSTEMS.keys()),
+                        help="Dasha system (default: vimshottari)")
+    parser.add_argument("--path", default="", help="Period to open, as indices (e.g. 3.2); default: top level")
+    parser.add_argument("--date", default=None,
+                        help="Show the running periods on this date (YYYY-MM-DD) instead")
+    parser.add_argument("--depth", type=int, default=3, help="Levels for --date (default: 3)")
+
+    args = parser.parse_args()
+
+    with open(args.chart, "r", encoding="utf-8") as f:
+        tree = tree_from_chart(json.load(f), args.system)
+    try:
+        if args.date:
+            result = {"system": tree.system, "date": args.date,
+                      "current_path": [p.to_dict() for p in tree.at(tree.jd(args.date), args.depth)]}
+        else:
+            result = expand(tree, parse_path(args.path))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Eclipse Finder
+Every solar and lunar eclipse of a year, from the Swiss Ephemeris eclipse
+search, with the eclipse point's sign, degree, rashi and nakshatra, and the
+natal points each one falls on.
+
+The year table is the same for everyone, so it is searched once per year,
+kept in memory and, if a cache directory is set, written to
+<dir>/eclipses_<year>.json for other processes and later runs. Matching a
+chart against it is one vectorized distance computation over
+(eclipses x natal points); no per-chart search.
+
+The eclipse point is the Sun's longitude at maximum for a solar eclipse and
+the Moon's for a lunar one. Sidereal longitudes for every ayanamsa are
+stored, so one table serves all of them.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    if __name__ == "__main__":
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    raise
+
+from multi_system_calculator import (
+    AYANAMSAS,
+    SWE_LOCK,
+    ChartContext,
+    _jd_to_date,
+    _prepare_thread,
+    degrees_to_dms,
+    get_nakshatra,
+    get_rashi,
+    get_western_sign,
+    swe,
+)
+
+TABLE_VERSION = 1
+
+# degrees; an eclipse this close to a natal point (or its opposite) "hits" it
+ECLIPSE_ORB = 3.0
+ASPECTS = {"conjunction": 0.0, "opposition": 180.0}
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+def _solar_type(flags: int) -> str:
+    if flags & swe.ECL_ANNULAR_TOTAL:
+        return "Hybrid Solar"
+    if flags & swe.ECL_TOTAL:
+        return "Total Solar"
+    if flags & swe.ECL_ANNULAR:
+        return "Annular Solar"
+    return "Partial Solar"
+
+
+def _lunar_type(flags: int) -> str:
+    if flags & swe.ECL_TOTAL:
+        return "Total Lunar"
+    if flags & swe.ECL_PARTIAL:
+        return "Partial Lunar"
+    return "Penumbral Lunar"
+
+
+def search_eclipses(year: int) -> List[Dict[str, Any]]:
+    """
+    Raw table rows for every eclipse with its maximum in the year (UT):
+    jd, kind, type, tropical longitude, and sidereal longitude per ayanamsa.
+    """
+    _prepare_thread()
+    jd_start = swe.julday(year, 1, 1, 0.0)
+    jd_end = swe.julday(year + 1, 1, 1, 0.0)
+
+    rows = []
+    for kind, when, body, describe in (
+        ("solar", swe.sol_eclipse_when_glob, swe.SUN, _solar_type),
+        ("lunar", swe.lun_eclipse_when, swe.MOON, _lunar_type),
+    ):
+        jd = jd_start
+        while True:
+            flags, times = when(jd, ChartContext.CALC_FLAGS)
+            maximum = times[0]
+            if maximum >= jd_end:
+                break
+            longitude = swe.calc_ut(maximum, body, ChartContext.CALC_FLAGS)[0][0] % 360.0
+            sidereal = {}
+            with SWE_LOCK:
+                for key, (sid_mode, _) in AYANAMSAS.items():
+                    swe.set_sid_mode(sid_mode)
+                    sidereal[key] = (longitude - swe.get_ayanamsa_ex_ut(maximum, 0)[1]) % 360.0
+            rows.append({
+                "jd": maximum,
+                "kind": kind,
+                "type": describe(flags),
+                "longitude": longitude,
+                "sidereal": sidereal,
+            })
+            jd = maximum + 1
+    rows.sort(key=lambda row: row["jd"])
+    return rows
+
+
+# =============================================================================
+# YEAR TABLE
+# =============================================================================
+
+class EclipseTable:
+    """One year's eclipses, as rows and as arrays for the natal comparison."""
+
+    def __init__(self, year: int, rows: List[Dict[str, Any]]):
+        self.year = year
+        self.rows = rows
+        self.jd = np.array([row["jd"] for row in rows], dtype="f8")
+        self.longitude = np.array([row["longitude"] for row in rows], dtype="f8")
+
+    def entries(self, ayanamsa: str = "raman") -> List[Dict[str, Any]]:
+        """Transit-calendar entries: date, type, sign and degree, rashi and nakshatra."""
+        entries = []
+        for row in self.rows:
+            sign = get_western_sign(row["longitude"])
+            sidereal = row["sidereal"].get(ayanamsa, row["sidereal"]["raman"])
+            nakshatra = get_nakshatra(sidereal)
+            entries.append({
+                "date": _jd_to_date(row["jd"]),
+                "type": row["type"],
+                "kind": row["kind"],
+                "sign": sign["sign"],
+                "degree": sign["degree"],
+                "degree_dms": sign["degree_dms"],
+                "rashi": get_rashi(sidereal)["english"],
+                "nakshatra": nakshatra["name"],
+                "pada": nakshatra["pada"],
+            })
+        return entries
+
+    def natal_hits(self, points: Dict[str, float], orb: float = ECLIPSE_ORB) -> List[Dict[str, Any]]:
+        """
+        Eclipses within `orb` degrees of a natal point or its opposite.
+        `points` maps point name -> tropical longitude.
+        """
+        if not len(self.rows) or not points:
+            return []
+        names = list(points)
+        natal = np.array([points[name] for name in names], dtype="f8")
+
+        # (eclipses, points) separation folded into 0-180
+        separation = np.abs((self.longitude[:, None] - natal[None, :] + 180.0) % 360.0 - 180.0)
+        hits = []
+        for aspect, angle in ASPECTS.items():
+            off = np.abs(separation - angle)
+            for e, p in zip(*np.nonzero(off <= orb)):
+                row = self.rows[e]
+                hits.append({
+                    "date": _jd_to_date(row["jd"]),
+                    "type": row["type"],
+                    "sign": get_western_sign(row["longitude"])["sign"],
+                    "point": names[p],
+                    "point_sign": get_western_sign(natal[p])["sign"],
+                    "aspect": aspect,
+                    "orb": float(off[e, p]),
+                    "orb_dms": degrees_to_dms(float(off[e, p])),
+                })
+        hits.sort(key=lambda hit: (hit["date"], hit["orb"]))
+        return hits
+
+
+_cache_dir: Optional[str] = None
+_tables: Dict[int, EclipseTable] = {}
+_tables_lock = threading.Lock()
+
+
+def set_cache_dir(path: Optional[str]) -> None:
+    """Directory for the per-year eclipse tables; None keeps them in memory only."""
+    global _cache_dir
+    _cache_dir = path or None
+
+
+def _cache_path(year: int) -> Optional[str]:
+    if _cache_dir is None:
+        return None
+    return os.path.join(_cache_dir, f"eclipses_{year}.json")
+
+
+def _read_cached(year: int) -> Optional[List[Dict[str, Any]]]:
+    path = _cache_path(year)
+    if path is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if stored.get("version") != TABLE_VERSION or set(stored.get("ayanamsas", [])) != set(AYANAMSAS):
+        return None
+    return stored["eclipses"]
+
+
+def _write_cached(year: int, rows: List[Dict[str, Any]]) -> None:
+    path = _cache_path(year)
+    if path is None:
+        return
+    stored = {"version": TABLE_VERSION, "year": year, "ayanamsas": list(AYANAMSAS), "eclipses": rows}
+    try:
+        os.makedirs(_cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(stored, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # the table is in memory; the disk copy only saves the next process a search
+
+
+def get_eclipse_table(year: int) -> EclipseTable:
+    """Shared table for a year: from memory, else the cache directory, else a search."""
+    table = _tables.get(year)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(year)
+            if table is None:
+                rows = _read_cached(year)
+                if rows is None:
+                    rows = search_eclipses(year)
+                    _write_cached(year, rows)
+                table = _tables[year] = EclipseTable(year, rows)
+    return table
+
+
+def natal_points(western: Dict[str, Any]) -> Dict[str, float]:
+    """Tropical longitudes of the chart's planets and ascendant, by display name."""
+    points = {}
+    for planet in western["planets"].values():
+        if "longitude" in planet:
+            points[planet["name"]] = planet["longitude"]
+    points["Ascendant"] = western["ascendant"]["longitude"]
+    return points
+
+
+def natal_eclipse_hits(western: Dict[str, Any], year: int, orb: float = ECLIPSE_ORB) -> List[Dict[str, Any]]:
+    """The year's eclipses that fall on a natal point of a Western chart."""
+    return get_eclipse_table(year).natal_hits(natal_points(western), orb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solar and lunar eclipses for a year")
+    parser.add_argument("year", type=int, help="Year")
+    parser.add_argument("--ayanamsa", default="raman", choices=list(AYANAMSAS.keys()),
+                        help="Ayanamsa for rashi/nakshatra (default: raman)")
+    parser.add_argument("--chart", default=None,
+                        help="Chart JSON from multi_system_calculator.py; adds its natal hits")
+    parser.add_argument("--orb", type=float, default=ECLIPSE_ORB,
+                        help=f"Orb in degrees for natal hits (default: {ECLIPSE_ORB})")
+    parser.add_argument("--cache-dir", default=None, help="Directory for cached year tables")
+
+    args = parser.parse_args()
+    set_cache_dir(args.cache_dir)
+
+    table = get_eclipse_table(args.year)
+    result: Dict[str, Any] = {"year": args.year, "eclipses": table.entries(args.ayanamsa)}
+    if args.chart:
+        with open(args.chart, "r", encoding="utf-8") as f:
+            chart = json.load(f)
+        result["natal_hits"] = table.natal_hits(natal_points(chart["western"]), args.orb)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Precomputed Ephemeris Table
+Chebyshev coefficients for every body in PLANETS (tropical longitude) and
+the mean value of every ayanamsa, over a fixed Julian day range, in one
+binary file that is memory-mapped at lookup time.
+
+Used for scans over many instants (transits, calendars, screening) where a
+Swiss Ephemeris call per instant is too slow. Each series is split into
+equal segments; within a segment the longitude (unwrapped) is interpolated
+at Chebyshev nodes. Evaluation is a vectorized Clenshaw sum, and speeds come
+from the derivative of the same polynomial.
+
+Error bound: the build compares every segment with swisseph at
+CHECKS_PER_DAY evenly spaced instants (segment ends included), takes the
+worst difference per series and stores it times BOUND_SAFETY, plus
+BOUND_FLOOR, in the file (`max_error`, degrees). That is the documented
+bound: lookups are within it of swisseph, which the tests check at random
+instants (check_table() does the same for a built file). The fit itself is
+good to ~1e-8 degrees; what is left is the smoothness of the source. With
+Swiss Ephemeris data files (.se1) the bound is ~1e-7 degrees. With the
+built-in Moshier fallback, whose Mercury/Venus/Uranus/Neptune output steps
+by up to ~4e-4 degrees at day boundaries, it is ~1e-3 degrees (under 4
+arcsec, inside Moshier's own accuracy). Either way it is far below what
+sign, nakshatra or aspect timing can resolve.
+
+File layout (little-endian):
+
+    header   MAGIC, n_series, jd_start, jd_end
+    series   n_series x SERIES  (name, segment days, n_coef, n_segments,
+                                 data offset, max error)
+    data     per series: n_segments x n_coef float64 coefficients
+
+Build:
+
+    python3 ephemeris_table.py build --start-year 1900 --end-year 2100 --output ephemeris.tbl
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    if __name__ == "__main__":
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    raise
+
+from multi_system_calculator import AYANAMSAS, PLANETS, SWE_LOCK, ChartContext, _prepare_thread, swe
+
+MAGIC = b"ASTROEP1"
+HEADER = struct.Struct("<8sIdd")
+# name, segment length (days), coefficients per segment, segments, data offset, max error (deg)
+SERIES = struct.Struct("<24sdIIQd")
+
+# coefficients per segment (polynomial degree + 1)
+N_COEF = 14
+
+# segment length in days per body. Longer segments lose the short-period
+# nutation/aberration terms (~14 days) that true positions include.
+SEGMENT_DAYS = {
+    "Sun": 16.0, "Moon": 8.0, "Mercury": 8.0, "Venus": 8.0, "Mars": 16.0,
+    "Jupiter": 16.0, "Saturn": 16.0, "Uranus": 16.0, "Neptune": 16.0,
+    "Pluto": 16.0, "Rahu": 16.0,
+}
+AYANAMSA_SEGMENT_DAYS = 16.0
+
+# the stored bound: worst error measured at CHECKS_PER_DAY instants a day,
+# times BOUND_SAFETY for the instants in between, plus BOUND_FLOOR for
+# rounding in evaluation
+CHECKS_PER_DAY = 8
+BOUND_SAFETY = 2.0
+BOUND_FLOOR = 1e-7
+
+
+def _check_points(seg_days: float) -> np.ndarray:
+    """Instants (in [-1, 1]) where a segment is compared with swisseph."""
+    return np.linspace(-1.0, 1.0, int(seg_days * CHECKS_PER_DAY) + 1)
+
+
+def ayanamsa_series_name(ayanamsa: str) -> str:
+    return f"ayanamsa:{ayanamsa}"
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def _planet_longitudes(planet_id: int) -> "callable":
+    def sample(jds: np.ndarray) -> np.ndarray:
+        return np.array([swe.calc_ut(jd, planet_id, ChartContext.CALC_FLAGS)[0][0] for jd in jds])
+    return sample
+
+
+def _ayanamsa_values(ayanamsa: str) -> "callable":
+    mode = AYANAMSAS[ayanamsa][0]
+
+    def sample(jds: np.ndarray) -> np.ndarray:
+        with SWE_LOCK:
+            swe.set_sid_mode(mode)
+            return np.array([swe.get_ayanamsa_ex_ut(jd, 0)[1] for jd in jds])
+    return sample
+
+
+def _angle_diff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.abs((a - b + 180.0) % 360.0 - 180.0)
+
+
+def _fit_series(sample, jd_start: float, n_segments: int, seg_days: float) -> Tuple[np.ndarray, float]:
+    nodes = np.cos(np.pi * (np.arange(N_COEF) + 0.5) / N_COEF)  # Chebyshev nodes, first kind
+    coeffs = np.empty((n_segments, N_COEF))
+    check_points = _check_points(seg_days)
+    max_error = 0.0
+    for k in range(n_segments):
+        seg_start = jd_start + k * seg_days
+        to_jd = lambda x: seg_start + (x + 1.0) * seg_days / 2.0
+        values = np.degrees(np.unwrap(np.radians(sample(to_jd(nodes)))))
+        coeffs[k] = np.polynomial.chebyshev.chebfit(nodes, values, N_COEF - 1)
+
+        fitted = np.polynomial.chebyshev.chebval(check_points, coeffs[k])
+        actual = sample(to_jd(check_points))
+        max_error = max(max_error, float(_angle_diff(fitted, actual).max()))
+    return coeffs, max_error * BOUND_SAFETY + BOUND_FLOOR
+
+
+def build_table(out_path: str, jd_start: float, jd_end: float, progress=None) -> Dict[str, float]:
+    """
+    Fits every body and ayanamsa over [jd_start, jd_end] and writes the table.
+    Returns the error bound (degrees) stored per series.
+    """
+    _prepare_thread()
+    series = [(name, _planet_longitudes(pid), SEGMENT_DAYS[name]) for name, pid in PLANETS.items()]
+    series += [
+        (ayanamsa_series_name(key), _ayanamsa_values(key), AYANAMSA_SEGMENT_DAYS)
+        for key in AYANAMSAS
+    ]
+
+    fitted = []
+    for name, sample, seg_days in series:
+        n_segments = int(np.ceil((jd_end - jd_start) / seg_days))
+        coeffs, max_error = _fit_series(sample, jd_start, n_segments, seg_days)
+        fitted.append((name, seg_days, coeffs, max_error))
+        if progress:
+            progress(name, max_error)
+
+    offset = HEADER.size + len(fitted) * SERIES.size
+    out = bytearray(HEADER.pack(MAGIC, len(fitted), jd_start, jd_end))
+    for name, seg_days, coeffs, max_error in fitted:
+        out += SERIES.pack(name.encode("ascii"), seg_days, N_COEF, len(coeffs), offset, max_error)
+        offset += coeffs.nbytes
+    for _, _, coeffs, _ in fitted:
+        out += coeffs.astype("<f8").tobytes()
+
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, out_path)
+    return {name: max_error for name, _, _, max_error in fitted}
+
+
+# =============================================================================
+# LOOKUP
+# =============================================================================
+
+class EphemerisTable:
+    """
+    Read-only view over a built table. The file is memory-mapped, so worker
+    processes mapping the same file share its pages.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n_series, self.jd_start, self.jd_end = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an ephemeris table.")
+
+        self._series: Dict[str, Tuple[float, np.ndarray, float]] = {}
+        for i in range(n_series):
+            raw_name, seg_days, n_coef, n_segments, offset, max_error = SERIES.unpack_from(
+                self._mm, HEADER.size + i * SERIES.size
+            )
+            coeffs = np.frombuffer(self._mm, dtype="<f8", count=n_segments * n_coef, offset=offset)
+            name = raw_name.rstrip(b"\0").decode("ascii")
+            self._series[name] = (seg_days, coeffs.reshape(n_segments, n_coef), max_error)
+
+    @property
+    def bodies(self) -> Iterable[str]:
+        return [name for name in self._series if not name.startswith("ayanamsa:")]
+
+    def error_bound(self, name: str) -> float:
+        """Bound on the difference from swisseph, in degrees (see module docstring)."""
+        return self._series[name][2]
+
+    def _segments(self, name: str, jds: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+        if name not in self._series:
+            raise KeyError(f"No series {name!r} in {self.path}.")
+        if jds.size and (jds.min() < self.jd_start or jds.max() > self.jd_end):
+            raise ValueError(
+                f"Julian day outside the table range {self.jd_start}-{self.jd_end}."
+            )
+        seg_days, coeffs, _ = self._series[name]
+        idx = np.minimum(((jds - self.jd_start) // seg_days).astype(np.int64), len(coeffs) - 1)
+        x = 2.0 * (jds - self.jd_start - idx * seg_days) / seg_days - 1.0
+        return coeffs[idx], x, seg_days
+
+    @staticmethod
+    def _clenshaw(c: np.ndarray, x: np.ndarray) -> np.ndarray:
+        b1 = np.zeros_like(x)
+        b2 = np.zeros_like(x)
+        for k in range(c.shape[1] - 1, 0, -1):
+            b1, b2 = 2.0 * x * b1 - b2 + c[:, k], b1
+        return x * b1 - b2 + c[:, 0]
+
+    def _value(self, name: str, jds) -> np.ndarray:
+        jds = np.atleast_1d(np.asarray(jds, dtype="f8"))
+        c, x, _ = self._segments(name, jds)
+        return self._clenshaw(c, x)
+
+    def longitude(self, body: str, jds) -> np.ndarray:
+        """Tropical longitude (0-360) of a body at each Julian day (UT)."""
+        return np.mod(self._value(body, jds), 360.0)
+
+    def speed(self, body: str, jds) -> np.ndarray:
+        """Longitude speed in degrees/day (negative when retrograde)."""
+        jds = np.atleast_1d(np.asarray(jds, dtype="f8"))
+        c, x, seg_days = self._segments(body, jds)
+        # derivative coefficients, row-wise
+        d = np.polynomial.chebyshev.chebder(c.T).T
+        return self._clenshaw(d, x) * 2.0 / seg_days
+
+    def ayanamsa(self, ayanamsa: str, jds) -> np.ndarray:
+        """Mean ayanamsa (the value sidereal planet positions use)."""
+        return self._value(ayanamsa_series_name(ayanamsa), jds)
+
+    def sidereal_longitude(self, body: str, jds, ayanamsa: str = "raman") -> np.ndarray:
+        return np.mod(self._value(body, jds) - self.ayanamsa(ayanamsa, jds), 360.0)
+
+    def close(self) -> None:
+        self._series.clear()
+        self._mm.close()
+
+
+_tables: Dict[str, EphemerisTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_table(path: str) -> Optional[EphemerisTable]:
+    """Shared table for a path, opened on first use. None if it doesn't exist."""
+    table = _tables.get(path)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(path)
+            if table is None:
+                if not os.path.exists(path):
+                    return None
+                table = _tables[path] = EphemerisTable(path)
+    return table
+
+
+def check_table(table: EphemerisTable, samples: int = 2000, seed: int = 0) -> Dict[str, float]:
+    """Max difference (degrees) from swisseph per series, at random instants."""
+    _prepare_thread()
+    rng = np.random.default_rng(seed)
+    jds = rng.uniform(table.jd_start, table.jd_end, samples)
+    errors = {}
+    for body in table.bodies:
+        actual = np.array([swe.calc_ut(jd, PLANETS[body], ChartContext.CALC_FLAGS)[0][0] for jd in jds])
+        errors[body] = float(_angle_diff(table.longitude(body, jds), actual).max())
+    for key in AYANAMSAS:
+        actual = _ayanamsa_values(key)(jds)
+        errors[ayanamsa_series_name(key)] = float(_angle_diff(table.ayanamsa(key, jds), actual).max())
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precomputed Chebyshev ephemeris table")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="Fit all bodies and write the table")
+    b.add_argument("--start-year", type=int, default=1900, help="First year (default: 1900)")
+    b.add_argument("--end-year", type=int, default=2100, help="Last year, inclusive (default: 2100)")
+    b.add_argument("--output", required=True, help="Table file to write")
+
+    c = sub.add_parser("check", help="Compare a table against swisseph at random instants")
+    c.add_argument("table", help="Table file")
+    c.add_argument("--samples", type=int, default=2000, help="Instants to check (default: 2000)")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        jd_start = swe.julday(args.start_year, 1, 1, 0.0)
+        jd_end = swe.julday(args.end_year + 1, 1, 1, 0.0)
+        build_table(
+            args.output, jd_start, jd_end,
+            progress=lambda name, err: print(f"{name:24s} error bound {err:.2e} deg", file=sys.stderr),
+        )
+        print(f"Table saved to {args.output}", file=sys.stderr)
+    else:
+        table = EphemerisTable(args.table)
+        for name, err in check_table(table, args.samples).items():
+            print(f"{name:24s} {err:.2e} deg (bound {table.error_bound(name):.2e})")
+
+
+if __name__ == "__main__":
+    main()
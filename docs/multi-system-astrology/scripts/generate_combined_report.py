@@ -9,7 +9,264 @@ import argparse
 import json
 import sys
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+# Transit interpretation: what the planet brings, through which life area
+PLANET_TRANSIT_THEMES = {
+    "Jupiter": "Growth",
+    "Saturn": "Discipline and structure",
+    "Uranus": "Sudden changes",
+    "Neptune": "Dreams and idealism",
+    "Pluto": "Deep transformation",
+}
+
+SIGN_THEMES = {
+    "Aries": "new beginnings, courage, initiative",
+    "Taurus": "money, stability, the body",
+    "Gemini": "communication, tech, daily routines",
+    "Cancer": "home, emotions, nurturing",
+    "Leo": "visibility, creativity, leadership",
+    "Virgo": "health, routines, service",
+    "Libra": "partnerships, balance, agreements",
+    "Scorpio": "intimacy, shared resources, power",
+    "Sagittarius": "travel, learning, beliefs",
+    "Capricorn": "career, status, long-term plans",
+    "Aquarius": "community, networks, innovation",
+    "Pisces": "spirituality, endings, imagination",
+}
+
+MERCURY_RETROGRADE_GUIDANCE = {
+    "Aries": "Rethink impulsive starts. Revisit plans before pushing ahead.",
+    "Taurus": "Review spending and possessions. Delay big purchases.",
+    "Gemini": "Messages go astray. Re-read, confirm, repeat.",
+    "Cancer": "Relationship communication misfires. Double-check plans.",
+    "Leo": "Revisit creative projects. Keep ego out of decisions.",
+    "Virgo": "Audit routines and health habits. Fix the details.",
+    "Libra": "Revisit agreements and partnerships. Delay signing.",
+    "Scorpio": "Intense review of values and priorities. Go slow on commitments.",
+    "Sagittarius": "Re-check travel and study plans. Avoid overpromising.",
+    "Capricorn": "Review career plans and structures. Delay major launches.",
+    "Aquarius": "Revisit networks and tech. Back up everything.",
+    "Pisces": "Review, revise, close loops. Avoid new contracts.",
+}
+
+# Natal transits: the life area a natal point stands for, and how each aspect works on it
+NATAL_POINT_THEMES = {
+    "Sun": "identity and vitality",
+    "Moon": "emotions and home life",
+    "Mercury": "thinking and communication",
+    "Venus": "love, values and money",
+    "Mars": "drive and ambition",
+    "Jupiter": "growth and opportunity",
+    "Saturn": "responsibilities and long-term plans",
+    "Uranus": "independence and change",
+    "Neptune": "intuition and ideals",
+    "Pluto": "power and renewal",
+    "Rahu": "karmic direction",
+    "Ascendant": "body, image and personal direction",
+}
+
+ASPECT_THEMES = {
+    "conjunction": "a new chapter in",
+    "sextile": "openings in",
+    "square": "pressure and decisions around",
+    "trine": "easy support for",
+    "opposition": "tension and rebalancing in",
+}
+
+# Chinese year element: the health headline, and the matching remedy
+ELEMENT_HEALTH = {
+    "Fire": ("Fire and pace. Prioritize sleep and nervous-system care.", "Prioritize sleep consistency ({year} year runs hot)"),
+    "Earth": ("Steadiness. Protect routines, digestion and rest.", "Keep meals and sleep regular ({year} year rewards steady routines)"),
+    "Metal": ("Structure. Breath, posture and clear limits.", "Build breathing and posture work into the week ({year} year runs tight and exacting)"),
+    "Water": ("Flow and depth. Guard your energy and emotional rest.", "Protect rest and warmth ({year} year runs deep and draining)"),
+    "Wood": ("Growth and stretch. Move daily; don't overextend.", "Stretch and move daily ({year} year pushes growth; pace it)"),
+}
+
+# month-by-month: (focus, key action) for a month with no retrograde, eclipse or major ingress
+MONTH_DEFAULTS = [
+    ("Clean up loose ends", "Quiet preparation; don't force outcomes"),
+    ("Plan and prioritize", "Pick the few goals that matter this year"),
+    ("Act on plans", "Start the work; keep daily systems simple"),
+    ("New tools, new habits", "Upgrade work systems; expect surprise inputs"),
+    ("Build with consistency", "Stress-test launches; momentum builds"),
+    ("Confidence grows", "Use momentum for bold asks"),
+    ("Partnerships", "Clear written agreements; patience required"),
+    ("Visibility", "Present, lead, ship"),
+    ("Stabilize", "Turn experiments into repeatable routines"),
+    ("Review", "Audit what is working and what isn't"),
+    ("Prune", "Drop projects and habits that drain you"),
+    ("Integration", "Set {next_year} goals based on what actually worked"),
+]
+
+# quarterly playbook: advice that holds in any year; dated advice comes from the calendar
+QUARTER_BEST_USE = [
+    [
+        "Redefine your base: living setup, health baseline, daily systems",
+        "Close loops from {last_year}",
+        "Re-negotiate rather than push forward",
+        "Set boundaries on what you will NOT compromise on",
+    ],
+    [
+        "Upgrade your tools, workflows, and daily systems",
+        "Confidence grows - use it for bold asks",
+        "Partnerships and collaborations especially favored",
+    ],
+    [
+        "Sep: Stabilize. Turn experiments into repeatable routines.",
+        "Peak months for visibility, presenting, leading",
+    ],
+    [
+        "Review what actually worked in {year}",
+        "Prune friendships, projects, and habits that drain you",
+        "Dec: Integrate lessons, set {next_year} intentions",
+    ],
+]
+
+
+def _transit_year(data: Dict[str, Any]) -> int:
+    # charts from before the transit year was configurable are 2026 charts
+    return data["meta"].get("transit_year", 2026)
+
+
+def _transits(data: Dict[str, Any]) -> Dict[str, Any]:
+    return data[f"transits_{_transit_year(data)}"]
+
+
+def _short_date(date: str) -> str:
+    """2026-02-17 -> Feb 17"""
+    d = datetime.strptime(date, "%Y-%m-%d")
+    return f"{d:%b} {d.day}"
+
+
+def _window_date(date: str, year: int) -> str:
+    """Short date, with the year when it isn't the report year."""
+    return _short_date(date) if date.startswith(str(year)) else f"{_short_date(date)}, {date[:4]}"
+
+
+def _transit_impact(transit: Dict[str, Any]) -> str:
+    sign_theme = SIGN_THEMES.get(transit.get("sign"), "")
+    if transit.get("planet") == "Rahu":
+        return f"Karmic focus shifts toward {sign_theme}."
+    planet_theme = PLANET_TRANSIT_THEMES.get(transit.get("planet"))
+    if not planet_theme or not sign_theme:
+        return "Significant shift in energy."
+    return f"{planet_theme} through {sign_theme}."
+
+
+def _natal_transit_line(hit: Dict[str, Any]) -> str:
+    """Saturn square your Sun"""
+    natal = "your Ascendant" if hit["natal"] == "Ascendant" else f"your natal {hit['natal']}"
+    return f"{hit['transit']} {hit['aspect']} {natal}"
+
+
+def _natal_transit_impact(hit: Dict[str, Any]) -> str:
+    planet_theme = PLANET_TRANSIT_THEMES.get(hit["transit"], "Change")
+    aspect_theme = ASPECT_THEMES[hit["aspect"]]
+    natal_theme = NATAL_POINT_THEMES.get(hit["natal"], "this part of your chart")
+    return f"{planet_theme}: {aspect_theme} {natal_theme}."
+
+
+def _running_periods(dasha: Dict[str, Any]) -> str:
+    """Jupiter Mahadasha → Mercury Antardasha (until 2027-02-27) → ..."""
+    path = dasha.get("current_path")
+    if not path:
+        # charts from before the dasha tree only name the mahadasha
+        return f"{dasha['current_dasha']} Mahadasha"
+    parts = []
+    for p in path:
+        lord = p["lord"] if p["lord"] == p["planet"] else f"{p['lord']} ({p['planet']})"
+        parts.append(f"{lord} {p['level'].capitalize()} (until {p['end']})")
+    return " → ".join(parts)
+
+
+def _retrogrades(data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """(planet, window) for every Mercury and Venus retrograde in the calendar, by start date."""
+    transits = _transits(data)
+    windows = [(planet, r) for planet, key in (("Mercury", "mercury_retrogrades"), ("Venus", "venus_retrogrades"))
+               for r in transits.get(key, [])]
+    return sorted(windows, key=lambda w: w[1]["start"])
+
+
+def _span(r: Dict[str, Any]) -> str:
+    """Feb 26 - Mar 20"""
+    return f"{_short_date(r['start'])} - {_short_date(r['end'])}"
+
+
+def _month_row(data: Dict[str, Any], month: int) -> Tuple[str, str]:
+    """(focus, key action) for one month, from its eclipses, retrogrades and major ingresses."""
+    year = _transit_year(data)
+    transits = _transits(data)
+    first = f"{year}-{month:02d}-01"
+    after = f"{year + 1}-01-01" if month == 12 else f"{year}-{month + 1:02d}-01"
+
+    # (focus, note), most pressing first
+    events: List[Tuple[str, str]] = []
+    eclipses = [e for e in transits["eclipses"] if first <= e["date"] < after]
+    if eclipses:
+        dates = ", ".join(f"{e['type']} Eclipse {_short_date(e['date'])}" for e in eclipses)
+        events.append(("Eclipse month", f"{dates}; decide after the dust settles"))
+
+    active = [(planet, r) for planet, r in _retrogrades(data) if r["start"] < after and r["end"] >= first]
+    if len({planet for planet, _ in active}) > 1:
+        spans = ", ".join(f"{planet} Rx {_span(r)}" for planet, r in active)
+        events.append(("Double retrograde", f"{spans}; slow down commitments, reconnect with long-term people"))
+    else:
+        for planet, r in active:
+            advice = "relationship/value review, don't buy distractions" if planet == "Venus" else "double-check everything"
+            if first <= r["start"]:
+                events.append((f"{planet} Rx begins", f"{planet} Rx {_span(r)} ({r['sign']}); {advice}"))
+            elif r["end"] < after:
+                events.append((f"{planet} turns direct", f"{planet} direct {_short_date(r['end'])}; clean up, then move forward"))
+            else:
+                events.append((f"{planet} Rx", f"{planet} Rx until {_short_date(r['end'])}; {advice}"))
+
+    for t in transits["major_transits"]:
+        if first <= t["date"] < after and t.get("zodiac") == "tropical" and t["planet"] in ("Jupiter", "Saturn"):
+            event = t["event"].split(" (")[0]
+            events.append((event, f"{event} {_short_date(t['date'])}: {_transit_impact(t).rstrip('.').lower()}"))
+
+    chinese_year = transits["chinese_year"]
+    if first <= chinese_year["starts"] < after:
+        events.append((f"{chinese_year['full']} year begins", f"Chinese New Year {_short_date(chinese_year['starts'])}"))
+
+    focus, action = MONTH_DEFAULTS[month - 1]
+    if not events:
+        return focus, action.format(next_year=year + 1)
+    return events[0][0], "; ".join(note for _, note in events[:2])
+
+
+def _quarter_timing(data: Dict[str, Any]) -> List[List[str]]:
+    """Per quarter, advice tied to the calendar's retrogrades and eclipses."""
+    year = _transit_year(data)
+    transits = _transits(data)
+
+    def quarter(date: str) -> int:
+        # anything before the year (a retrograde still running) belongs to Q1
+        return (int(date[5:7]) - 1) // 3 if date.startswith(str(year)) else 0
+
+    timing: List[List[str]] = [[], [], [], []]
+    for planet, r in _retrogrades(data):
+        if planet == "Venus":
+            timing[quarter(r["start"])].append(
+                f"{_span(r)}: Venus Rx in {r['sign']}. Relationship and value reckoning; don't buy shiny distractions."
+            )
+        elif r["start"].startswith(str(year)):
+            timing[quarter(r["start"])].append(
+                f"Before {_short_date(r['start'])}: stress-test launches and sign agreements ahead of Mercury Rx"
+            )
+        if r["end"].startswith(str(year)) and quarter(r["end"]) != quarter(r["start"]):
+            timing[quarter(r["end"])].append(
+                f"After {_short_date(r['end'])}: clean up {planet} Rx messes, clarify agreements"
+            )
+    eclipse_months: List[List[str]] = [[], [], [], []]
+    for month in sorted({e["date"][:7] for e in transits["eclipses"]}):
+        eclipse_months[quarter(month + "-01")].append(datetime.strptime(month, "%Y-%m").strftime("%b"))
+    for q, months in enumerate(eclipse_months):
+        if months:
+            timing[q].append(f"{', '.join(months)}: Eclipse {'month' if len(months) == 1 else 'season'} - observe, don't force outcomes")
+    return timing
+
 
 def generate_executive_summary(data: Dict[str, Any]) -> str:
     """Generate executive summary section."""
@@ -23,9 +280,12 @@ def generate_executive_summary(data: Dict[str, Any]) -> str:
     sun_w = western["planets"]["sun"]
     asc_w = western["ascendant"]
     asc_v = vedic["ascendant"]
+    year = _transit_year(data)
+    chinese_year = _transits(data)["chinese_year"]
+    health = ELEMENT_HEALTH.get(chinese_year["element"], ("Pace yourself. Prioritize sleep and recovery.",))[0]
     
     return f"""# {meta['name']}
-# 2026 Astrology Report
+# {year} Astrology Report
 
 **Western + Vedic (Sidereal) + Chinese Synthesis**
 
@@ -48,11 +308,11 @@ This report blends Western transits (tropical) with Vedic calculations (sidereal
 | **Chinese** | {chinese['full']} birth year |
 | **Current Dasha** | {dasha['current_dasha']} Mahadasha |
 
-### 2026 Headline
+### {year} Headline
 
 - **Builder-to-leader year**: Fewer bets, deeper execution, more visibility from mid-year
 - **Relationship theme**: Clarity + initiative. Direct communication wins.
-- **Health theme**: Fire and pace. Prioritize sleep and nervous-system care.
+- **Health theme**: {health}
 - **Money theme**: Simplify. Reduce messy obligations, tighten compounding systems.
 """
 
@@ -82,6 +342,11 @@ def generate_vedic_section(data: Dict[str, Any]) -> str:
         marker = " ← CURRENT" if period["planet"] == dasha["current_dasha"] else ""
         dasha_table += f"| {i+1} | {period['planet']}{marker} | {period['start']} | {period['end']} |\n"
     
+    # Yogini dasha, as a second opinion on timing
+    yogini = ""
+    if data.get("yogini_dasha", {}).get("current_dasha"):
+        yogini = f"\n**Yogini Dasha:** {_running_periods(data['yogini_dasha'])}\n"
+    
     return f"""
 ---
 
@@ -127,8 +392,8 @@ def generate_vedic_section(data: Dict[str, Any]) -> str:
 
 {dasha_table}
 
-**Current Period:** {dasha['current_dasha']} Mahadasha
-
+**Current Period:** {_running_periods(dasha)}
+{yogini}
 *The Mahadasha planet colors the overall theme of your life during its period. The Antardasha (sub-period) modifies how this energy manifests.*
 """
 
@@ -175,7 +440,8 @@ The distribution of planets across Fire, Earth, Air, and Water signs shapes your
 def generate_chinese_section(data: Dict[str, Any]) -> str:
     """Generate Chinese astrology section."""
     chinese = data["chinese"]
-    transits = data["transits_2026"]
+    chinese_year = _transits(data)["chinese_year"]
+    starts = datetime.strptime(chinese_year["starts"], "%Y-%m-%d")
     
     return f"""
 ---
@@ -191,75 +457,90 @@ def generate_chinese_section(data: Dict[str, Any]) -> str:
 | **Polarity** | {chinese['yin_yang']} |
 | **Full Sign** | {chinese['full']} |
 
-### 2026: Year of the Fire Horse
+### {starts.year}: Year of the {chinese_year['full']}
 
-- **Starts:** February 17, 2026
-- **Element:** Fire
-- **Animal:** Horse
+- **Starts:** {starts:%B} {starts.day}, {starts.year}
+- **Element:** {chinese_year['element']}
+- **Animal:** {chinese_year['animal']}
 
-**{chinese['animal']} + Horse Compatibility:**
+**{chinese['animal']} + {chinese_year['animal']} Compatibility:**
 
-{"Tiger and Horse are traditionally compatible (both bold, action-oriented, independent). Fire amplifies speed and risk, so the win condition is discipline: pick one direction and move fast, instead of scattering." if chinese['animal'] == "Tiger" else f"The {chinese['animal']} interacting with the Fire Horse year brings dynamic energy. Adapt to the fast pace while staying grounded."}
+{"Tiger and Horse are traditionally compatible (both bold, action-oriented, independent). Fire amplifies speed and risk, so the win condition is discipline: pick one direction and move fast, instead of scattering." if chinese['animal'] == "Tiger" and chinese_year['full'] == "Fire Horse" else f"The {chinese['animal']} interacting with the {chinese_year['full']} year brings dynamic energy. Adapt to the pace of the year while staying grounded."}
 """
 
 
-def generate_2026_predictions(data: Dict[str, Any]) -> str:
-    """Generate 2026 predictions section."""
-    transits = data["transits_2026"]
+def generate_year_predictions(data: Dict[str, Any]) -> str:
+    """Generate the transit-year predictions section."""
+    year = _transit_year(data)
+    transits = _transits(data)
     dasha = data["vimshottari_dasha"]
     vedic = data["vedic"]
     
     # Mercury retrograde table
     merc_retro = "| Period | Sign | Guidance |\n"
     merc_retro += "|--------|------|----------|\n"
-    retro_guidance = [
-        "Review, revise, close loops. Avoid new contracts.",
-        "Relationship communication misfires. Double-check plans.",
-        "Intense review of values and priorities. Go slow on commitments."
-    ]
-    for i, r in enumerate(transits["mercury_retrogrades"]):
-        merc_retro += f"| {r['start']} to {r['end']} | {r['sign']} | {retro_guidance[i]} |\n"
+    for r in transits["mercury_retrogrades"]:
+        merc_retro += f"| {r['start']} to {r['end']} | {r['sign']} | {MERCURY_RETROGRADE_GUIDANCE[r['sign']]} |\n"
+    
+    # Venus retrograde (not every year has one)
+    venus_retro = ""
+    if transits.get("venus_retrogrades"):
+        venus_retro = "### Venus Retrograde Periods\n\n"
+        venus_retro += "| Period | Sign |\n"
+        venus_retro += "|--------|------|\n"
+        for r in transits["venus_retrogrades"]:
+            venus_retro += f"| {r['start']} to {r['end']} | {r['sign']} |\n"
+        venus_retro += "\n**Venus Retrograde Guidance:** review relationships, values and spending; avoid new commitments and cosmetic changes.\n"
     
     # Major transits
     transit_table = "| Date | Event | Impact |\n"
     transit_table += "|------|-------|--------|\n"
     
-    transit_impacts = {
-        "Neptune enters Aries": "Dreams meet action. Idealism in new ventures.",
-        "Saturn enters Aries": "Discipline and structure in new beginnings.",
-        "Uranus enters Gemini": "Sudden changes in communication, tech, daily routines.",
-        "Jupiter enters Leo (Tropical)": "Expansion through visibility, creativity, leadership.",
-        "Jupiter enters Cancer (Vedic/Sidereal)": "Growth through home, emotions, nurturing.",
-        "Jupiter enters Leo (Vedic/Sidereal)": "Visibility, recognition, leadership opportunities.",
-        "Rahu-Ketu shift to Capricorn-Cancer": "Karmic axis shifts to career vs. home/family.",
-    }
-    
     for t in transits["major_transits"]:
-        impact = transit_impacts.get(t["event"], "Significant shift in energy.")
+        impact = _transit_impact(t)
         transit_table += f"| {t['date']} | {t['event']} | {impact} |\n"
     
     # Eclipses
     eclipse_table = "| Date | Type | Sign | Theme |\n"
     eclipse_table += "|------|------|------|-------|\n"
-    eclipse_themes = {
-        "Aquarius": "Innovation, community, self-worth",
-        "Virgo": "Health, routines, service, details",
-        "Leo": "Creativity, romance, self-expression",
-        "Pisces": "Spirituality, endings, imagination",
-    }
     for e in transits["eclipses"]:
-        theme = eclipse_themes.get(e["sign"], "Transformation")
+        theme = SIGN_THEMES.get(e["sign"], "transformation").capitalize()
         eclipse_table += f"| {e['date']} | {e['type']} | {e['sign']} | {theme} |\n"
     
+    # Eclipses on natal points (charts from before eclipse_hits have none listed)
+    eclipse_hits = "| Date | Eclipse | Natal Point | Aspect | Orb |\n"
+    eclipse_hits += "|------|---------|-------------|--------|-----|\n"
+    for h in data.get("eclipse_hits", []):
+        eclipse_hits += f"| {h['date']} | {h['type']} in {h['sign']} | {h['point']} ({h['point_sign']}) | {h['aspect'].capitalize()} | {h['orb_dms']} |\n"
+    if not data.get("eclipse_hits"):
+        eclipse_hits = "None of this year's eclipses falls within a few degrees of your natal planets or ascendant.\n"
+    
+    # Slow-planet transits to this chart (charts from before transit_aspects have none listed)
+    personal = "| Exact | Transit | In Orb | What It Means |\n"
+    personal += "|-------|---------|--------|---------------|\n"
+    for h in data.get("transit_aspects", []):
+        exact = _short_date(h["exact"])
+        if h["passes"] > 1:
+            exact += f" (pass {h['pass']} of {h['passes']}{', retrograde' if h['retrograde'] else ''})"
+        window = f"{_window_date(h['start'], year) if h['start'] else 'earlier'} - {_window_date(h['end'], year) if h['end'] else 'later'}"
+        personal += f"| {exact} | {_natal_transit_line(h)} | {window} | {_natal_transit_impact(h)} |\n"
+    if not data.get("transit_aspects"):
+        personal = f"No slow-planet transit perfects an aspect to your natal planets or ascendant in {year}.\n"
+    
     return f"""
 ---
 
-## 2026 Predictions
+## {year} Predictions
 
 ### Current Dasha Influence
 
-You are in **{dasha['current_dasha']} Mahadasha**, which sets the backdrop for all 2026 experiences. This planetary period emphasizes the themes of {dasha['current_dasha']} in your life.
+You are in **{dasha['current_dasha']} Mahadasha**, which sets the backdrop for all {year} experiences. This planetary period emphasizes the themes of {dasha['current_dasha']} in your life.
+
+### Your Personal Transits
 
+Jupiter, Saturn, Uranus, Neptune and Pluto aspecting your natal planets and ascendant (tropical, 1° orb). "In Orb" is the stretch when the influence is strongest; a transit that turns retrograde can perfect two or three times.
+
+{personal}
 ### Mercury Retrograde Periods
 
 {merc_retro}
@@ -270,14 +551,19 @@ You are in **{dasha['current_dasha']} Mahadasha**, which sets the backdrop for a
 - Avoid signing major contracts or launching new ventures
 - Past people and situations may return for resolution
 
-### Major 2026 Transits
+{venus_retro}
+### Major {year} Transits
 
 {transit_table}
 
-### 2026 Eclipses
+### {year} Eclipses
 
 {eclipse_table}
 
+### Eclipses on Your Chart
+
+{eclipse_hits}
+
 **Eclipse Guidance:**
 - Avoid major decisions within 1 week of eclipses
 - Eclipses reveal what's hidden and accelerate change
@@ -285,26 +571,55 @@ You are in **{dasha['current_dasha']} Mahadasha**, which sets the backdrop for a
 """
 
 
+def _quarter_key_dates(data: Dict[str, Any]) -> List[str]:
+    """Markdown bullet list of the transit calendar's and this chart's dates for each quarter."""
+    year = _transit_year(data)
+    transits = _transits(data)
+
+    dated: List[Tuple[str, str]] = []
+    for planet, key in (("Mercury", "mercury_retrogrades"), ("Venus", "venus_retrogrades")):
+        for r in transits.get(key, []):
+            dated.append((r["start"], f"{_short_date(r['start'])} - {_short_date(r['end'])}: {planet} Retrograde ({r['sign']})"))
+    for t in transits["major_transits"]:
+        dated.append((t["date"], f"{_short_date(t['date'])}: {t['event']}"))
+    for e in transits["eclipses"]:
+        dated.append((e["date"], f"{_short_date(e['date'])}: {e['type']} Eclipse ({e['sign']})"))
+    for h in data.get("transit_aspects", []):
+        dated.append((h["exact"], f"{_short_date(h['exact'])}: {_natal_transit_line(h)} (personal)"))
+    chinese_year = transits["chinese_year"]
+    dated.append((chinese_year["starts"], f"{_short_date(chinese_year['starts'])}: Chinese New Year ({chinese_year['full']})"))
+
+    quarters: List[List[str]] = [[], [], [], []]
+    for date, line in sorted(dated):
+        # a retrograde that began late last year belongs with Q1
+        month = int(date[5:7]) if date.startswith(str(year)) else 1
+        quarters[(month - 1) // 3].append(f"- {line}")
+    return ["\n".join(lines) or "- No major sky events this quarter" for lines in quarters]
+
+
 def generate_quarterly_playbook(data: Dict[str, Any]) -> str:
     """Generate quarterly action playbook."""
-    return """
+    year = _transit_year(data)
+    key_dates = _quarter_key_dates(data)
+    timing = _quarter_timing(data)
+    best_use = [
+        "\n".join(f"- {line}" for line in timing[q] + [
+            advice.format(year=year, last_year=year - 1, next_year=year + 1) for advice in QUARTER_BEST_USE[q]
+        ])
+        for q in range(4)
+    ]
+    return f"""
 ---
 
-## 2026 Quarter-by-Quarter Playbook
+## {year} Quarter-by-Quarter Playbook
 
 ### Q1 (January - March): Foundations & Reality Checks
 
 **Key Dates:**
-- Jan 26: Neptune → Aries (dreams meet action)
-- Feb 13: Saturn → Aries (discipline kicks in)
-- Feb 17-20: Eclipse + Chinese New Year (high-impact reset)
-- Feb 26 - Mar 20: Mercury Retrograde (review mode)
+{key_dates[0]}
 
 **Best Use:**
-- Redefine your base: living setup, health baseline, daily systems
-- Close loops from 2025
-- Re-negotiate rather than push forward
-- Set boundaries on what you will NOT compromise on
+{best_use[0]}
 
 **Focus Ratings:**
 | Area | Intensity |
@@ -319,16 +634,10 @@ def generate_quarterly_playbook(data: Dict[str, Any]) -> str:
 ### Q2 (April - June): System Upgrades
 
 **Key Dates:**
-- Apr 25: Uranus → Gemini (sudden upgrades to routines, tech, communication)
-- Jun 1: Jupiter → Cancer (Vedic) - emotional/home expansion
-- Jun 29: Mercury Retrograde begins
-- Jun 30: Jupiter → Leo (Western) - visibility boost
+{key_dates[1]}
 
 **Best Use:**
-- Upgrade your tools, workflows, and daily systems
-- If launching, stress-test in May before Mercury Rx
-- Confidence grows - use it for bold asks
-- Partnerships and collaborations especially favored
+{best_use[1]}
 
 **Focus Ratings:**
 | Area | Intensity |
@@ -343,15 +652,10 @@ def generate_quarterly_playbook(data: Dict[str, Any]) -> str:
 ### Q3 (July - September): Momentum & Visibility
 
 **Key Dates:**
-- Jun 29 - Jul 23: Mercury Retrograde (relationship/communication review)
-- Aug 12: Total Solar Eclipse (Leo) - identity transformation
-- Aug 28: Partial Lunar Eclipse
+{key_dates[2]}
 
 **Best Use:**
-- July: Clean up Mercury Rx messes, clarify agreements
-- Aug: Eclipse month - observe, don't force outcomes
-- Sep: Stabilize. Turn experiments into repeatable routines.
-- Peak months for visibility, presenting, leading
+{best_use[2]}
 
 **Focus Ratings:**
 | Area | Intensity |
@@ -366,16 +670,10 @@ def generate_quarterly_playbook(data: Dict[str, Any]) -> str:
 ### Q4 (October - December): Consolidation & Pruning
 
 **Key Dates:**
-- Oct 3 - Nov 13: Venus Retrograde (relationships, values, money review)
-- Oct 24 - Nov 13: Mercury Retrograde (overlaps with Venus Rx - intense!)
-- Oct 31: Jupiter → Leo (Vedic) - leadership emphasis
-- Dec 5: Rahu-Ketu shift (karmic reset)
+{key_dates[3]}
 
 **Best Use:**
-- Oct-Nov: Relationship and value reckoning. Don't buy shiny distractions.
-- Review what actually worked in 2026
-- Prune friendships, projects, and habits that drain you
-- Dec: Integrate lessons, set 2027 intentions
+{best_use[3]}
 
 **Focus Ratings:**
 | Area | Intensity |
@@ -387,28 +685,21 @@ def generate_quarterly_playbook(data: Dict[str, Any]) -> str:
 """
 
 
-def generate_month_playbook() -> str:
+def generate_month_playbook(data: Dict[str, Any]) -> str:
     """Generate month-by-month quick reference."""
-    return """
+    year = _transit_year(data)
+    rows = ""
+    for month in range(1, 13):
+        focus, action = _month_row(data, month)
+        rows += f"| **{datetime(year, month, 1):%b}** | {focus} | {action} |\n"
+    return f"""
 ---
 
 ## Month-by-Month Quick Reference
 
 | Month | Focus | Key Action |
 |-------|-------|------------|
-| **Jan** | Clean up loose ends | Quiet preparation; don't force outcomes |
-| **Feb** | High-impact reset | Eclipse week Feb 17-20; decisions after dust settles |
-| **Mar** | Review and revise | Mercury Rx; sleep + health discipline |
-| **Apr** | New tools, new habits | Upgrade work systems; expect surprise inputs |
-| **May** | Build with consistency | Stress-test launches; momentum builds |
-| **Jun** | Confidence grows | Mercury Rx late month; double-check everything |
-| **Jul** | Partnership friction possible | Clear written agreements; patience required |
-| **Aug** | Eclipse month | Avoid impulsive financial moves; observe patterns |
-| **Sep** | Stabilize | Turn experiments into repeatable routines |
-| **Oct** | Venus Rx begins | Relationship/value review; don't buy distractions |
-| **Nov** | Double retrograde | Slow down labels/commitments; reconnect with long-term people |
-| **Dec** | Integration | Set 2027 goals based on what actually worked |
-"""
+{rows}"""
 
 
 def generate_remedies_section(data: Dict[str, Any]) -> str:
@@ -433,6 +724,16 @@ def generate_remedies_section(data: Dict[str, Any]) -> str:
     
     planet_remedy = remedies.get(current_planet, remedies["Jupiter"])
     moon_remedy = remedies.get(moon["nakshatra"]["ruler"], remedies["Moon"])
+
+    year = _transit_year(data)
+    transits = _transits(data)
+    chinese_year = transits["chinese_year"]
+    sleep = ELEMENT_HEALTH.get(chinese_year["element"], (None, "Prioritize sleep consistency"))[1]
+    mercury_rx = ", ".join(_span(r) for r in transits["mercury_retrogrades"])
+    venus_rx = "".join(
+        f"\n- Venus Rx ({_span(r)}): review, don't rush commitments" for r in transits.get("venus_retrogrades", [])
+    )
+    eclipse_dates = ", ".join(_short_date(e["date"]) for e in transits["eclipses"])
     
     return f"""
 ---
@@ -457,17 +758,16 @@ def generate_remedies_section(data: Dict[str, Any]) -> str:
 | **Colors** | {moon_remedy[2]} |
 | **Best Day** | {moon_remedy[3]} |
 
-### General 2026 Recommendations
+### General {year} Recommendations
 
 **Health & Energy:**
-- Prioritize sleep consistency (Fire Horse year runs hot)
+- {sleep.format(year=chinese_year['full'])}
 - 3-4 days strength training + 2 days zone-2 cardio
-- During Mercury Rx: avoid extreme sports, double-check travel
+- During Mercury Rx ({mercury_rx}): avoid extreme sports, double-check travel
 
 **Relationships:**
 - Lead with clarity: state what you want, what you give, what you won't tolerate
-- Best matches respect your independence and ambition
-- Venus Rx (Oct-Nov): review, don't rush commitments
+- Best matches respect your independence and ambition{venus_rx}
 
 **Career & Money:**
 - Ship with collaborators in H1; go deep on hard problems in H2
@@ -475,7 +775,7 @@ def generate_remedies_section(data: Dict[str, Any]) -> str:
 - Late-year: full cleanup of subscriptions, debts, automation
 
 **Spiritual Practice:**
-- Regular meditation (especially around eclipses)
+- Regular meditation (especially around the eclipses: {eclipse_dates})
 - Journaling during retrograde periods
 - Gratitude practice on your Moon nakshatra's ruling day
 """
@@ -496,9 +796,9 @@ def generate_sources_section() -> str:
 
 ### Transit Data Sources
 
-- Timeanddate.com (eclipses, Mercury retrogrades)
-- Drik Panchang (Vedic Jupiter/Rahu-Ketu transits)
-- Major ephemeris listings for outer-planet ingresses
+- Retrograde stations, ingresses and Rahu-Ketu shifts: Swiss Ephemeris, computed for the report year
+- Chinese New Year: new moon and solar terms from Swiss Ephemeris (China Standard Time)
+- Eclipses: Swiss Ephemeris eclipse search
 
 ### Disclaimer
 
@@ -517,9 +817,9 @@ def generate_full_report(data: Dict[str, Any]) -> str:
         generate_vedic_section(data),
         generate_western_section(data),
         generate_chinese_section(data),
-        generate_2026_predictions(data),
+        generate_year_predictions(data),
         generate_quarterly_playbook(data),
-        generate_month_playbook(),
+        generate_month_playbook(data),
         generate_remedies_section(data),
         generate_sources_section(),
     ]
@@ -529,14 +829,17 @@ def generate_full_report(data: Dict[str, Any]) -> str:
 
 def main():
     parser = argparse.ArgumentParser(description="Generate multi-system astrology report")
-    parser.add_argument("input", help="Input JSON file from multi_system_calculator.py")
+    parser.add_argument("input", help="Input JSON file from multi_system_calculator.py ('-' for stdin)")
     parser.add_argument("--output", "-o", default="-", help="Output file (default: stdout)")
     
     args = parser.parse_args()
     
     # Load input data
-    with open(args.input, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if args.input == "-":
+        data = json.load(sys.stdin)
+    else:
+        with open(args.input, "r", encoding="utf-8") as f:
+            data = json.load(f)
     
     # Generate report
     report = generate_full_report(data)
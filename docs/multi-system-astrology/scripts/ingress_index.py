@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Ingress and Station Index
+Every sign ingress (tropical), rashi and nakshatra ingress (sidereal) and
+retrograde/direct station of every body over a date range, in one compact
+binary file. "Sign of Saturn on date D" or "next Mercury station after D"
+is then a binary search instead of an ephemeris call.
+
+Events are found by sampling longitude and speed on a coarse grid (half a
+day for the Moon, one day for the rest) only to bracket them, then refined
+by root-finding: safeguarded Newton on longitude (using the speed) for
+ingresses, bisection on speed for stations, to ~1e-7 days (< 0.01 s).
+Longitudes come from a precomputed ephemeris table (ephemeris_table.py)
+if one is given, else from swisseph.
+
+File layout (little-endian):
+
+    header     MAGIC, n_events, n_slices, jd_start, jd_end, ayanamsa
+    slices     n_slices x SLICE (body, kind, first event, event count)
+    events     n_events x EVENT_DTYPE, sorted by (body, kind, jd)
+
+Each (body, kind) slice starts with a state event at jd_start (direction
+0) giving the sign/nakshatra/motion in force at the start of the range.
+
+Build:
+
+    python3 ingress_index.py build --start-year 1900 --end-year 2100 --ayanamsa raman \\
+        --output ingress.idx [--table ephemeris.tbl]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    if __name__ == "__main__":
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    raise
+
+from multi_system_calculator import (
+    AYANAMSAS,
+    NAKSHATRAS,
+    PLANETS,
+    RASHIS_VEDIC,
+    SIGNS_WESTERN,
+    SWE_LOCK,
+    ChartContext,
+    _prepare_thread,
+    swe,
+)
+
+MAGIC = b"ASTROIX1"
+HEADER = struct.Struct("<8sIIdd16s")
+SLICE = struct.Struct("<BBII")
+
+EVENT_DTYPE = np.dtype([
+    ("jd", "<f8"),
+    ("value", "u1"),       # sign/rashi (0-11) or nakshatra (0-26) entered; for stations 1 = retrograde
+    ("direction", "i1"),   # +1 entered moving forward, -1 moving backward, 0 initial state
+])
+
+# event kinds
+SIGN, RASHI, NAKSHATRA, STATION = 0, 1, 2, 3
+KIND_NAMES = {SIGN: "sign", RASHI: "rashi", NAKSHATRA: "nakshatra", STATION: "station"}
+
+BODIES = list(PLANETS) + ["Ketu"]
+
+# coarse step (days): short enough that a body cannot pass a whole nakshatra
+STEP_DAYS = {"Moon": 0.5}
+DEFAULT_STEP_DAYS = 1.0
+
+ROOT_TOLERANCE_DAYS = 1e-7
+_MAX_ITERATIONS = 60
+
+
+# =============================================================================
+# LONGITUDE SOURCES
+# =============================================================================
+
+class _Source:
+    """Tropical longitude/speed and mean ayanamsa for arrays of Julian days."""
+
+    def __init__(self, ayanamsa: str, table=None):
+        self.ayanamsa_key = ayanamsa
+        self.table = table
+
+    def tropical(self, body: str, jds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if body == "Ketu":
+            lon, speed = self.tropical("Rahu", jds)
+            return np.mod(lon + 180.0, 360.0), speed
+        if self.table is not None:
+            return self.table.longitude(body, jds), self.table.speed(body, jds)
+        out = np.array([swe.calc_ut(jd, PLANETS[body], ChartContext.CALC_FLAGS)[0] for jd in jds])
+        out = out.reshape(-1, 6)
+        return np.mod(out[:, 0], 360.0), out[:, 3]
+
+    def ayanamsa(self, jds: np.ndarray) -> np.ndarray:
+        if self.table is not None:
+            return self.table.ayanamsa(self.ayanamsa_key, jds)
+        with SWE_LOCK:
+            swe.set_sid_mode(AYANAMSAS[self.ayanamsa_key][0])
+            return np.array([swe.get_ayanamsa_ex_ut(jd, 0)[1] for jd in jds])
+
+    def longitude(self, body: str, jds: np.ndarray, sidereal: bool) -> Tuple[np.ndarray, np.ndarray]:
+        lon, speed = self.tropical(body, jds)
+        if sidereal:
+            lon = np.mod(lon - self.ayanamsa(jds), 360.0)
+        return lon, speed
+
+
+# =============================================================================
+# ROOT FINDING
+# =============================================================================
+
+def _wrap(deg: np.ndarray) -> np.ndarray:
+    return (deg + 180.0) % 360.0 - 180.0
+
+
+def _refine_crossings(source: _Source, body: str, sidereal: bool,
+                      a: np.ndarray, b: np.ndarray, boundary: np.ndarray) -> np.ndarray:
+    """Instants in [a, b] where the longitude equals `boundary` (vectorized)."""
+    g_a = _wrap(source.longitude(body, a, sidereal)[0] - boundary)
+    t = (a + b) / 2.0
+    for _ in range(_MAX_ITERATIONS):
+        lon, speed = source.longitude(body, t, sidereal)
+        g = _wrap(lon - boundary)
+        same_as_a = np.sign(g) == np.sign(g_a)
+        a = np.where(same_as_a, t, a)
+        g_a = np.where(same_as_a, g, g_a)
+        b = np.where(same_as_a, b, t)
+
+        done = (b - a < ROOT_TOLERANCE_DAYS) | (np.abs(g) < 1e-10)
+        if np.all(done):
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = t - g / speed
+        inside = (newton >= a) & (newton <= b) & np.isfinite(newton)
+        t = np.where(done, t, np.where(inside, newton, (a + b) / 2.0))
+    return t
+
+
+def _refine_stations(source: _Source, body: str, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Instants in [a, b] where the speed changes sign (bisection, vectorized)."""
+    s_a = np.sign(source.tropical(body, a)[1])
+    while np.any(b - a > ROOT_TOLERANCE_DAYS):
+        t = (a + b) / 2.0
+        same_as_a = np.sign(source.tropical(body, t)[1]) == s_a
+        a = np.where(same_as_a, t, a)
+        b = np.where(same_as_a, b, t)
+    return (a + b) / 2.0
+
+
+def _ingress_events(source: _Source, body: str, jds: np.ndarray, lon: np.ndarray,
+                    width: float, sidereal: bool) -> np.ndarray:
+    cell = np.floor(lon / width).astype(np.int64)
+    changed = np.nonzero(cell[1:] != cell[:-1])[0]
+
+    events = np.zeros(len(changed) + 1, dtype=EVENT_DTYPE)
+    events[0] = (jds[0], cell[0], 0)
+    if len(changed):
+        step = _wrap(lon[changed + 1] - lon[changed])
+        forward = step > 0
+        # moving forward we cross into the new cell's start, backward out of the old one's
+        boundary = np.where(forward, cell[changed + 1], cell[changed]) * width
+        t = _refine_crossings(source, body, sidereal, jds[changed], jds[changed + 1], boundary)
+        events["jd"][1:] = t
+        events["value"][1:] = cell[changed + 1]
+        events["direction"][1:] = np.where(forward, 1, -1)
+    return events
+
+
+def _station_events(source: _Source, body: str, jds: np.ndarray, speed: np.ndarray) -> np.ndarray:
+    retro = speed < 0
+    changed = np.nonzero(retro[1:] != retro[:-1])[0]
+    events = np.zeros(len(changed) + 1, dtype=EVENT_DTYPE)
+    events[0] = (jds[0], retro[0], 0)
+    if len(changed):
+        events["jd"][1:] = _refine_stations(source, body, jds[changed], jds[changed + 1])
+        events["value"][1:] = retro[changed + 1]
+        events["direction"][1:] = np.where(retro[changed + 1], -1, 1)
+    return events
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def _body_events(source: _Source, body: str, jd_start: float, jd_end: float, kinds) -> Dict[int, np.ndarray]:
+    step = STEP_DAYS.get(body, DEFAULT_STEP_DAYS)
+    jds = np.arange(jd_start, jd_end + step, step)
+    jds[-1] = min(jds[-1], jd_end)
+    tropical, speed = source.tropical(body, jds)
+    found = {}
+    if SIGN in kinds:
+        found[SIGN] = _ingress_events(source, body, jds, tropical, 30.0, False)
+    if RASHI in kinds or NAKSHATRA in kinds:
+        sidereal = np.mod(tropical - source.ayanamsa(jds), 360.0)
+        if RASHI in kinds:
+            found[RASHI] = _ingress_events(source, body, jds, sidereal, 30.0, True)
+        if NAKSHATRA in kinds:
+            found[NAKSHATRA] = _ingress_events(source, body, jds, sidereal, 360.0 / 27, True)
+    if STATION in kinds:
+        found[STATION] = _station_events(source, body, jds, speed)
+    return found
+
+
+def find_events(body: str, kind: int, jd_start: float, jd_end: float,
+                ayanamsa: str = "raman", table=None) -> np.ndarray:
+    """
+    Events of one kind for a body over [jd_start, jd_end], found directly
+    (no index file), by the same search build_index uses. Starts with the
+    state event at jd_start, like IngressIndex.events().
+    """
+    _prepare_thread()
+    return _body_events(_Source(ayanamsa, table), body, jd_start, jd_end, (kind,))[kind]
+
+
+def build_index(out_path: str, jd_start: float, jd_end: float, ayanamsa: str = "raman",
+                table=None, progress=None) -> int:
+    """Finds every event for every body and writes the index. Returns the event count."""
+    _prepare_thread()
+    source = _Source(ayanamsa, table)
+
+    slices: List[Tuple[int, int, np.ndarray]] = []
+    for b, body in enumerate(BODIES):
+        found = _body_events(source, body, jd_start, jd_end, KIND_NAMES)
+        slices.extend((b, kind, found[kind]) for kind in (SIGN, RASHI, NAKSHATRA, STATION))
+        if progress:
+            progress(body, sum(len(s[2]) for s in slices[-4:]))
+
+    n_events = sum(len(events) for _, _, events in slices)
+    out = bytearray(HEADER.pack(MAGIC, n_events, len(slices), jd_start, jd_end, ayanamsa.encode("ascii")))
+    first = 0
+    for b, kind, events in slices:
+        out += SLICE.pack(b, kind, first, len(events))
+        first += len(events)
+    for _, _, events in slices:
+        out += events.tobytes()
+
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, out_path)
+    return n_events
+
+
+# =============================================================================
+# LOOKUP
+# =============================================================================
+
+class IngressIndex:
+    """Memory-mapped, read-only view over a built index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n_events, n_slices, self.jd_start, self.jd_end, ayanamsa = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an ingress index.")
+        self.ayanamsa = ayanamsa.rstrip(b"\0").decode("ascii")
+
+        events_at = HEADER.size + n_slices * SLICE.size
+        events = np.frombuffer(self._mm, dtype=EVENT_DTYPE, count=n_events, offset=events_at)
+        self._slices: Dict[Tuple[str, int], np.ndarray] = {}
+        for i in range(n_slices):
+            b, kind, first, count = SLICE.unpack_from(self._mm, HEADER.size + i * SLICE.size)
+            self._slices[(BODIES[b], kind)] = events[first:first + count]
+
+    def events(self, body: str, kind: int) -> np.ndarray:
+        """All events of one kind for a body, sorted by jd."""
+        try:
+            return self._slices[(body, kind)]
+        except KeyError:
+            raise KeyError(f"No {KIND_NAMES.get(kind, kind)} events for {body!r}.")
+
+    def _check_range(self, jd: float) -> None:
+        if not self.jd_start <= jd <= self.jd_end:
+            raise ValueError(f"Julian day {jd} outside the index range {self.jd_start}-{self.jd_end}.")
+
+    def state_at(self, body: str, kind: int, jd: float) -> np.void:
+        """The last event of a kind at or before jd (what is in force at jd)."""
+        self._check_range(jd)
+        events = self.events(body, kind)
+        return events[np.searchsorted(events["jd"], jd, side="right") - 1]
+
+    def sign_at(self, body: str, jd: float) -> str:
+        return SIGNS_WESTERN[self.state_at(body, SIGN, jd)["value"]]
+
+    def rashi_at(self, body: str, jd: float) -> str:
+        return RASHIS_VEDIC[self.state_at(body, RASHI, jd)["value"]]["name"]
+
+    def nakshatra_at(self, body: str, jd: float) -> str:
+        return NAKSHATRAS[self.state_at(body, NAKSHATRA, jd)["value"]]["name"]
+
+    def is_retrograde(self, body: str, jd: float) -> bool:
+        return bool(self.state_at(body, STATION, jd)["value"])
+
+    def next_event(self, body: str, kind: int, jd: float) -> Optional[np.void]:
+        """The first real event (not the initial state) strictly after jd, or None."""
+        self._check_range(jd)
+        events = self.events(body, kind)
+        i = max(int(np.searchsorted(events["jd"], jd, side="right")), 1)
+        return events[i] if i < len(events) else None
+
+    def previous_event(self, body: str, kind: int, jd: float) -> Optional[np.void]:
+        """The last real event at or before jd, or None."""
+        self._check_range(jd)
+        events = self.events(body, kind)
+        i = int(np.searchsorted(events["jd"], jd, side="right")) - 1
+        return events[i] if i >= 1 else None
+
+    def between(self, body: str, kind: int, jd_from: float, jd_to: float) -> np.ndarray:
+        """Real events with jd_from <= jd < jd_to."""
+        events = self.events(body, kind)[1:]
+        lo, hi = np.searchsorted(events["jd"], [jd_from, jd_to])
+        return events[lo:hi]
+
+    def close(self) -> None:
+        self._slices.clear()
+        self._mm.close()
+
+
+_indexes: Dict[str, IngressIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path: str) -> Optional[IngressIndex]:
+    """Shared index for a path, opened on first use. None if it doesn't exist."""
+    index = _indexes.get(path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(path)
+            if index is None:
+                if not os.path.exists(path):
+                    return None
+                index = _indexes[path] = IngressIndex(path)
+    return index
+
+
+def describe_event(body: str, kind: int, event: Any) -> Dict[str, Any]:
+    """JSON-friendly form of one event."""
+    year, month, day, hour = swe.revjul(float(event["jd"]))
+    if kind == STATION:
+        what = "stations retrograde" if event["value"] else "stations direct"
+    elif kind == NAKSHATRA:
+        what = f"enters {NAKSHATRAS[event['value']]['name']}"
+    elif kind == RASHI:
+        what = f"enters {RASHIS_VEDIC[event['value']]['name']}"
+    else:
+        what = f"enters {SIGNS_WESTERN[event['value']]}"
+    return {
+        "jd": float(event["jd"]),
+        "date": f"{year:04d}-{month:02d}-{day:02d}",
+        "body": body,
+        "kind": KIND_NAMES[kind],
+        "event": f"{body} {what}",
+        "retrograde_motion": bool(event["direction"] < 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sign/nakshatra ingress and station index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="Find all events and write the index")
+    b.add_argument("--start-year", type=int, default=1900, help="First year (default: 1900)")
+    b.add_argument("--end-year", type=int, default=2100, help="Last year, inclusive (default: 2100)")
+    b.add_argument("--ayanamsa", default="raman", choices=list(AYANAMSAS.keys()),
+                   help="Ayanamsa for rashi/nakshatra events (default: raman)")
+    b.add_argument("--table", default=None, help="Ephemeris table to read positions from (faster)")
+    b.add_argument("--output", required=True, help="Index file to write")
+
+    q = sub.add_parser("query", help="Events for a body in a date range")
+    q.add_argument("index", help="Index file")
+    q.add_argument("body", choices=BODIES)
+    q.add_argument("--kind", default="station", choices=list(KIND_NAMES.values()))
+    q.add_argument("--from-date", required=True, help="YYYY-MM-DD")
+    q.add_argument("--to-date", required=True, help="YYYY-MM-DD")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        table = None
+        if args.table:
+            from ephemeris_table import EphemerisTable
+            table = EphemerisTable(args.table)
+        n = build_index(
+            args.output,
+            swe.julday(args.start_year, 1, 1, 0.0),
+            swe.julday(args.end_year + 1, 1, 1, 0.0),
+            args.ayanamsa,
+            table,
+            progress=lambda body, count: print(f"{body:10s} {count} events", file=sys.stderr),
+        )
+        print(f"{n} events saved to {args.output}", file=sys.stderr)
+    else:
+        index = IngressIndex(args.index)
+        kind = {v: k for k, v in KIND_NAMES.items()}[args.kind]
+        to_jd = lambda s: swe.julday(*[int(x) for x in s.split("-")], 0.0)
+        events = index.between(args.body, kind, to_jd(args.from_date), to_jd(args.to_date))
+        result = {
+            "body": args.body,
+            "kind": args.kind,
+            "from_date": args.from_date,
+            "to_date": args.to_date,
+            "events": [describe_event(args.body, kind, event) for event in events],
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,42 @@ Supports multiple ayanamsas: Lahiri, Raman, KP, etc.
 import argparse
 import json
 import sys
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Tuple, List
 
 try:
     import swisseph as swe
 except ImportError:
-    print("Error: pyswisseph not installed. Run: pip install pyswisseph --break-system-packages")
-    sys.exit(1)
+    if __name__ == "__main__":
+        print("Error: pyswisseph not installed. Run: pip install pyswisseph --break-system-packages")
+        sys.exit(1)
+    raise
+
+# Swiss Ephemeris keeps the sidereal mode and ephemeris path in library-
+# global state: thread-local in TLS builds (the usual case), process-wide in
+# others. Either way, code that sets that state and then relies on it must
+# set it in the calling thread and hold SWE_LOCK until it is done.
+SWE_LOCK = threading.RLock()
+
+_ephe_path = ""
+_thread_state = threading.local()
+
+
+def set_ephemeris_path(path: str) -> None:
+    """Swiss Ephemeris data directory (.se1 files) for every thread."""
+    global _ephe_path
+    _ephe_path = path or ""
+    _prepare_thread()
+
+
+def _prepare_thread() -> None:
+    # a thread that never called set_ephe_path would silently fall back to
+    # the built-in (less precise) ephemeris in TLS builds
+    if getattr(_thread_state, "ephe_path", "") != _ephe_path:
+        swe.set_ephe_path(_ephe_path)
+        _thread_state.ephe_path = _ephe_path
 
 # =============================================================================
 # AYANAMSA CONFIGURATIONS
@@ -28,6 +56,9 @@ AYANAMSAS = {
     "true_chitra": (swe.SIDM_TRUE_CITRA, "True Chitrapaksha"),
 }
 
+# the Vedic chart leaves these out
+OUTER_PLANETS = ("Uranus", "Neptune", "Pluto")
+
 # =============================================================================
 # NAKSHATRA DATA
 # =============================================================================
@@ -239,64 +270,171 @@ def calculate_julian_day(year: int, month: int, day: int, hour: float, tz_offset
     return swe.julday(year, month, day, utc_hour)
 
 
-def calculate_vedic_positions(jd: float, lat: float, lon: float, ayanamsa: str = "raman") -> Dict[str, Any]:
+class ChartContext:
+    """
+    Ephemeris results for one moment and place, computed once and shared by
+    the Vedic and Western views: tropical positions with speeds for every
+    planet, and the house cusps. Sidereal positions are derived from these
+    by subtracting the ayanamsa instead of asking the ephemeris again.
+
+    Calculation flags are fixed per call and the ayanamsa is read under
+    SWE_LOCK, so charts with different ayanamsas can be computed from
+    several threads at once. A context itself belongs to one thread.
+    """
+
+    # sidereal = tropical - ayanamsa agrees with FLG_SIDEREAL to ~1e-13 deg
+    CALC_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+    def __init__(self, jd: float, lat: float, lon: float):
+        _prepare_thread()
+        self.jd = jd
+        self.lat = lat
+        self.lon = lon
+        self._tropical = None
+        self._houses = None
+        self._ayanamsas: Dict[str, Tuple[float, float, float]] = {}
+
+    @property
+    def tropical(self) -> Dict[str, Any]:
+        """Planet name -> calc_ut position tuple (or the exception it raised)."""
+        if self._tropical is None:
+            tropical = {}
+            for planet_name, planet_id in PLANETS.items():
+                try:
+                    tropical[planet_name] = swe.calc_ut(self.jd, planet_id, self.CALC_FLAGS)[0]
+                except Exception as e:
+                    tropical[planet_name] = e
+            self._tropical = tropical
+        return self._tropical
+
+    @property
+    def houses(self) -> Tuple[tuple, tuple]:
+        """(cusps, ascmc) for Placidus houses."""
+        if self._houses is None:
+            self._houses = swe.houses(self.jd, self.lat, self.lon, b'P')
+        return self._houses
+
+    def ayanamsa(self, ayanamsa: str) -> Tuple[float, float, float]:
+        """
+        (reported value, value used for planets, daily rate) for an ayanamsa.
+        Planets use the mean value, as FLG_SIDEREAL does; the reported value
+        (also used for the ascendant) is the one the calculator always showed.
+        """
+        if ayanamsa not in self._ayanamsas:
+            with SWE_LOCK:
+                swe.set_sid_mode(AYANAMSAS.get(ayanamsa, AYANAMSAS["raman"])[0])
+                reported = swe.get_ayanamsa(self.jd)
+                mean = swe.get_ayanamsa_ex_ut(self.jd, 0)[1]
+                rate = swe.get_ayanamsa_ex_ut(self.jd + 1, 0)[1] - mean
+            self._ayanamsas[ayanamsa] = (reported, mean, rate)
+        return self._ayanamsas[ayanamsa]
+
+    def sidereal(self, planet: str, ayanamsa: str) -> Tuple[float, float, float]:
+        """
+        (longitude, latitude, speed) of a planet, sidereal: the tropical
+        position less the mean ayanamsa and its daily rate. The planet's
+        tropical entry must not be an exception.
+        """
+        pos = self.tropical[planet]
+        _, mean, rate = self.ayanamsa(ayanamsa)
+        return (pos[0] - mean) % 360, pos[1], pos[3] - rate
+
+    def ascendant(self, ayanamsa: str = None) -> float:
+        """Tropical ascendant, or sidereal (less the reported ayanamsa) if an ayanamsa is given."""
+        asc = self.houses[1][0]
+        if ayanamsa is None:
+            return asc
+        return (asc - self.ayanamsa(ayanamsa)[0]) % 360
+
+
+def ketu_longitude(rahu_longitude: float) -> float:
+    """Ketu is always opposite Rahu."""
+    return (rahu_longitude + 180) % 360
+
+
+def vedic_planet_entry(name: str, longitude: float, latitude: float, speed: float) -> Dict[str, Any]:
+    """Chart JSON for a planet from its sidereal longitude, latitude and speed."""
+    return {
+        "name": name,
+        "longitude": longitude,
+        "longitude_dms": degrees_to_dms(longitude),
+        "latitude": latitude,
+        "speed": speed,
+        "retrograde": speed < 0,
+        "nakshatra": get_nakshatra(longitude),
+        "rashi": get_rashi(longitude),
+    }
+
+
+def vedic_point_entry(longitude: float, name: str = None, retrograde: bool = None) -> Dict[str, Any]:
+    """Chart JSON for a sidereal point without latitude/speed (ascendant, Ketu)."""
+    entry = {}
+    if name is not None:
+        entry["name"] = name
+    entry["longitude"] = longitude
+    entry["longitude_dms"] = degrees_to_dms(longitude)
+    if retrograde is not None:
+        entry["retrograde"] = retrograde
+    entry["nakshatra"] = get_nakshatra(longitude)
+    entry["rashi"] = get_rashi(longitude)
+    return entry
+
+
+def western_planet_entry(name: str, longitude: float, retrograde: bool) -> Dict[str, Any]:
+    """Chart JSON for a planet from its tropical longitude."""
+    return {
+        "name": name,
+        "longitude": longitude,
+        "longitude_dms": degrees_to_dms(longitude),
+        "sign": get_western_sign(longitude),
+        "retrograde": retrograde,
+    }
+
+
+def western_point_entry(longitude: float) -> Dict[str, Any]:
+    """Chart JSON for a tropical point (the ascendant)."""
+    return {
+        "longitude": longitude,
+        "longitude_dms": degrees_to_dms(longitude),
+        "sign": get_western_sign(longitude),
+    }
+
+
+def calculate_vedic_positions(
+    jd: float, lat: float, lon: float, ayanamsa: str = "raman", ctx: ChartContext = None
+) -> Dict[str, Any]:
     """Calculate Vedic sidereal positions."""
-    
+    ctx = ctx or ChartContext(jd, lat, lon)
+
     # Set ayanamsa
     if ayanamsa in AYANAMSAS:
-        swe.set_sid_mode(AYANAMSAS[ayanamsa][0])
         ayanamsa_name = AYANAMSAS[ayanamsa][1]
     else:
-        swe.set_sid_mode(swe.SIDM_RAMAN)
+        ayanamsa = "raman"
         ayanamsa_name = "B.V. Raman"
-    
-    ayanamsa_value = swe.get_ayanamsa(jd)
+
+    ayanamsa_value = ctx.ayanamsa(ayanamsa)[0]
     
     positions = {}
     
-    for planet_name, planet_id in PLANETS.items():
-        if planet_name in ["Uranus", "Neptune", "Pluto"]:
-            continue  # Skip outer planets for Vedic
-        
-        try:
-            pos, _ = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL)
-            longitude = pos[0] if pos[0] >= 0 else pos[0] + 360
-            
-            positions[planet_name.lower()] = {
-                "name": planet_name,
-                "longitude": longitude,
-                "longitude_dms": degrees_to_dms(longitude),
-                "latitude": pos[1],
-                "speed": pos[3],
-                "retrograde": pos[3] < 0,
-                "nakshatra": get_nakshatra(longitude),
-                "rashi": get_rashi(longitude),
-            }
-        except Exception as e:
-            positions[planet_name.lower()] = {"error": str(e)}
+    for planet_name, pos in ctx.tropical.items():
+        if planet_name in OUTER_PLANETS:
+            continue
+
+        if isinstance(pos, Exception):
+            positions[planet_name.lower()] = {"error": str(pos)}
+            continue
+
+        positions[planet_name.lower()] = vedic_planet_entry(planet_name, *ctx.sidereal(planet_name, ayanamsa))
     
     # Calculate Ketu (opposite to Rahu)
     if "rahu" in positions and "error" not in positions["rahu"]:
-        ketu_lon = (positions["rahu"]["longitude"] + 180) % 360
-        positions["ketu"] = {
-            "name": "Ketu",
-            "longitude": ketu_lon,
-            "longitude_dms": degrees_to_dms(ketu_lon),
-            "retrograde": True,  # Nodes are always retrograde
-            "nakshatra": get_nakshatra(ketu_lon),
-            "rashi": get_rashi(ketu_lon),
-        }
+        ketu_lon = ketu_longitude(positions["rahu"]["longitude"])
+        # Nodes are always retrograde
+        positions["ketu"] = vedic_point_entry(ketu_lon, name="Ketu", retrograde=True)
     
     # Calculate Ascendant
-    cusps, ascmc = swe.houses(jd, lat, lon, b'P')
-    asc_sidereal = (ascmc[0] - ayanamsa_value) % 360
-    
-    ascendant = {
-        "longitude": asc_sidereal,
-        "longitude_dms": degrees_to_dms(asc_sidereal),
-        "nakshatra": get_nakshatra(asc_sidereal),
-        "rashi": get_rashi(asc_sidereal),
-    }
+    ascendant = vedic_point_entry(ctx.ascendant(ayanamsa))
     
     return {
         "ayanamsa": ayanamsa_value,
@@ -306,35 +444,23 @@ def calculate_vedic_positions(jd: float, lat: float, lon: float, ayanamsa: str =
     }
 
 
-def calculate_western_positions(jd: float, lat: float, lon: float) -> Dict[str, Any]:
+def calculate_western_positions(jd: float, lat: float, lon: float, ctx: ChartContext = None) -> Dict[str, Any]:
     """Calculate Western tropical positions."""
+    ctx = ctx or ChartContext(jd, lat, lon)
     
     positions = {}
     
-    for planet_name, planet_id in PLANETS.items():
-        try:
-            pos, _ = swe.calc_ut(jd, planet_id)
-            longitude = pos[0] if pos[0] >= 0 else pos[0] + 360
-            
-            positions[planet_name.lower()] = {
-                "name": planet_name,
-                "longitude": longitude,
-                "longitude_dms": degrees_to_dms(longitude),
-                "sign": get_western_sign(longitude),
-                "retrograde": pos[3] < 0,
-            }
-        except Exception as e:
-            positions[planet_name.lower()] = {"error": str(e)}
+    for planet_name, pos in ctx.tropical.items():
+        if isinstance(pos, Exception):
+            positions[planet_name.lower()] = {"error": str(pos)}
+            continue
+
+        longitude = pos[0] % 360
+
+        positions[planet_name.lower()] = western_planet_entry(planet_name, longitude, pos[3] < 0)
     
     # Ascendant
-    cusps, ascmc = swe.houses(jd, lat, lon, b'P')
-    asc_lon = ascmc[0]
-    
-    ascendant = {
-        "longitude": asc_lon,
-        "longitude_dms": degrees_to_dms(asc_lon),
-        "sign": get_western_sign(asc_lon),
-    }
+    ascendant = western_point_entry(ctx.ascendant())
     
     return {
         "ascendant": ascendant,
@@ -342,90 +468,250 @@ def calculate_western_positions(jd: float, lat: float, lon: float) -> Dict[str,
     }
 
 
-def calculate_vimshottari_dasha(moon_longitude: float, birth_date: datetime) -> Dict[str, Any]:
-    """Calculate Vimshottari Dasha periods."""
-    nakshatra_data = get_nakshatra(moon_longitude)
-    nakshatra_idx = nakshatra_data["index"] - 1
-    
-    # Nakshatra ruler determines starting Dasha
-    nakshatra_rulers = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-    starting_ruler = nakshatra_rulers[nakshatra_idx % 9]
-    
-    # Calculate elapsed portion
-    nakshatra_span = 360.0 / 27
-    position_in_nakshatra = moon_longitude % nakshatra_span
-    elapsed_fraction = position_in_nakshatra / nakshatra_span
-    
-    start_idx = DASHA_SEQUENCE.index(starting_ruler)
-    first_dasha_remaining = DASHA_YEARS[starting_ruler] * (1 - elapsed_fraction)
-    
-    dashas = []
-    current_date = birth_date
-    
-    for i in range(9):
-        dasha_idx = (start_idx + i) % 9
-        dasha_planet = DASHA_SEQUENCE[dasha_idx]
-        years = first_dasha_remaining if i == 0 else DASHA_YEARS[dasha_planet]
-        end_date = current_date + timedelta(days=years * 365.25)
-        
-        dashas.append({
-            "planet": dasha_planet,
-            "years": round(years, 2),
-            "start": current_date.strftime("%Y-%m-%d"),
-            "end": end_date.strftime("%Y-%m-%d"),
-        })
-        current_date = end_date
-    
-    # Find current dasha
-    today = datetime.now()
-    current_dasha = None
-    for d in dashas:
-        start = datetime.strptime(d["start"], "%Y-%m-%d")
-        end = datetime.strptime(d["end"], "%Y-%m-%d")
-        if start <= today <= end:
-            current_dasha = d["planet"]
-            break
-    
-    return {
-        "starting_dasha": starting_ruler,
-        "moon_nakshatra": nakshatra_data["name"],
-        "current_dasha": current_dasha,
-        "periods": dashas,
-    }
+def _now_jd() -> float:
+    """Julian day (UT) of the current moment."""
+    return time.time() / 86400.0 + 2440587.5
+
+
+def calculate_dasha(
+    system: str,
+    moon_longitude: float,
+    birth_jd: float,
+    tz_offset: float = 0.0,
+    on_jd: float = None,
+) -> Dict[str, Any]:
+    """
+    Top-level periods of a dasha system ("vimshottari", "yogini") and the
+    mahadasha/antardasha/pratyantardasha running on `on_jd` (default: now).
+    Deeper levels come from dasha.py on demand.
+    """
+    from dasha import DashaTree  # dasha.py imports this module
+
+    tree = DashaTree(system, moon_longitude, birth_jd, tz_offset)
+    return tree.summary(_now_jd() if on_jd is None else on_jd)
+
+
+def calculate_vimshottari_dasha(moon_longitude: float, birth_date: datetime, tz_offset: float = 0.0) -> Dict[str, Any]:
+    """Calculate Vimshottari Dasha periods (birth_date is local time at the birth place)."""
+    hour = birth_date.hour + birth_date.minute / 60 + birth_date.second / 3600
+    jd = calculate_julian_day(birth_date.year, birth_date.month, birth_date.day, hour, tz_offset)
+    return calculate_dasha("vimshottari", moon_longitude, jd, tz_offset)
 
 
-def get_2026_transits() -> Dict[str, Any]:
-    """Get major astrological transits for 2026."""
+# =============================================================================
+# TRANSIT CALENDAR
+# =============================================================================
+# Sky events that depend only on the year, not on the birth chart. Computed
+# from the ephemeris on first use and kept per (year, ayanamsa), so every
+# report for that year shares one calculation. Dates are UT.
+
+DEFAULT_TRANSIT_YEAR = 2026
+
+RETROGRADE_PLANETS = ("Mercury", "Venus")
+TROPICAL_INGRESS_PLANETS = ("Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+SIDEREAL_INGRESS_PLANETS = ("Jupiter", "Saturn")
+
+# Chinese calendar days start at midnight China Standard Time
+CHINA_TZ_OFFSET = 8.0
+
+_ROOT_TOLERANCE_DAYS = 1e-6
+# longer than any Mercury/Venus retrograde, so windows that straddle the year are whole
+_RETROGRADE_MARGIN_DAYS = 60.0
+
+def _wrap180(degrees: float) -> float:
+    return (degrees + 180.0) % 360.0 - 180.0
+
+
+def _jd_to_date(jd: float, tz_offset: float = 0.0) -> str:
+    year, month, day, _ = swe.revjul(jd + tz_offset / 24)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _transit_position(planet: str, jd: float, ayanamsa: str = None) -> Tuple[float, float]:
+    """(longitude, speed) of a planet; sidereal if an ayanamsa is given."""
+    pos = swe.calc_ut(jd, PLANETS[planet], ChartContext.CALC_FLAGS)[0]
+    longitude = pos[0]
+    if ayanamsa is not None:
+        with SWE_LOCK:
+            swe.set_sid_mode(AYANAMSAS.get(ayanamsa, AYANAMSAS["raman"])[0])
+            longitude -= swe.get_ayanamsa_ex_ut(jd, 0)[1]
+    return longitude % 360.0, pos[3]
+
+
+def _bisect(f, a: float, b: float) -> float:
+    """Instant in [a, b] where f changes sign."""
+    negative_at_a = f(a) < 0
+    while b - a > _ROOT_TOLERANCE_DAYS:
+        mid = (a + b) / 2
+        if (f(mid) < 0) == negative_at_a:
+            a = mid
+        else:
+            b = mid
+    return (a + b) / 2
+
+
+def _sign_ingresses(planet: str, jd_start: float, jd_end: float, ayanamsa: str = None) -> List[Dict[str, Any]]:
+    """Every sign change in [jd_start, jd_end]: jd, sign index entered, direction."""
+    # ingress_index.py imports this module, so it can't be imported at the top
+    from ingress_index import RASHI, SIGN, find_events
+
+    if ayanamsa is None:
+        events = find_events(planet, SIGN, jd_start, jd_end)
+    else:
+        events = find_events(planet, RASHI, jd_start, jd_end, ayanamsa if ayanamsa in AYANAMSAS else "raman")
+    return [
+        {"jd": float(e["jd"]), "sign": int(e["value"]), "forward": bool(e["direction"] > 0)}
+        for e in events[1:]
+    ]
+
+
+def _retrograde_windows(planet: str, jd_start: float, jd_end: float) -> List[Dict[str, Any]]:
+    """Retrograde periods overlapping [jd_start, jd_end), with the sign at the retrograde station."""
+    from ingress_index import STATION, find_events
+
+    stations = find_events(planet, STATION, jd_start - _RETROGRADE_MARGIN_DAYS, jd_end + _RETROGRADE_MARGIN_DAYS)[1:]
+    windows = []
+    for station, next_station in zip(stations, stations[1:]):
+        start, end = float(station["jd"]), float(next_station["jd"])
+        if station["value"] and start < jd_end and end >= jd_start:
+            windows.append({
+                "start": _jd_to_date(start),
+                "end": _jd_to_date(end),
+                "sign": SIGNS_WESTERN[int(_transit_position(planet, start)[0] // 30)],
+            })
+    return windows
+
+
+def _new_moons(jd_start: float, jd_end: float) -> List[float]:
+    def elongation(t: float) -> float:
+        return _wrap180(_transit_position("Moon", t)[0] - _transit_position("Sun", t)[0])
+
+    found = []
+    jd, value = jd_start, elongation(jd_start)
+    while jd < jd_end:
+        # the Moon gains ~12 degrees a day, so a day bracket holds at most one conjunction
+        next_value = elongation(jd + 1)
+        if value < 0 <= next_value:
+            found.append(_bisect(elongation, jd, jd + 1))
+        jd, value = jd + 1, next_value
+    return found
+
+
+def get_chinese_new_year(year: int) -> str:
+    """
+    Date of Chinese New Year (China Standard Time), by the modern rules: a
+    month starts on the day of a new moon, the month containing the winter
+    solstice is month 11, and in a 13-month solstice-to-solstice year the
+    first month without a principal solar term is the leap month.
+    New Year is the start of month 1.
+    """
+    _prepare_thread()
+
+    def china_day(jd: float) -> str:
+        return _jd_to_date(jd, CHINA_TZ_OFFSET)
+
+    solstice = swe.solcross_ut(270.0, swe.julday(year - 1, 12, 1, 0.0), ChartContext.CALC_FLAGS)
+    next_solstice = swe.solcross_ut(270.0, solstice + 300, ChartContext.CALC_FLAGS)
+    # principal terms (Sun at multiples of 30 degrees) between the two solstices
+    terms = [solstice]
+    for k in range(1, 12):
+        terms.append(swe.solcross_ut((270.0 + 30 * k) % 360, terms[-1] + 20, ChartContext.CALC_FLAGS))
+    term_days = [china_day(jd) for jd in terms]
+
+    month_starts = [china_day(jd) for jd in _new_moons(solstice - 31, next_solstice + 1)]
+    first = max(i for i, day in enumerate(month_starts) if day <= china_day(solstice))
+    last = max(i for i, day in enumerate(month_starts) if day <= china_day(next_solstice))
+    months = month_starts[first:last + 1]  # months[0] is month 11, months[-1] the next month 11
+
+    new_year = 2
+    if len(months) == 14:
+        # 13 months: the first one holding no principal term is the leap month
+        for i in range(1, 13):
+            if not any(months[i] <= day < months[i + 1] for day in term_days):
+                if i <= 2:
+                    new_year = 3  # leap 11th or 12th month
+                break
+    return months[new_year]
+
+
+def calculate_year_transits(year: int, ayanamsa: str = "raman") -> Dict[str, Any]:
+    """
+    Mercury/Venus retrograde windows, outer-planet sign ingresses (tropical,
+    and sidereal for Jupiter and Saturn), Rahu-Ketu rashi shifts, eclipses
+    and the Chinese New Year for one year.
+    """
+    # eclipses.py imports this module, so it can't be imported at the top
+    from eclipses import get_eclipse_table
+
+    _prepare_thread()
+    jd_start = swe.julday(year, 1, 1, 0.0)
+    jd_end = swe.julday(year + 1, 1, 1, 0.0)
+
+    # (jd, entry) pairs, sorted by jd below
+    major_transits = []
+    for zodiac, planets, sidereal in (
+        ("Tropical", TROPICAL_INGRESS_PLANETS, None),
+        ("Vedic/Sidereal", SIDEREAL_INGRESS_PLANETS, ayanamsa),
+    ):
+        for planet in planets:
+            for ingress in _sign_ingresses(planet, jd_start, jd_end, sidereal):
+                sign = SIGNS_WESTERN[ingress["sign"]]
+                verb = "enters" if ingress["forward"] else "re-enters"
+                major_transits.append((ingress["jd"], {
+                    "date": _jd_to_date(ingress["jd"]),
+                    "event": f"{planet} {verb} {sign} ({zodiac})",
+                    "planet": planet,
+                    "sign": sign,
+                    "zodiac": "sidereal" if sidereal else "tropical",
+                }))
+    for ingress in _sign_ingresses("Rahu", jd_start, jd_end, ayanamsa):
+        rahu_sign = SIGNS_WESTERN[ingress["sign"]]
+        ketu_sign = SIGNS_WESTERN[(ingress["sign"] + 6) % 12]
+        major_transits.append((ingress["jd"], {
+            "date": _jd_to_date(ingress["jd"]),
+            "event": f"Rahu-Ketu shift to {rahu_sign}-{ketu_sign}",
+            "planet": "Rahu",
+            "sign": rahu_sign,
+            "zodiac": "sidereal",
+        }))
+    major_transits.sort(key=lambda t: t[0])
+
+    chinese_year = get_current_chinese_year(year)
     return {
-        "mercury_retrogrades": [
-            {"start": "2026-02-26", "end": "2026-03-20", "sign": "Pisces"},
-            {"start": "2026-06-29", "end": "2026-07-23", "sign": "Cancer"},
-            {"start": "2026-10-24", "end": "2026-11-13", "sign": "Scorpio"},
-        ],
-        "major_transits": [
-            {"date": "2026-01-26", "event": "Neptune enters Aries"},
-            {"date": "2026-02-13", "event": "Saturn enters Aries"},
-            {"date": "2026-04-25", "event": "Uranus enters Gemini"},
-            {"date": "2026-06-30", "event": "Jupiter enters Leo (Tropical)"},
-            {"date": "2026-06-01", "event": "Jupiter enters Cancer (Vedic/Sidereal)"},
-            {"date": "2026-10-31", "event": "Jupiter enters Leo (Vedic/Sidereal)"},
-            {"date": "2026-12-05", "event": "Rahu-Ketu shift to Capricorn-Cancer"},
-        ],
-        "eclipses": [
-            {"date": "2026-02-17", "type": "Annular Solar", "sign": "Aquarius"},
-            {"date": "2026-03-03", "type": "Total Lunar", "sign": "Virgo"},
-            {"date": "2026-08-12", "type": "Total Solar", "sign": "Leo"},
-            {"date": "2026-08-28", "type": "Partial Lunar", "sign": "Pisces"},
-        ],
+        "year": year,
+        "ayanamsa": ayanamsa,
+        "mercury_retrogrades": _retrograde_windows("Mercury", jd_start, jd_end),
+        "venus_retrogrades": _retrograde_windows("Venus", jd_start, jd_end),
+        "major_transits": [entry for _, entry in major_transits],
+        "eclipses": get_eclipse_table(year).entries(ayanamsa),
         "chinese_year": {
-            "starts": "2026-02-17",
-            "animal": "Horse",
-            "element": "Fire",
-            "full": "Fire Horse",
-        }
+            "starts": get_chinese_new_year(year),
+            "animal": chinese_year["animal"],
+            "element": chinese_year["element"],
+            "full": chinese_year["full"],
+        },
     }
 
 
+_transit_calendars: Dict[Tuple[int, str], Dict[str, Any]] = {}
+_transit_calendars_lock = threading.Lock()
+
+
+def get_year_transits(year: int = DEFAULT_TRANSIT_YEAR, ayanamsa: str = "raman") -> Dict[str, Any]:
+    """
+    calculate_year_transits, computed once per (year, ayanamsa) per process.
+    The result is shared by every caller and must not be mutated.
+    """
+    key = (year, ayanamsa)
+    calendar = _transit_calendars.get(key)
+    if calendar is None:
+        with _transit_calendars_lock:
+            calendar = _transit_calendars.get(key)
+            if calendar is None:
+                calendar = _transit_calendars[key] = calculate_year_transits(year, ayanamsa)
+    return calendar
+
+
 def generate_full_report(
     name: str,
     date_str: str,
@@ -435,33 +721,91 @@ def generate_full_report(
     tz_offset: float,
     place: str = "",
     ayanamsa: str = "raman",
+    transit_year: int = DEFAULT_TRANSIT_YEAR,
 ) -> Dict[str, Any]:
     """Generate comprehensive multi-system astrology report."""
-    
-    # Parse date and time
+    # the chart's numbers, then the JSON built from them (compact_chart.py)
+    from compact_chart import calculate_compact_chart  # circular, as in calculate_year_transits
+    chart = calculate_compact_chart(
+        name, date_str, time_str, latitude, longitude, tz_offset, place, ayanamsa, transit_year
+    )
+    return chart.to_chart()
+
+
+def _differences(views: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Per point, the fields whose value depends on the ayanamsa."""
+    def point_fields(p: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in p:
+            return {}
+        return {
+            "rashi": p["rashi"]["name"],
+            "nakshatra": p["nakshatra"]["name"],
+            "pada": p["nakshatra"]["pada"],
+            "navamsa": p["nakshatra"]["navamsa"],
+        }
+
+    first = next(iter(views.values()))
+    points = ["ascendant"] + list(first["planets"].keys())
+    diffs: Dict[str, Any] = {}
+    for point in points:
+        values = {
+            key: point_fields(v["ascendant"] if point == "ascendant" else v["planets"][point])
+            for key, v in views.items()
+        }
+        fields = {}
+        for field in ("rashi", "nakshatra", "pada", "navamsa"):
+            by_ayanamsa = {key: vals.get(field) for key, vals in values.items()}
+            if len(set(by_ayanamsa.values())) > 1:
+                fields[field] = by_ayanamsa
+        if fields:
+            diffs[point] = fields
+
+    dasha = {}
+    for field in ("starting_dasha", "moon_nakshatra", "current_dasha"):
+        by_ayanamsa = {key: v["vimshottari_dasha"][field] for key, v in views.items()}
+        if len(set(by_ayanamsa.values())) > 1:
+            dasha[field] = by_ayanamsa
+    # the dasha balance at birth always shifts a little; show it in full
+    dasha["first_period_ends"] = {
+        key: v["vimshottari_dasha"]["periods"][0]["end"] for key, v in views.items()
+    }
+    diffs["vimshottari_dasha"] = dasha
+    return diffs
+
+
+def compare_ayanamsas(
+    name: str,
+    date_str: str,
+    time_str: str,
+    latitude: float,
+    longitude: float,
+    tz_offset: float,
+    place: str = "",
+) -> Dict[str, Any]:
+    """
+    The Vedic chart and Vimshottari dasha under every ayanamsa in AYANAMSAS,
+    from one set of ephemeris calls, plus what changes between them.
+    """
     date_parts = [int(x) for x in date_str.split("-")]
     time_parts = [int(x) for x in time_str.split(":")]
-    
+
     year, month, day = date_parts
     hour = time_parts[0] + time_parts[1]/60 + (time_parts[2]/3600 if len(time_parts) > 2 else 0)
-    
-    birth_datetime = datetime(year, month, day, time_parts[0], time_parts[1])
-    
-    # Calculate Julian Day
+
     jd = calculate_julian_day(year, month, day, hour, tz_offset)
-    
-    # Calculate all systems
-    vedic = calculate_vedic_positions(jd, latitude, longitude, ayanamsa)
-    western = calculate_western_positions(jd, latitude, longitude)
-    chinese = get_chinese_zodiac(year, month, day)
-    
-    # Vimshottari Dasha
-    moon_lon = vedic["planets"]["moon"]["longitude"]
-    dasha = calculate_vimshottari_dasha(moon_lon, birth_datetime)
-    
-    # 2026 Transits
-    transits_2026 = get_2026_transits()
-    
+
+    # tropical positions and houses once; each ayanamsa is only a subtraction
+    ctx = ChartContext(jd, latitude, longitude)
+    now_jd = _now_jd()
+    views = {}
+    for key in AYANAMSAS:
+        vedic = calculate_vedic_positions(jd, latitude, longitude, key, ctx)
+        moon_lon = vedic["planets"]["moon"]["longitude"]
+        views[key] = {
+            **vedic,
+            "vimshottari_dasha": calculate_dasha("vimshottari", moon_lon, jd, tz_offset, now_jd),
+        }
+
     return {
         "meta": {
             "name": name,
@@ -472,13 +816,11 @@ def generate_full_report(
             "longitude": longitude,
             "timezone_offset": tz_offset,
             "julian_day": jd,
+            "ayanamsa": "all",
             "generated_at": datetime.now().isoformat(),
         },
-        "vedic": vedic,
-        "western": western,
-        "chinese": chinese,
-        "vimshottari_dasha": dasha,
-        "transits_2026": transits_2026,
+        "ayanamsas": views,
+        "differences": _differences(views),
     }
 
 
@@ -491,22 +833,53 @@ def main():
     parser.add_argument("--lon", type=float, required=True, help="Longitude (decimal)")
     parser.add_argument("--tz", type=float, required=True, help="Timezone offset from UTC")
     parser.add_argument("--place", default="", help="Birth place name")
-    parser.add_argument("--ayanamsa", default="raman", choices=list(AYANAMSAS.keys()),
-                       help="Ayanamsa system (default: raman)")
+    parser.add_argument("--ayanamsa", default="raman", choices=list(AYANAMSAS.keys()) + ["all"],
+                       help="Ayanamsa system (default: raman); 'all' compares every ayanamsa")
+    parser.add_argument("--year", type=int, default=DEFAULT_TRANSIT_YEAR,
+                       help=f"Year for the transit calendar (default: {DEFAULT_TRANSIT_YEAR})")
     parser.add_argument("--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", default="json", choices=["json", "compact", "binary"],
+                       help="Output format (default: json); compact and binary are read by compact_chart.py")
     
     args = parser.parse_args()
-    
-    report = generate_full_report(
-        name=args.name,
-        date_str=args.date,
-        time_str=args.time,
-        latitude=args.lat,
-        longitude=args.lon,
-        tz_offset=args.tz,
-        place=args.place,
-        ayanamsa=args.ayanamsa,
-    )
+    if args.format != "json" and args.ayanamsa == "all":
+        parser.error("--format compact/binary needs a single ayanamsa")
+    
+    if args.ayanamsa == "all":
+        report = compare_ayanamsas(
+            name=args.name,
+            date_str=args.date,
+            time_str=args.time,
+            latitude=args.lat,
+            longitude=args.lon,
+            tz_offset=args.tz,
+            place=args.place,
+        )
+    elif args.format != "json":
+        from compact_chart import calculate_compact_chart, write_chart
+        chart = calculate_compact_chart(
+            args.name, args.date, args.time, args.lat, args.lon, args.tz, args.place, args.ayanamsa, args.year
+        )
+        data = write_chart(chart, args.format)
+        if args.output == "-":
+            sys.stdout.buffer.write(data)
+        else:
+            with open(args.output, "wb") as f:
+                f.write(data)
+            print(f"Report saved to {args.output}", file=sys.stderr)
+        return
+    else:
+        report = generate_full_report(
+            name=args.name,
+            date_str=args.date,
+            time_str=args.time,
+            latitude=args.lat,
+            longitude=args.lon,
+            tz_offset=args.tz,
+            place=args.place,
+            ayanamsa=args.ayanamsa,
+            transit_year=args.year,
+        )
     
     output_json = json.dumps(report, indent=2, ensure_ascii=False)
     
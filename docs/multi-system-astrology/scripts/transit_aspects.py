@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Transit-to-Natal Aspect Timeline
+Every conjunction, opposition, square, trine and sextile a transiting planet
+makes to a natal point over a date range, with the time it comes within
+orb, the exact time (each pass, if a retrograde makes it perfect more than
+once) and the time it leaves orb.
+
+Transiting positions do not depend on the chart, so they are sampled once
+per day per year and kept in memory. For a chart the range is swept at
+once: (days x transiting bodies x aspect targets) signed distances, where a
+sign change between two samples brackets a crossing; only pairs still within
+orb at either end are followed into the year before or after. Each crossing is then
+refined on the cubic Hermite curve through the two samples' longitudes and
+speeds, which tracks the ephemeris to well under a minute of time for
+every body here; no further ephemeris calls are made per chart.
+"""
+
+import argparse
+import json
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    if __name__ == "__main__":
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    raise
+
+from multi_system_calculator import (
+    DEFAULT_TRANSIT_YEAR,
+    PLANETS,
+    SIGNS_WESTERN,
+    ChartContext,
+    _jd_to_date,
+    _prepare_thread,
+    swe,
+)
+from eclipses import natal_points
+
+# the Moon is left out: it aspects every natal point several times a month
+TRANSIT_BODIES = ("Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+# the slow movers; what goes into the chart and the report
+REPORT_BODIES = ("Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+
+# degrees either side of exact
+TRANSIT_ORB = 1.0
+ASPECTS = {"conjunction": 0.0, "sextile": 60.0, "square": 90.0, "trine": 120.0, "opposition": 180.0}
+
+_STEP_DAYS = 1.0
+_REFINE_ITERATIONS = 40  # bisection halvings of a one-day segment: ~1e-12 day
+
+
+# =============================================================================
+# DAILY SAMPLES
+# =============================================================================
+
+_year_samples: Dict[int, Dict[str, np.ndarray]] = {}
+_year_samples_lock = threading.Lock()
+
+
+def _sample_year(year: int) -> Dict[str, np.ndarray]:
+    """Tropical longitude and speed of TRANSIT_BODIES at 0h UT on each day of the year."""
+    _prepare_thread()
+    jd_start = swe.julday(year, 1, 1, 0.0)
+    jds = np.arange(jd_start, swe.julday(year + 1, 1, 1, 0.0), _STEP_DAYS)
+    longitude = np.empty((len(jds), len(TRANSIT_BODIES)), dtype="f8")
+    speed = np.empty_like(longitude)
+    for i, jd in enumerate(jds):
+        for j, body in enumerate(TRANSIT_BODIES):
+            pos = swe.calc_ut(jd, PLANETS[body], ChartContext.CALC_FLAGS)[0]
+            longitude[i, j] = pos[0] % 360.0
+            speed[i, j] = pos[3]
+    return {"jd": jds, "longitude": longitude, "speed": speed}
+
+
+def get_year_samples(year: int) -> Dict[str, np.ndarray]:
+    """_sample_year, computed once per year per process. Shared; do not mutate."""
+    samples = _year_samples.get(year)
+    if samples is None:
+        with _year_samples_lock:
+            samples = _year_samples.get(year)
+            if samples is None:
+                samples = _year_samples[year] = _sample_year(year)
+    return samples
+
+
+def prepare_year(year: int) -> None:
+    """Sample everything a timeline for `year` needs, so the first chart doesn't wait."""
+    for y in (year - 1, year, year + 1):
+        get_year_samples(y)
+
+
+def _grid(jd_start: float, jd_end: float) -> Dict[str, np.ndarray]:
+    """
+    Daily samples from a year before jd_start to a year after jd_end, so orb
+    windows that straddle the range (slow planets, retrograde loops) are whole.
+    """
+    first = int(swe.revjul(jd_start)[0]) - 1
+    last = int(swe.revjul(jd_end)[0]) + 1
+    years = [get_year_samples(y) for y in range(first, last + 1)]
+    return {key: np.concatenate([s[key] for s in years]) for key in ("jd", "longitude", "speed")}
+
+
+# =============================================================================
+# SWEEP AND REFINEMENT
+# =============================================================================
+
+def _hermite(y0, y1, m0, m1, s):
+    """Cubic Hermite curve through (0, y0) and (1, y1) with slopes m0, m1, at s."""
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * m0
+            + (-2 * s3 + 3 * s2) * y1 + (s3 - s2) * m1)
+
+
+def _hermite_slope(y0, y1, m0, m1, s):
+    s2 = s * s
+    return ((6 * s2 - 6 * s) * y0 + (3 * s2 - 4 * s + 1) * m0
+            + (-6 * s2 + 6 * s) * y1 + (3 * s2 - 2 * s) * m1)
+
+
+def _refine(y0, y1, m0, m1, level):
+    """Fraction of the segment where the curve crosses `level` (arrays; a crossing is bracketed)."""
+    lo = np.zeros_like(y0)
+    hi = np.ones_like(y0)
+    below_at_lo = (y0 - level) < 0
+    for _ in range(_REFINE_ITERATIONS):
+        mid = (lo + hi) / 2
+        same = ((_hermite(y0, y1, m0, m1, mid) - level) < 0) == below_at_lo
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    return (lo + hi) / 2
+
+
+def _crossings(d0, d1, orb):
+    """
+    Segments where the distance crosses -orb (window edge), 0 (exact) or +orb
+    (window edge): (indices into d0, level crossed, distance before, after).
+    """
+    found = []
+    for level in (-orb, 0.0, orb):
+        index = np.nonzero(((d0 - level) < 0) != ((d1 - level) < 0))
+        found.append((*index, np.full(len(index[0]), level)))
+    *index, level = (np.concatenate(parts) for parts in zip(*found))
+    index = tuple(index)
+    return index, level, d0[index], d1[index]
+
+
+def _jd_to_time(jd: float) -> str:
+    """UT clock time of a Julian day, HH:MM."""
+    minutes = int(round(((jd + 0.5) % 1.0) * 1440)) % 1440
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def aspect_timeline(
+    points: Dict[str, float],
+    jd_start: float,
+    jd_end: float,
+    bodies: Sequence[str] = TRANSIT_BODIES,
+    orb: float = TRANSIT_ORB,
+) -> List[Dict[str, Any]]:
+    """
+    Every exact aspect from a transiting body to a natal point with the exact
+    time in [jd_start, jd_end), sorted by that time. `points` maps point name
+    -> tropical longitude. start/end are when the orb window around the hit
+    opens and closes (None if that lies beyond the sampled year either side);
+    a retrograde triple pass is three hits sharing one window.
+    """
+    if not points:
+        return []
+    columns = [TRANSIT_BODIES.index(body) for body in bodies]
+    grid = _grid(jd_start, jd_end)
+    jd = grid["jd"]
+    lon = grid["longitude"][:, columns]
+    speed = grid["speed"][:, columns] * _STEP_DAYS
+
+    # one target per natal point and signed aspect angle (sextile, square and trine both sides)
+    names = list(points)
+    target_point, target_aspect, target_lon = [], [], []
+    for p, name in enumerate(names):
+        for aspect, angle in ASPECTS.items():
+            for signed in {angle, -angle} if 0 < angle < 180 else {angle}:
+                target_point.append(p)
+                target_aspect.append(aspect)
+                target_lon.append((points[name] + signed) % 360.0)
+    target_lon = np.array(target_lon)
+
+    # signed distance body - target before and (unwrapped) after each daily step,
+    # over the range's segments for every (body, target) pair at once
+    first = max(int(np.searchsorted(jd, jd_start, side="right")) - 1, 0)
+    last = min(int(np.searchsorted(jd, jd_end)), len(jd) - 1)
+    step = (lon[1:] - lon[:-1] + 180.0) % 360.0 - 180.0
+    d0 = (lon[first:last, :, None] - target_lon[None, None, :] + 180.0) % 360.0 - 180.0
+    d1 = d0 + step[first:last, :, None]
+    (i, b, k), level, y0, y1 = _crossings(d0, d1, orb)
+    i = i + first
+
+    # pairs within orb at either end of the range have a window reaching into the
+    # margin; redo just those over the whole grid so its start, end and passes are known
+    open_b, open_k = np.nonzero((np.abs(d0[0]) <= orb) | (np.abs(d1[-1]) <= orb))
+    keep = ~np.isin(b * len(target_lon) + k, open_b * len(target_lon) + open_k)
+    d0 = (lon[:-1, open_b] - target_lon[open_k] + 180.0) % 360.0 - 180.0
+    d1 = d0 + step[:, open_b]
+    (oi, op), olevel, oy0, oy1 = _crossings(d0, d1, orb)
+    inside_at_grid_start = {
+        (open_b[p], open_k[p]): abs(d0[0, p]) <= orb for p in range(len(open_b))
+    }
+
+    i = np.concatenate((i[keep], oi))
+    b = np.concatenate((b[keep], open_b[op]))
+    k = np.concatenate((k[keep], open_k[op]))
+    level = np.concatenate((level[keep], olevel))
+    y0 = np.concatenate((y0[keep], oy0))
+    y1 = np.concatenate((y1[keep], oy1))
+    m0, m1 = speed[i, b], speed[i + 1, b]
+    s = _refine(y0, y1, m0, m1, level)
+    when = jd[i] + s * _STEP_DAYS
+    retrograde = _hermite_slope(y0, y1, m0, m1, s) < 0
+
+    # walk each (body, target) pair's crossings in time order, tracking the orb window
+    order = np.lexsort((when, k, b))
+    hits = []
+    window: List[Dict[str, Any]] = []
+    start: Optional[float] = None
+    inside = False
+    pair = None
+
+    def close(end: Optional[float]) -> None:
+        for n, hit in enumerate(window, 1):
+            if jd_start <= hit["jd"] < jd_end:
+                hit.update({
+                    "start": _jd_to_date(start) if start is not None else None,
+                    "end": _jd_to_date(end) if end is not None else None,
+                    "pass": n,
+                    "passes": len(window),
+                })
+                hits.append(hit)
+
+    for e in order:
+        if (b[e], k[e]) != pair:
+            if inside:
+                close(None)
+            pair = (b[e], k[e])
+            inside = inside_at_grid_start.get(pair, False)
+            start = None
+            window = []
+        if level[e] == 0.0:
+            target = k[e]
+            window.append({
+                "jd": float(when[e]),
+                "transit": bodies[b[e]],
+                "aspect": target_aspect[target],
+                "natal": names[target_point[target]],
+                "natal_sign": SIGNS_WESTERN[int(points[names[target_point[target]]] // 30) % 12],
+                "transit_sign": SIGNS_WESTERN[int(target_lon[target] // 30) % 12],
+                "exact": _jd_to_date(when[e]),
+                "exact_time": _jd_to_time(when[e]),
+                "retrograde": bool(retrograde[e]),
+            })
+        elif inside:
+            close(float(when[e]))
+            inside, window = False, []
+        else:
+            inside, start = True, float(when[e])
+    if inside:
+        close(None)
+
+    hits.sort(key=lambda hit: hit["jd"])
+    return hits
+
+
+def year_transit_aspects(
+    points: Dict[str, float],
+    year: int = DEFAULT_TRANSIT_YEAR,
+    bodies: Sequence[str] = REPORT_BODIES,
+    orb: float = TRANSIT_ORB,
+) -> List[Dict[str, Any]]:
+    """A year's transit hits to natal points (name -> tropical longitude)."""
+    return aspect_timeline(
+        points,
+        swe.julday(year, 1, 1, 0.0),
+        swe.julday(year + 1, 1, 1, 0.0),
+        bodies,
+        orb,
+    )
+
+
+def natal_transit_aspects(
+    western: Dict[str, Any],
+    year: int = DEFAULT_TRANSIT_YEAR,
+    bodies: Sequence[str] = REPORT_BODIES,
+    orb: float = TRANSIT_ORB,
+) -> List[Dict[str, Any]]:
+    """A year's transit hits to the planets and ascendant of a Western chart."""
+    return year_transit_aspects(natal_points(western), year, bodies, orb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transit-to-natal aspect timeline")
+    parser.add_argument("chart", help="Chart JSON from multi_system_calculator.py")
+    parser.add_argument("--from-date", required=True, help="First date (YYYY-MM-DD, UT)")
+    parser.add_argument("--to-date", required=True, help="Last date (YYYY-MM-DD, UT, inclusive)")
+    parser.add_argument("--bodies", default=",".join(TRANSIT_BODIES),
+                        help="Comma-separated transiting bodies (default: Sun through Pluto)")
+    parser.add_argument("--orb", type=float, default=TRANSIT_ORB,
+                        help=f"Orb in degrees (default: {TRANSIT_ORB})")
+
+    args = parser.parse_args()
+    bodies = [body.strip().capitalize() for body in args.bodies.split(",") if body.strip()]
+    unknown = [body for body in bodies if body not in TRANSIT_BODIES]
+    if unknown:
+        parser.error(f"unknown bodies: {', '.join(unknown)} (choose from {', '.join(TRANSIT_BODIES)})")
+
+    with open(args.chart, "r", encoding="utf-8") as f:
+        chart = json.load(f)
+    start = swe.julday(*(int(x) for x in args.from_date.split("-")), 0.0)
+    end = swe.julday(*(int(x) for x in args.to_date.split("-")), 0.0) + 1
+    hits = aspect_timeline(natal_points(chart["western"]), start, end, bodies, args.orb)
+    print(json.dumps({"from": args.from_date, "to": args.to_date, "hits": hits}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()